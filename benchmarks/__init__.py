@@ -0,0 +1,6 @@
+# benchmarks/__init__.py
+
+# Benchmark suite; run the modules from the repository root:
+#   python -m benchmarks.micro        # in-process micro-benchmarks
+#   python -m benchmarks.load_test    # scenario mix against a running server
+#   python -m benchmarks.compare old.json new.json
@@ -0,0 +1,148 @@
+# benchmarks/bench_env.py
+
+# Shared setup for the benchmarks:
+#   * a database seeded from the catalog data files with load_catalog.py: a fresh SQLite file by
+#     default, or --database-url (e.g. a local Postgres) whose tables are created and overwritten;
+#   * the local Gemini stub (gemini_stub.py) in its own process, with configurable latency;
+#   * results saved as JSON under benchmarks/results, tagged with the git commit, so runs of
+#     different commits can be compared with benchmarks.compare.
+
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def add_common_arguments(parser):
+    parser.add_argument('--database-url',
+                        help="throwaway database to seed and use (default: a fresh SQLite file)")
+    parser.add_argument('--llm-latency', type=float, default=0.3,
+                        help="seconds the Gemini stub waits before answering (default 0.3)")
+    parser.add_argument('--llm-chunk-delay', type=float, default=0.02,
+                        help="seconds between the stub's streamed pieces (default 0.02)")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<suite>-<commit>-<time>.json)")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args[1]} exited with code {process.returncode} before listening")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
+
+def start_gemini_stub(latency, chunk_delay):
+    # Returns (process, api_base)
+    port = free_port()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'gemini_stub.py'), '--port', str(port),
+                                '--latency', str(latency), '--chunk-delay', str(chunk_delay)],
+                               stdout=subprocess.DEVNULL)
+    wait_for_port(port, process)
+    return process, f'http://127.0.0.1:{port}/v1beta'
+
+
+def benchmark_environment(database_url, llm_api_base):
+    return {
+        'DATABASE_URL': database_url,
+        'CATALOG_SOURCE': 'database',
+        'LINEUP_MODE': 'llm',
+        'LLM_API_KEY': 'benchmark',
+        'LLM_API_BASE': llm_api_base,
+        # Every suggestion should go to the (stub) LLM rather than come from the suggestion cache
+        'SUGGESTION_CACHE_BACKEND': 'none',
+        # No leftover snapshot from a real deployment: the catalog comes from the seeded database
+        'CATALOG_SNAPSHOT_PATH': os.path.join(tempfile.gettempdir(), 'r6-benchmark-no-snapshot'),
+    }
+
+
+def prepare_environment(args):
+    # Seeds the database, starts the stub and sets the environment create_app() reads.
+    # Returns (environment dict, stub process); stop the stub when done.
+    database_url = args.database_url
+    if not database_url:
+        directory = tempfile.mkdtemp(prefix='r6-benchmark-')
+        database_url = f"sqlite:///{os.path.join(directory, 'catalog.sqlite3')}"
+    stub, llm_api_base = start_gemini_stub(args.llm_latency, args.llm_chunk_delay)
+    environment = benchmark_environment(database_url, llm_api_base)
+    os.environ.update(environment)
+    try:
+        seed_database()
+    except Exception:
+        stub.terminate()
+        raise
+    return environment, stub
+
+
+def seed_database():
+    import load_catalog
+    from r6_fan_app import create_app, db
+
+    app = create_app({'STARTUP_PREWARM': False})
+    with app.app_context():
+        db.create_all()
+    load_catalog.load_catalog(prune=True, force_bump=True)
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + ('-dirty' if dirty else '')
+
+
+def save_results(suite, args, results, settings=None):
+    commit = git_commit()
+    started = datetime.now(timezone.utc)
+    document = {
+        'suite': suite,
+        'commit': commit,
+        'created_at': started.isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'database': (args.database_url or 'sqlite').split(':', 1)[0],
+        'settings': dict(settings or {}, llm_latency=args.llm_latency, llm_chunk_delay=args.llm_chunk_delay),
+        'results': results,
+    }
+    path = args.output
+    if not path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{suite}-{commit}-{started.strftime('%Y%m%dT%H%M%S')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=1)
+    print(f"\nResults saved to {os.path.relpath(path, os.getcwd())}")
+    return path
+
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
@@ -0,0 +1,79 @@
+# benchmarks/compare.py
+
+# Compares two result files of the same suite (e.g. the last run on main and one on a branch)
+# and flags regressions: for micro-benchmarks the median time per call, for the load test the
+# p95 latency and the throughput. Exits with status 1 when anything regressed by more than the
+# threshold, so it can gate CI.
+#
+# Usage:
+#   python -m benchmarks.compare benchmarks/results/micro-abc1234-....json benchmarks/results/micro-def5678-....json
+#   python -m benchmarks.compare old.json new.json --threshold 15
+
+import argparse
+import json
+import sys
+
+# suite -> [(metric, True when higher is better)]
+METRICS = {
+    'micro': [('median_us', False)],
+    'load': [('p95_ms', False), ('throughput_rps', True)],
+}
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(old, new, threshold):
+    # Returns (rows, regressions); a row is (case, metric, old value, new value, change in %)
+    rows = []
+    regressions = []
+    for case, new_result in new['results'].items():
+        old_result = old['results'].get(case)
+        if old_result is None:
+            continue
+        for metric, higher_is_better in METRICS[new['suite']]:
+            before, after = old_result.get(metric), new_result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            rows.append((case, metric, before, after, change))
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append((case, metric, change))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="percent change that counts as a regression (default 10)")
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    if old['suite'] != new['suite']:
+        print(f"Can't compare a {old['suite']} run with a {new['suite']} run.")
+        return 2
+    if old.get('settings') != new.get('settings') or old.get('database') != new.get('database'):
+        print("Warning: the runs used different settings; differences may not come from the code.")
+
+    rows, regressions = compare(old, new, args.threshold)
+    print(f"{old['commit']} -> {new['commit']} ({new['suite']})")
+    print(f"{'case':<28} {'metric':<15} {'old':>10} {'new':>10} {'change':>8}")
+    for case, metric, before, after, change in rows:
+        print(f"{case:<28} {metric:<15} {before:>10.2f} {after:>10.2f} {change:>+7.1f}%")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:g}%:")
+        for case, metric, change in regressions:
+            print(f"  {case} {metric} {change:+.1f}%")
+        return 1
+    print(f"\nNo regressions over {args.threshold:g}%.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
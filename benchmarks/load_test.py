@@ -0,0 +1,182 @@
+# benchmarks/load_test.py
+
+# Load test: starts the app in its own process (Gunicorn when installed, otherwise the Flask
+# development server with threads) against the seeded database and the Gemini stub, then runs
+# concurrent keep-alive clients through a weighted mix of every route for a fixed time.
+# Reports p50/p95/p99 latency, errors and throughput per scenario; requests made during the
+# warm-up are not counted.
+#
+# Usage:
+#   python -m benchmarks.load_test
+#   python -m benchmarks.load_test --users 32 --duration 60 --llm-latency 1.5
+#   python -m benchmarks.load_test --url http://127.0.0.1:5000   # an already running server
+
+import argparse
+import http.client
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.bench_env import (ROOT, add_common_arguments, free_port, percentile, prepare_environment,
+                                  save_results, wait_for_port)
+
+LINEUP_FORM = {'map': 'Oregon', 'site': 'Kitchen', 'side': 'Attacker', 'solo_queue': 'yes',
+               'situation': 'rush the site with a hard breach'}
+SEARCH_QUERIES = ('ash', 'therm', 'shield', 'jager', 'drone', 'breach', 'smoke', 'mira')
+
+
+def scenarios():
+    # name -> (weight, function returning (method, path, form data or None))
+    from r6_fan_app.catalog_files import read_catalog_files
+    from r6_fan_app.text_utils import slugify
+
+    data = read_catalog_files()
+    operator_slugs = [slugify(operator['name']) for operator in data['operators']]
+    map_slugs = [slugify(map_item['name']) for map_item in data['maps']]
+    return {
+        'index': (5, lambda: ('GET', '/', None)),
+        'operators': (15, lambda: ('GET', '/operators', None)),
+        'operator_detail': (20, lambda: ('GET', f'/operators/{random.choice(operator_slugs)}', None)),
+        'maps': (8, lambda: ('GET', '/maps', None)),
+        'map_detail': (8, lambda: ('GET', f'/maps/{random.choice(map_slugs)}', None)),
+        'game_info': (5, lambda: ('GET', '/game-info', None)),
+        'search': (20, lambda: ('GET', '/api/search?' + urlencode({'query': random.choice(SEARCH_QUERIES)}), None)),
+        'map_sites': (5, lambda: ('GET', '/api/map-sites', None)),
+        'lineup_page': (4, lambda: ('GET', '/lineup-suggestor', None)),
+        'lineup_suggest': (5, lambda: ('POST', '/lineup-suggestor', LINEUP_FORM)),
+        'lineup_stream': (5, lambda: ('POST', '/lineup-suggestor/stream', LINEUP_FORM)),
+    }
+
+
+def start_server(environment, threads):
+    port = free_port()
+    env = dict(os.environ, **environment)
+    if importlib.util.find_spec('gunicorn'):
+        command = [sys.executable, '-m', 'gunicorn', '--worker-class', 'gthread', '--threads', str(threads),
+                   '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'run:app']
+    else:
+        command = [sys.executable, '-m', 'flask', '--app', 'run', 'run', '--port', str(port), '--with-threads',
+                   '--no-reload', '--no-debugger']
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for_port(port, process)
+    return process, f'http://127.0.0.1:{port}', os.path.basename(command[2])
+
+
+class User(threading.Thread):
+    # One simulated visitor with a keep-alive connection, picking scenarios by weight until stopped
+
+    def __init__(self, host, port, mix, stop_at, record_from, samples):
+        super().__init__(daemon=True)
+        self.host, self.port = host, port
+        self.names = list(mix)
+        self.weights = [mix[name][0] for name in self.names]
+        self.mix = mix
+        self.stop_at = stop_at
+        self.record_from = record_from
+        self.samples = samples  # shared list of (scenario, seconds, status); list.append is thread-safe
+
+    def run(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        while time.monotonic() < self.stop_at:
+            name = random.choices(self.names, self.weights)[0]
+            method, path, form = self.mix[name][1]()
+            body = urlencode(form) if form else None
+            headers = {'Accept-Encoding': 'gzip, br'}
+            if body:
+                headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            started = time.monotonic()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()  # the whole body, streamed responses included
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+                status = 0
+            if started >= self.record_from:
+                self.samples.append((name, time.monotonic() - started, status))
+        connection.close()
+
+
+def summarise(samples, seconds):
+    by_scenario = defaultdict(list)
+    errors = defaultdict(int)
+    for name, elapsed, status in samples:
+        by_scenario[name].append(elapsed)
+        if status == 0 or status >= 500:
+            errors[name] += 1
+
+    def stats(latencies, error_count):
+        latencies = sorted(latencies)
+        return {
+            'requests': len(latencies),
+            'errors': error_count,
+            'throughput_rps': round(len(latencies) / seconds, 2),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+
+    results = {name: stats(latencies, errors[name]) for name, latencies in sorted(by_scenario.items())}
+    results['all'] = stats([elapsed for _, elapsed, _ in samples], sum(errors.values()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test with a weighted mix of every route")
+    add_common_arguments(parser)
+    parser.add_argument('--users', type=int, default=16, help="concurrent clients (default 16)")
+    parser.add_argument('--duration', type=float, default=30, help="measured seconds (default 30)")
+    parser.add_argument('--warmup', type=float, default=5, help="unmeasured seconds first (default 5)")
+    parser.add_argument('--threads', type=int, default=8, help="server threads (default 8, as in the Procfile)")
+    parser.add_argument('--url', help="test this running server instead of starting one (no seeding, no stub)")
+    args = parser.parse_args()
+
+    server = stub = None
+    server_kind = 'external'
+    try:
+        if args.url:
+            base_url = args.url
+        else:
+            environment, stub = prepare_environment(args)
+            server, base_url, server_kind = start_server(environment, args.threads)
+        target = urlsplit(base_url)
+
+        mix = scenarios()
+        samples = []
+        record_from = time.monotonic() + args.warmup
+        stop_at = record_from + args.duration
+        users = [User(target.hostname, target.port or 80, mix, stop_at, record_from, samples)
+                 for _ in range(args.users)]
+        print(f"{args.users} users against {base_url} ({server_kind}) for {args.warmup:g}s warm-up "
+              f"+ {args.duration:g}s...")
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+    finally:
+        for process in (server, stub):
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    results = summarise(samples, args.duration)
+    print(f"\n{'scenario':<16} {'requests':>8} {'errors':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, result in results.items():
+        print(f"{name:<16} {result['requests']:>8} {result['errors']:>6} {result['throughput_rps']:>8.1f} "
+              f"{result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms")
+    save_results('load', args, results, {'users': args.users, 'duration': args.duration, 'warmup': args.warmup,
+                                         'threads': args.threads, 'server': server_kind})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
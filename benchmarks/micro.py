@@ -0,0 +1,149 @@
+# benchmarks/micro.py
+
+# In-process micro-benchmarks of the hot paths:
+#   * operator search (the index alone and the /api/search route);
+#   * operator detail and operators pages, from the page cache and freshly rendered;
+#   * template rendering on its own (the views without the page cache);
+#   * lineup resolution: resolving an LLM reply to operators, the streaming re-resolve loop
+#     and the lineup engine.
+# Each case runs in batches; results are per call (median, p95, min) in microseconds.
+#
+# Usage:
+#   python -m benchmarks.micro
+#   python -m benchmarks.micro --repeat 50 --filter search
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from benchmarks.bench_env import add_common_arguments, percentile, prepare_environment, save_results
+
+SEARCH_QUERIES = ('ash', 'therm', 'shield', 'jager', 'drone', 'hard breach')
+# A Gemini JSON mode reply, with a typo, an alias without the umlaut and a name from the other side
+# that the resolver still has to deal with
+LLM_REPLY = json.dumps({'operators': ['Ash', 'Thermit', 'Jager', 'Thatcher', 'Twitch']})
+STREAM_CHUNK_SIZE = 8  # same as gemini_stub.py
+
+
+def measure(function, repeat, number):
+    # Returns per-call timings (microseconds) of `repeat` batches of `number` calls
+    function()  # warm-up: first-call caches, imports, template compilation
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - started) / number * 1_000_000)
+    samples.sort()
+    return {
+        'median_us': round(statistics.median(samples), 2),
+        'p95_us': round(percentile(samples, 0.95), 2),
+        'min_us': round(samples[0], 2),
+        'mean_us': round(statistics.fmean(samples), 2),
+        'calls': repeat * number,
+    }
+
+
+def build_cases(app):
+    from r6_fan_app import routes
+    from r6_fan_app.catalog import get_catalog
+    from r6_fan_app.lineup_engine import get_lineup_engine
+    from r6_fan_app.llm import StreamingJsonNameParser
+    from r6_fan_app.search import get_search_index
+
+    client = app.test_client()
+    with app.app_context():
+        catalog = get_catalog()
+    operator_slug = catalog.operator_slugs.slug_for(catalog.operators[0])
+    map_view = catalog.maps[0]
+
+    def get(path, expected=200):
+        def call():
+            response = client.get(path)
+            if response.status_code != expected:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+        return call
+
+    def uncached(function):
+        # The page cache is switched off for the duration of the call
+        def call():
+            app.config['PAGE_CACHE_ENABLED'] = False
+            try:
+                function()
+            finally:
+                app.config['PAGE_CACHE_ENABLED'] = True
+        return call
+
+    def in_request(function, path):
+        def call():
+            with app.test_request_context(path):
+                function()
+        return call
+
+    def search_index():
+        with app.app_context():
+            index = get_search_index()
+            for query in SEARCH_QUERIES:
+                index.search(query)
+
+    def resolve_reply():
+        catalog.name_resolver.resolve(json.loads(LLM_REPLY)['operators'], side='Attacker')
+
+    def streaming_resolve():
+        # What stream_suggestion_events does for every fragment Gemini sends
+        parser = StreamingJsonNameParser()
+        names = []
+        for start in range(0, len(LLM_REPLY), STREAM_CHUNK_SIZE):
+            names.extend(parser.feed(LLM_REPLY[start:start + STREAM_CHUNK_SIZE]))
+            catalog.name_resolver.resolve(names, side='Attacker')
+
+    def lineup_engine():
+        get_lineup_engine(catalog).suggest('Attacker', map_view, True, 'rush the site with a hard breach')
+
+    return {
+        # name: (function, calls per batch)
+        'search.index': (search_index, 20),
+        'search.route': (get(f'/api/search?query={SEARCH_QUERIES[1]}'), 20),
+        'operator_detail.cached': (get(f'/operators/{operator_slug}'), 50),
+        'operator_detail.render': (uncached(get(f'/operators/{operator_slug}')), 20),
+        'operators.cached': (get('/operators'), 50),
+        'operators.render': (uncached(get('/operators')), 10),
+        'template.operators': (in_request(routes.operators.__wrapped__, '/operators'), 10),
+        'template.operator_detail': (in_request(lambda: routes.operator_detail.__wrapped__(operator_slug),
+                                                f'/operators/{operator_slug}'), 20),
+        'template.maps': (in_request(routes.maps_list.__wrapped__, '/maps'), 20),
+        'lineup.resolve_reply': (resolve_reply, 200),
+        'lineup.streaming_resolve': (streaming_resolve, 100),
+        'lineup.engine_suggest': (lineup_engine, 20),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the app's hot paths")
+    add_common_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=20, help="batches per case (default 20)")
+    parser.add_argument('--filter', default='', help="only run cases whose name contains this")
+    args = parser.parse_args()
+
+    environment, stub = prepare_environment(args)
+    try:
+        from r6_fan_app import create_app
+        app = create_app()
+        results = {}
+        print(f"{'case':<28} {'median':>10} {'p95':>10} {'min':>10}")
+        for name, (function, number) in build_cases(app).items():
+            if args.filter not in name:
+                continue
+            result = measure(function, args.repeat, number)
+            results[name] = result
+            print(f"{name:<28} {result['median_us']:>8.1f}us {result['p95_us']:>8.1f}us {result['min_us']:>8.1f}us")
+    finally:
+        stub.terminate()
+    save_results('micro', args, results, {'repeat': args.repeat})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# build_assets.py
+
+# Builds r6_fan_app/static/dist from r6_fan_app/static:
+#   * every file is copied under a content-hashed name (style.css -> style.3f2a9c1b0d.css),
+#     so it can be cached by browsers forever;
+#   * text assets also get precompressed .gz (and .br, when the brotli package is installed) copies;
+#   * operator portraits get AVIF and WebP versions in a few widths for srcset (needs Pillow);
+#   * operator icons are packed into one sprite sheet with a CSS file of offsets (needs Pillow).
+# The app reads dist/manifest.json through asset_url() and falls back to the plain files without it.
+# The build also checks that every operator in catalog/operators.json has a portrait and an icon.
+#
+# Usage:
+#   python build_assets.py            # warn about operators without images
+#   python build_assets.py --strict   # fail instead
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+
+from r6_fan_app.catalog_files import read_catalog_files
+# The same slugs as the routes, so portrait file names always match the operator pages
+from r6_fan_app.text_utils import slugify
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'r6_fan_app', 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+TEXT_EXTENSIONS = {'.css', '.js', '.json', '.svg', '.txt', '.html'}
+# Portraits are shown 200px wide (see .operator-portrait); 400 and 600 cover high-density screens
+PORTRAIT_DIR = 'images/operators/portraits'
+PORTRAIT_WIDTHS = (200, 400, 600)
+PORTRAIT_QUALITY = {'avif': 55, 'webp': 75}
+
+ICON_DIR = 'images/operators/icons'
+ICON_SUFFIX = '_icon'
+ICON_SPRITE = 'operator-icons'
+ICON_CLASS = 'operator-icon'  # .operator-icon plus .operator-icon-<slug> for each operator
+SPRITE_DIR = 'sprites'
+
+# Some images are stored with a .png extension but hold another format; the copy gets the real one
+FORMAT_EXTENSIONS = {'PNG': '.png', 'JPEG': '.jpg', 'WEBP': '.webp', 'AVIF': '.avif', 'GIF': '.gif'}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def source_files():
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != DIST_DIR)
+        for file_name in sorted(files):
+            if file_name.startswith('.'):
+                continue
+            path = os.path.join(root, file_name)
+            yield os.path.relpath(path, STATIC_DIR).replace(os.sep, '/'), path
+
+
+def real_extension(path, default):
+    if Image is None:
+        return default
+    try:
+        with Image.open(path) as image:
+            return FORMAT_EXTENSIONS.get(image.format, default)
+    except Exception:
+        return default  # not an image
+
+
+def write_once(rel_path, data, written):
+    # Hashed names never change content, so an existing file can be kept as is
+    path = os.path.join(DIST_DIR, rel_path)
+    written.add(rel_path)
+    if os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def precompress(rel_path, data, written):
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        write_once(rel_path + '.gz', gz, written)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            write_once(rel_path + '.br', br, written)
+
+
+def portrait_variants(name, path, digest, written):
+    # Returns {'avif': [[width, dist path], ...], 'webp': [...]}
+    variants = {}
+    with Image.open(path) as image:
+        image.load()
+        for fmt in ('avif', 'webp'):
+            if not features.check(fmt):
+                continue
+            entries = []
+            for width in PORTRAIT_WIDTHS:
+                if width > image.width:
+                    break
+                rel_path = f"{os.path.dirname(name)}/{os.path.splitext(os.path.basename(name))[0]}.{digest}-{width}w.{fmt}"
+                target = os.path.join(DIST_DIR, rel_path)
+                written.add(rel_path)
+                if not os.path.exists(target):
+                    height = round(image.height * width / image.width)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    image.resize((width, height), Image.LANCZOS).save(target, fmt.upper(),
+                                                                      quality=PORTRAIT_QUALITY[fmt])
+                entries.append([width, 'dist/' + rel_path])
+            if entries:
+                variants[fmt] = entries
+    return variants
+
+
+def missing_operator_images(manifest):
+    problems = []
+    for name in (operator['name'] for operator in read_catalog_files()['operators']):
+        slug = slugify(name)
+        if f"{PORTRAIT_DIR}/{slug}.png" not in manifest['assets']:
+            problems.append(f"{name}: no portrait at static/{PORTRAIT_DIR}/{slug}.png")
+        if f"{ICON_DIR}/{slug}{ICON_SUFFIX}.png" not in manifest['assets']:
+            problems.append(f"{name}: no icon at static/{ICON_DIR}/{slug}{ICON_SUFFIX}.png")
+    return problems
+
+
+def build_icon_sprite(icon_paths, written):
+    # Packs the icons into a grid on one WebP sheet and writes a CSS file with one class per operator.
+    # Returns the manifest entry: {'css': ..., 'image': ..., 'sprites': {slug: [x, y, width, height]}}
+    icons = []
+    for slug, path in sorted(icon_paths.items()):
+        with Image.open(path) as image:
+            icons.append((slug, image.convert('RGBA')))
+    cell_width = max(image.width for _, image in icons)
+    cell_height = max(image.height for _, image in icons)
+    columns = math.ceil(math.sqrt(len(icons)))
+    rows = math.ceil(len(icons) / columns)
+
+    sheet = Image.new('RGBA', (columns * cell_width, rows * cell_height), (0, 0, 0, 0))
+    sprites = {}
+    for index, (slug, image) in enumerate(icons):
+        x, y = (index % columns) * cell_width, (index // columns) * cell_height
+        sheet.paste(image, (x, y))
+        sprites[slug] = [x, y, image.width, image.height]
+
+    buffer = io.BytesIO()
+    sheet.save(buffer, 'WEBP', quality=90, method=6)
+    image_data = buffer.getvalue()
+    image_name = f"{ICON_SPRITE}.{content_hash(image_data)}.webp"
+    write_once(f"{SPRITE_DIR}/{image_name}", image_data, written)
+
+    # Background URL is relative to the CSS file, which sits next to the sheet
+    lines = [f".{ICON_CLASS} {{ display: inline-block; width: {cell_width}px; height: {cell_height}px;"
+             f" background: url({image_name}) no-repeat; }}"]
+    for slug, (x, y, width, height) in sprites.items():
+        lines.append(f".{ICON_CLASS}-{slug} {{ background-position: -{x}px -{y}px;"
+                     f" width: {width}px; height: {height}px; }}")
+    css_data = ('\n'.join(lines) + '\n').encode('utf-8')
+    css_path = f"{SPRITE_DIR}/{ICON_SPRITE}.{content_hash(css_data)}.css"
+    write_once(css_path, css_data, written)
+    precompress(css_path, css_data, written)
+
+    return {'css': 'dist/' + css_path, 'image': f"dist/{SPRITE_DIR}/{image_name}", 'sprites': sprites}
+
+
+def remove_stale(written):
+    removed = 0
+    for root, _, files in os.walk(DIST_DIR):
+        for file_name in files:
+            rel_path = os.path.relpath(os.path.join(root, file_name), DIST_DIR).replace(os.sep, '/')
+            if rel_path != MANIFEST_NAME and rel_path not in written:
+                os.remove(os.path.join(root, file_name))
+                removed += 1
+    return removed
+
+
+def build(strict=False):
+    manifest = {'assets': {}, 'variants': {}, 'sprites': {}}
+    written = set()
+    created = 0
+    icon_paths = {}
+
+    for name, path in source_files():
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = content_hash(data)
+        stem, extension = os.path.splitext(name)
+        if extension.lower() not in TEXT_EXTENSIONS:
+            extension = real_extension(path, extension)
+        rel_path = f"{stem}.{digest}{extension}"
+
+        created += write_once(rel_path, data, written)
+        if extension.lower() in TEXT_EXTENSIONS:
+            precompress(rel_path, data, written)
+        manifest['assets'][name] = 'dist/' + rel_path
+
+        if Image is not None and name.startswith(PORTRAIT_DIR + '/'):
+            variants = portrait_variants(name, path, digest, written)
+            if variants:
+                manifest['variants'][name] = variants
+
+        if name.startswith(ICON_DIR + '/') and os.path.basename(stem).endswith(ICON_SUFFIX):
+            icon_paths[os.path.basename(stem)[:-len(ICON_SUFFIX)]] = path
+
+    if Image is not None and icon_paths:
+        manifest['sprites'][ICON_SPRITE] = build_icon_sprite(icon_paths, written)
+
+    problems = missing_operator_images(manifest)
+    for problem in problems:
+        print(f"Missing image: {problem}")
+    if problems and strict:
+        raise SystemExit(f"{len(problems)} operator image(s) missing.")
+
+    removed = remove_stale(written)
+    with open(os.path.join(DIST_DIR, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    print(f"Built {len(manifest['assets'])} assets ({created} new files, {removed} stale files removed), "
+          f"{len(manifest['variants'])} responsive images, {len(icon_paths)} icons in the sprite sheet.")
+    if Image is None:
+        print("Pillow is not installed: skipped the AVIF/WebP portrait variants and the icon sprite sheet.")
+    if brotli is None:
+        print("brotli is not installed: skipped the .br files.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build fingerprinted static assets into static/dist")
+    parser.add_argument('--strict', action='store_true', help="fail when an operator has no portrait or icon")
+    args = parser.parse_args()
+    try:
+        build(strict=args.strict)
+    except OSError as e:
+        print(f"Asset build failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,29 @@
+import os
+import uuid
+
+import requests
+
+
+# load_catalog.py stores a new version in the catalog_version row whenever catalog data changes.
+# Every running app worker compares this value against its cached catalog snapshot
+# and reloads the snapshot once it notices the version has changed.
+def new_catalog_version():
+    return uuid.uuid4().hex
+
+
+# Asks a running app to drop its cached catalog and rendered pages right away instead of waiting
+# for the next version check. Only runs when PAGE_CACHE_PURGE_URL (e.g.
+# https://example.com/admin/purge-cache) and PAGE_CACHE_PURGE_TOKEN are set.
+def purge_page_cache():
+    url = os.getenv('PAGE_CACHE_PURGE_URL')
+    token = os.getenv('PAGE_CACHE_PURGE_TOKEN')
+    if not url or not token:
+        return False
+    try:
+        response = requests.post(url, headers={'X-Purge-Token': token}, timeout=10)
+        response.raise_for_status()
+        print(f"Page cache purged: {response.json()}")
+        return True
+    except Exception as e:
+        print(f"Could not purge the page cache: {e}")
+        return False
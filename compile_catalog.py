@@ -0,0 +1,47 @@
+# compile_catalog.py
+
+# Validates the catalog data files (catalog/*.json) and compiles them into one snapshot file.
+# With CATALOG_SOURCE=snapshot the app loads that file at startup instead of querying the
+# database, which also makes local runs and tests work without any network access.
+#
+# Usage:
+#   python compile_catalog.py                   # writes instance/catalog.snapshot
+#   python compile_catalog.py --output path     # somewhere else (match CATALOG_SNAPSHOT_PATH)
+#   python compile_catalog.py --check           # only validate the data files
+
+import argparse
+import os
+import sys
+
+from r6_fan_app.catalog_files import CatalogValidationError, compile_snapshot, load_catalog_files
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'catalog.snapshot')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and compile the catalog data files")
+    parser.add_argument('--output', default=os.getenv('CATALOG_SNAPSHOT_PATH', DEFAULT_OUTPUT))
+    parser.add_argument('--check', action='store_true', help="validate only, don't write a snapshot")
+    args = parser.parse_args()
+
+    try:
+        data = load_catalog_files()
+    except CatalogValidationError as e:
+        print(e)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"Could not read the catalog data files: {e}")
+        return 1
+
+    counts = f"{len(data['operators'])} operators, {len(data['maps'])} maps, {len(data['game_info'])} game info sections"
+    if args.check:
+        print(f"Catalog data is valid: {counts}.")
+        return 0
+
+    digest = compile_snapshot(data, args.output)
+    print(f"Compiled {counts} into {args.output} (version {digest[:12]}).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
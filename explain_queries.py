@@ -0,0 +1,155 @@
+# explain_queries.py
+
+# Runs the app's database queries through EXPLAIN (ANALYZE, FORMAT JSON) on Postgres and flags
+# every sequential scan that reads more rows than --max-rows, so a missing index shows up before
+# the tables grow. The queries come from two places:
+#   * the statements the app actually sends while serving its GET routes, captured from the
+#     engine while a test client requests each one (the catalog load and version check included);
+#   * the catalog lookups the migrations add indexes for (LOOKUP_QUERIES): by name, by name in
+#     any case, name substring and fuzzy search, and by side.
+# EXPLAIN ANALYZE runs each query for real; only SELECTs are explained, in a transaction that is
+# rolled back.
+#
+# Small tables are always read with a sequential scan, because that is cheaper than an index.
+# --force-index turns sequential scans off (enable_seqscan), so a Seq Scan still in the plan means
+# no index can serve the query at all.
+#
+# Usage:
+#   python explain_queries.py                   # flag sequential scans over 1000 rows
+#   python explain_queries.py --max-rows 200
+#   python explain_queries.py --force-index     # flag any query no index can serve
+# Exits with status 1 when something was flagged and 2 when the database isn't Postgres.
+
+import argparse
+import json
+import sys
+
+from sqlalchemy import event, text
+
+DEFAULT_MAX_ROWS = 1000
+
+# name -> (SQL, parameters)
+LOOKUP_QUERIES = {
+    'operator by name': ("SELECT * FROM operators WHERE name = :name", {'name': 'Ash'}),
+    'operator by name, any case': ("SELECT * FROM operators WHERE lower(name) = lower(:name)", {'name': 'ash'}),
+    'operator name substring': ("SELECT * FROM operators WHERE name ILIKE :pattern", {'pattern': '%ash%'}),
+    'operator name fuzzy': ("SELECT * FROM operators WHERE name % :name", {'name': 'thermit'}),
+    'operators by side': ("SELECT * FROM operators WHERE side = :side", {'side': 'Defender'}),
+    'map by name, any case': ("SELECT * FROM maps WHERE lower(name) = lower(:name)", {'name': 'bank'}),
+}
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from plan_nodes(child)
+
+
+def sequential_scans(plan):
+    # [(table, rows read)]; rows read counts the rows the filter threw away, on every loop
+    scans = []
+    for node in plan_nodes(plan['Plan']):
+        if node['Node Type'] == 'Seq Scan':
+            rows = (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * node.get('Actual Loops', 1)
+            scans.append((node['Relation Name'], int(rows)))
+    return scans
+
+
+def capture_route_statements(app, db):
+    # Returns {statement: parameters} for the SELECTs sent while requesting every GET route
+    from r6_fan_app.catalog import catalog_cache
+
+    statements = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and statement not in statements:
+            statements[statement] = parameters
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        client = app.test_client()
+        for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+            # Routes with arguments (operator and map pages...) read the same catalog snapshot
+            if rule.endpoint.startswith('main.') and 'GET' in rule.methods and not rule.arguments:
+                catalog_cache.invalidate()
+                client.get(rule.rule)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return statements
+
+
+def explain(connection, statement, parameters, force_index, driver_sql):
+    # Returns (plan, error)
+    transaction = connection.begin()
+    try:
+        if force_index:
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        explained = "EXPLAIN (ANALYZE, FORMAT JSON) " + statement
+        if driver_sql:
+            result = connection.exec_driver_sql(explained, parameters)
+        else:
+            result = connection.execute(text(explained), parameters)
+        plan = result.scalar()
+        return (json.loads(plan) if isinstance(plan, str) else plan)[0], None
+    except Exception as e:
+        return None, str(e).splitlines()[0]
+    finally:
+        transaction.rollback()
+
+
+def check(max_rows, force_index):
+    from r6_fan_app import create_app, db
+
+    # Page cache off so every request reaches the views; a 0s version check so every request checks it.
+    # The suggestor's queries don't depend on Gemini, so no LLM key is needed.
+    app = create_app({'PAGE_CACHE_ENABLED': False, 'METRICS_ENABLED': False, 'STARTUP_PREWARM': False,
+                      'CATALOG_VERSION_CHECK_SECONDS': 0, 'LINEUP_MODE': 'engine'})
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            print(f"EXPLAIN ANALYZE plans are only checked on Postgres, not {db.engine.dialect.name}.")
+            return 2
+    if app.config['CATALOG_SOURCE'] == 'snapshot':
+        print("CATALOG_SOURCE=snapshot: the routes don't query the database, only the lookups are checked.")
+
+    queries = [(' '.join(statement.split())[:60], statement, parameters, True)
+               for statement, parameters in capture_route_statements(app, db).items()]
+    queries += [(name, sql, parameters, False) for name, (sql, parameters) in LOOKUP_QUERIES.items()]
+
+    flagged = 0
+    with app.app_context():
+        with db.engine.connect() as connection:
+            for name, statement, parameters, driver_sql in queries:
+                plan, error = explain(connection, statement, parameters, force_index, driver_sql)
+                if error:
+                    print(f"ERROR {name}: {error}")
+                    flagged += 1
+                    continue
+                scans = sequential_scans(plan)
+                too_big = [(table, rows) for table, rows in scans if force_index or rows > max_rows]
+                status = 'SEQ' if too_big else 'ok'
+                detail = ', '.join(f"seq scan on {table} ({rows} rows)" for table, rows in scans) or 'no seq scan'
+                print(f"{status:<5} {plan['Execution Time']:>8.2f} ms  {name}  [{detail}]")
+                flagged += bool(too_big)
+
+    limit = "with sequential scans turned off" if force_index else f"over {max_rows} rows"
+    if flagged:
+        print(f"\n{flagged} of {len(queries)} queries flagged (sequential scans {limit}, or errors).")
+        return 1
+    print(f"\nChecked {len(queries)} queries: no sequential scans {limit}.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag app queries that sequentially scan large tables")
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help=f"rows a sequential scan may read before it is flagged (default {DEFAULT_MAX_ROWS})")
+    parser.add_argument('--force-index', action='store_true',
+                        help="turn sequential scans off and flag every query that still needs one")
+    args = parser.parse_args()
+    return check(args.max_rows, args.force_index)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# freeze.py
+
+# Exports the read-only part of the site as static files, so a CDN or nginx can serve it with no
+# Python on the hot path and Flask only handles what is left (the lineup suggestor, /api/search,
+# /healthz...). The blueprint's URL map is walked and every catalog page is rendered through the
+# app, with one file per operator and map slug:
+#   /                      -> index.html
+#   /operators/ash         -> operators/ash/index.html
+#   /api/map-sites         -> api/map-sites.json
+# Every file gets precompressed .gz (and .br, when the brotli package is installed) copies, the
+# static folder is copied to static/, and freeze-manifest.json records each URL with its file and
+# a digest of the catalog rows it was rendered from.
+#
+# Re-running it only re-renders the pages whose source rows changed (an operator's page when that
+# operator changed, the operators list when any operator did...) and deletes the pages of removed
+# operators and maps. A template or asset build change re-renders everything.
+#
+# Usage:
+#   python freeze.py                    # into ./frozen
+#   python freeze.py --output /srv/r6   # somewhere else
+#   python freeze.py --full             # re-render every page
+#   python freeze.py --no-static        # pages only (static files served elsewhere)
+
+import argparse
+import filecmp
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frozen')
+MANIFEST_NAME = 'freeze-manifest.json'
+# Bump when the output layout changes, so the next run re-renders everything
+FREEZE_FORMAT = 1
+
+# Endpoints that are a pure function of the catalog. The view's arguments come from
+# a function of the catalog returning [(url arguments, source rows), ...].
+FROZEN_ENDPOINTS = {
+    'main.index': lambda catalog: [({}, ())],
+    'main.operators': lambda catalog: [({}, catalog.operators)],
+    'main.operator_detail': lambda catalog: [
+        ({'operator_name_slug': catalog.operator_slugs.slug_for(op)}, (op,)) for op in catalog.operators
+    ],
+    'main.maps_list': lambda catalog: [({}, catalog.maps)],
+    'main.map_detail': lambda catalog: [
+        ({'map_name_slug': catalog.map_slugs.slug_for(map_item)}, (map_item,)) for map_item in catalog.maps
+    ],
+    'main.game_info': lambda catalog: [({}, catalog.game_info)],
+    'main.get_all_map_sites': lambda catalog: [({}, catalog.maps)],
+    # Loaded by the operators page for its client-side search
+    'main.search_index': lambda catalog: [({}, catalog.operators)],
+}
+
+
+def source_digest(rows):
+    # View models include the resolved synergy/counter links, so renaming or removing an
+    # operator also changes the digest of every page that links to it
+    payload = json.dumps([asdict(row) for row in rows], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def output_path(url, mimetype):
+    path = url.strip('/')
+    if mimetype == 'application/json':
+        return path + '.json'
+    return f"{path}/index.html" if path else 'index.html'
+
+
+def remove_file(output, rel_path):
+    for suffix in ('', '.gz', '.br'):
+        path = os.path.join(output, rel_path + suffix)
+        if os.path.exists(path):
+            os.remove(path)
+    # Drop directories left empty (e.g. operators/<removed operator>/)
+    directory = os.path.dirname(os.path.join(output, rel_path))
+    while directory != output and os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+
+def write_file(output, rel_path, data):
+    path = os.path.join(output, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    # Precompressed copies for gzip_static/brotli_static; dropped when they wouldn't be smaller
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def load_manifest(output):
+    try:
+        with open(os.path.join(output, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def frozen_urls(app, catalog):
+    # Returns ({url: (endpoint, source digest)}, [routes left to Flask])
+    from flask import url_for
+
+    urls = {}
+    dynamic = []
+    with app.test_request_context():
+        for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+            if not rule.endpoint.startswith('main.'):
+                continue
+            if rule.endpoint not in FROZEN_ENDPOINTS or 'GET' not in rule.methods:
+                dynamic.append(rule.rule)
+                continue
+            for arguments, rows in FROZEN_ENDPOINTS[rule.endpoint](catalog):
+                urls[url_for(rule.endpoint, **arguments)] = (rule.endpoint, source_digest(rows))
+    return urls, dynamic
+
+
+def copy_static(app, output):
+    # Mirrors the static folder (hashed dist/ files and their .gz/.br copies included) into static/
+    target = os.path.join(output, 'static')
+    copied = 0
+    expected = set()
+    for root, dirs, files in os.walk(app.static_folder):
+        dirs.sort()
+        for file_name in files:
+            source = os.path.join(root, file_name)
+            rel_path = os.path.relpath(source, app.static_folder)
+            expected.add(rel_path)
+            destination = os.path.join(target, rel_path)
+            if os.path.exists(destination) and filecmp.cmp(source, destination, shallow=False):
+                continue
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(source, destination)
+            copied += 1
+    removed = 0
+    for root, _, files in os.walk(target):
+        for file_name in files:
+            path = os.path.join(root, file_name)
+            if os.path.relpath(path, target) not in expected:
+                os.remove(path)
+                removed += 1
+    return copied, removed
+
+
+def freeze(output, full=False, static=True):
+    from r6_fan_app import create_app
+    from r6_fan_app.assets import asset_manifest
+    from r6_fan_app.catalog import get_catalog
+    from r6_fan_app.page_cache import templates_fingerprint
+
+    # Rendered straight from the views: the page cache and metrics would only add overhead here.
+    # The frozen pages never call the suggestor, so no LLM key is needed.
+    app = create_app({'PAGE_CACHE_ENABLED': False, 'METRICS_ENABLED': False, 'LINEUP_MODE': 'engine'})
+    with app.app_context():
+        catalog = get_catalog()
+    build = f"{FREEZE_FORMAT}|{templates_fingerprint(app)}|{asset_manifest.digest}"
+    urls, dynamic = frozen_urls(app, catalog)
+
+    previous = load_manifest(output)
+    previous_pages = previous.get('pages', {}) if previous.get('build') == build and not full else {}
+    pages = {}
+    rendered = 0
+    client = app.test_client()
+    for url, (endpoint, sources) in urls.items():
+        entry = previous_pages.get(url)
+        if entry and entry['sources'] == sources and os.path.exists(os.path.join(output, entry['file'])):
+            pages[url] = entry
+            continue
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+        body = response.get_data()
+        rel_path = output_path(url, response.mimetype)
+        write_file(output, rel_path, body)
+        pages[url] = {
+            'file': rel_path,
+            'endpoint': endpoint,
+            'content_type': response.content_type,
+            'sources': sources,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'bytes': len(body),
+        }
+        rendered += 1
+
+    removed = 0
+    for url, entry in previous.get('pages', {}).items():
+        if url not in pages or pages[url]['file'] != entry['file']:
+            remove_file(output, entry['file'])
+            removed += 1
+
+    manifest = {
+        'build': build,
+        'catalog_version': catalog.version,
+        'frozen_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'pages': pages,
+        'dynamic': dynamic,  # still served by Flask
+    }
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    print(f"Froze {len(pages)} pages into {output}: {rendered} rendered, {len(pages) - rendered} unchanged, "
+          f"{removed} removed.")
+    if static:
+        copied, stale = copy_static(app, output)
+        print(f"Static files: {copied} copied, {stale} stale files removed.")
+    print(f"Left to Flask: {', '.join(dynamic)}")
+    if brotli is None:
+        print("brotli is not installed: skipped the .br files.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the catalog pages as a static site")
+    parser.add_argument('--output', default=os.getenv('FREEZE_OUTPUT', DEFAULT_OUTPUT))
+    parser.add_argument('--full', action='store_true', help="re-render every page, not just the changed ones")
+    parser.add_argument('--no-static', action='store_true', help="don't copy the static folder")
+    args = parser.parse_args()
+    try:
+        freeze(os.path.abspath(args.output), full=args.full, static=not args.no_static)
+    except (OSError, RuntimeError) as e:
+        print(f"Freeze failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# gemini_stub.py
+
+# A tiny local stand-in for the Gemini generateContent and streamGenerateContent (SSE)
+# endpoints, for trying the lineup suggestor without a real API key or network access.
+# Requests in JSON mode (generationConfig.responseMimeType) get the reply's names as
+# {"operators": [...]}; every answer carries a rough usageMetadata.
+#
+# Usage:
+#   python gemini_stub.py --port 8765 --latency 1.5 --chunk-delay 0.2 --reply "Ash, Thermite, Thatcher, Twitch, Sledge"
+#   python gemini_stub.py --status 503    # answer every call with an error, to try the fallbacks
+#   LLM_API_BASE=http://127.0.0.1:8765/v1beta flask run
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = "Ash, Thermite, Thatcher, Twitch, Sledge"
+
+
+# Streamed replies are cut into pieces of this many characters
+STREAM_CHUNK_SIZE = 8
+
+
+def candidate(text):
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+def reply_text(reply, payload):
+    config = payload.get('generationConfig') or {}
+    if config.get('responseMimeType') != 'application/json':
+        return reply
+    return json.dumps({'operators': [name.strip() for name in reply.split(',') if name.strip()]})
+
+
+def usage_metadata(payload, text):
+    # About four characters per token, like the real tokenizer on English text
+    prompt = ''.join(part.get('text', '') for content in payload.get('contents', [])
+                     for part in content.get('parts', []))
+    prompt_tokens, output_tokens = len(prompt) // 4 + 1, len(text) // 4 + 1
+    return {'promptTokenCount': prompt_tokens, 'candidatesTokenCount': output_tokens,
+            'totalTokenCount': prompt_tokens + output_tokens}
+
+
+def make_handler(reply, latency, chunk_delay, status=200):
+    class GeminiStubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            try:
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self.send_error(400)
+                return
+            if status != 200:
+                time.sleep(latency)
+                self.send_error(status)
+                return
+            text = reply_text(reply, payload)
+
+            path = self.path.split('?')[0]
+            if path.endswith(':streamGenerateContent'):
+                self.stream_reply(text, usage_metadata(payload, text))
+                return
+            if not path.endswith(':generateContent'):
+                self.send_error(404)
+                return
+
+            time.sleep(latency)
+            body = json.dumps(dict(candidate(text), usageMetadata=usage_metadata(payload, text))).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def stream_reply(self, text, usage):
+            # Server-sent events over chunked transfer encoding, one small piece of the reply per event
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            time.sleep(latency)
+            for i in range(0, len(text), STREAM_CHUNK_SIZE):
+                if i:
+                    time.sleep(chunk_delay)
+                chunk = candidate(text[i:i + STREAM_CHUNK_SIZE])
+                if i + STREAM_CHUNK_SIZE >= len(text):
+                    chunk['usageMetadata'] = usage  # the final totals, on the last chunk
+                event = f"data: {json.dumps(chunk)}\r\n\r\n".encode('utf-8')
+                self.wfile.write(f"{len(event):x}\r\n".encode('ascii') + event + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, format, *args):
+            pass  # keep the console quiet
+
+    return GeminiStubHandler
+
+
+def make_server(host='127.0.0.1', port=8765, reply=DEFAULT_REPLY, latency=0.0, chunk_delay=0.0, status=200):
+    # port=0 picks a free port (see server.server_address)
+    return ThreadingHTTPServer((host, port), make_handler(reply, latency, chunk_delay, status))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local stub for the Gemini generateContent API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument('--chunk-delay', type=float, default=0.0,
+                        help="seconds between streamed pieces of the reply")
+    parser.add_argument('--reply', default=DEFAULT_REPLY, help="text the fake model answers with")
+    parser.add_argument('--status', type=int, default=200, help="HTTP status to answer with (an error, e.g. 503)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.reply, args.latency, args.chunk_delay, args.status)
+    print(f"Gemini stub listening on http://{args.host}:{args.port}/v1beta")
+    server.serve_forever()
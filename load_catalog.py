@@ -0,0 +1,196 @@
+# load_catalog.py
+
+# Brings the operators, maps and game_info tables in line with the catalog data files (catalog/*.json).
+# Replaces the old populate_* scripts, which blindly inserted through the Supabase HTTP API
+# and failed or duplicated rows when run twice.
+#
+# The files are validated first (see r6_fan_app/catalog_files.py); nothing is written if they have problems.
+# Everything happens in one database transaction through the app's SQLAlchemy engine:
+#   1. each table is read once and compared with the data files on its natural key;
+#   2. new and changed rows are written with one multi-row INSERT ... ON CONFLICT DO UPDATE
+#      per table (unchanged rows aren't written at all);
+#   3. if anything changed, the catalog_version row is bumped so running workers reload.
+# Rows that exist only in the database are reported, and deleted with --prune.
+#
+# Usage:
+#   python load_catalog.py              # load and report inserted/updated/unchanged counts
+#   python load_catalog.py --dry-run    # only report what would change
+#   python load_catalog.py --prune      # also delete rows that are no longer in the data files
+
+import argparse
+import sys
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from catalog_version import new_catalog_version, purge_page_cache
+from r6_fan_app import create_app, db
+from r6_fan_app.catalog_files import CatalogValidationError, load_catalog_files
+from r6_fan_app.models import CatalogVersion, GameInfo, Map, Operator
+
+# (model, natural key column, list in the catalog data)
+CATALOG_TABLES = (
+    (Operator, 'name', 'operators'),
+    (Map, 'name', 'maps'),
+    (GameInfo, 'section_title', 'game_info'),
+)
+
+# Postgres allows at most 65535 bind parameters per statement
+MAX_BIND_PARAMS = 65535
+
+INSERT_BY_DIALECT = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+class CatalogDataError(Exception):
+    pass
+
+
+@dataclass
+class TableReport:
+    table: str
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    extra: int = 0  # rows only in the database
+    deleted: int = 0
+
+    @property
+    def changed(self):
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+def prepare_rows(table, key, rows):
+    # Every row gets the same columns (missing ones become NULL) so they fit one multi-row INSERT
+    columns = []
+    for row in rows:
+        for column in row:
+            if column not in columns:
+                columns.append(column)
+    unknown = [column for column in columns if column not in table.c]
+    if unknown:
+        raise CatalogDataError(f"{table.name}: unknown column(s) {', '.join(unknown)}")
+    if 'id' in columns:
+        raise CatalogDataError(f"{table.name}: rows are matched on '{key}', don't set 'id'")
+
+    prepared = {}
+    for row in rows:
+        if not row.get(key):
+            raise CatalogDataError(f"{table.name}: row without a '{key}': {row}")
+        if row[key] in prepared:
+            raise CatalogDataError(f"{table.name}: duplicate {key} '{row[key]}'")
+        prepared[row[key]] = {column: row.get(column) for column in columns}
+    return columns, prepared
+
+
+def upsert(connection, table, key, columns, rows):
+    insert = INSERT_BY_DIALECT.get(connection.dialect.name)
+    if insert is None:
+        raise CatalogDataError(f"Upserts are not supported on {connection.dialect.name}")
+    batch_size = max(1, MAX_BIND_PARAMS // len(columns))
+    for start in range(0, len(rows), batch_size):
+        statement = insert(table).values(rows[start:start + batch_size])
+        statement = statement.on_conflict_do_update(
+            index_elements=[key],
+            set_={column: statement.excluded[column] for column in columns if column != key},
+        )
+        connection.execute(statement)
+
+
+def sync_table(connection, model, key, rows, prune=False, dry_run=False):
+    table = model.__table__
+    report = TableReport(table.name)
+    columns, wanted = prepare_rows(table, key, rows)
+
+    existing = {row[key]: row for row in connection.execute(select(table)).mappings()}
+    to_write = []
+    for name, row in wanted.items():
+        current = existing.get(name)
+        if current is None:
+            report.inserted += 1
+        elif any(current[column] != row[column] for column in columns):
+            report.updated += 1
+        else:
+            report.unchanged += 1
+            continue
+        to_write.append(row)
+
+    extra = [name for name in existing if name not in wanted]
+    report.extra = len(extra)
+
+    if dry_run:
+        report.deleted = report.extra if prune else 0
+        return report
+    if to_write:
+        upsert(connection, table, key, columns, to_write)
+    if prune and extra:
+        connection.execute(table.delete().where(table.c[key].in_(extra)))
+        report.deleted = len(extra)
+    return report
+
+
+def bump_version(connection):
+    version = new_catalog_version()
+    insert = INSERT_BY_DIALECT[connection.dialect.name]
+    table = CatalogVersion.__table__
+    statement = insert(table).values(id=1, version=version)
+    connection.execute(statement.on_conflict_do_update(index_elements=['id'], set_={'version': version}))
+    return version
+
+
+def load_catalog(prune=False, dry_run=False, force_bump=False):
+    data = load_catalog_files()
+    reports = []
+    version = None
+    # Only the database settings are needed: no LLM key, and never the compiled snapshot's empty database
+    app = create_app({'STARTUP_PREWARM': False, 'LINEUP_MODE': 'engine', 'CATALOG_SOURCE': 'database'})
+    with app.app_context():
+        with db.engine.begin() as connection:  # one transaction: all tables change together or not at all
+            for model, key, data_key in CATALOG_TABLES:
+                reports.append(sync_table(connection, model, key, data[data_key], prune=prune,
+                                          dry_run=dry_run))
+            if not dry_run and (force_bump or any(report.changed for report in reports)):
+                version = bump_version(connection)
+    return reports, version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the catalog data files into the database")
+    parser.add_argument('--dry-run', action='store_true', help="report changes without writing anything")
+    parser.add_argument('--prune', action='store_true', help="delete rows that are not in the data files")
+    parser.add_argument('--bump', action='store_true', help="bump the catalog version even if nothing changed")
+    args = parser.parse_args()
+
+    try:
+        reports, version = load_catalog(prune=args.prune, dry_run=args.dry_run, force_bump=args.bump)
+    except CatalogValidationError as e:
+        print(e)
+        return 1
+    except CatalogDataError as e:
+        print(f"Invalid catalog data: {e}")
+        return 1
+    except Exception as e:
+        print(f"Loading the catalog failed, nothing was changed: {e}")
+        return 1
+
+    for report in reports:
+        line = (f"{report.table}: {report.inserted} inserted, {report.updated} updated, "
+                f"{report.unchanged} unchanged")
+        if report.deleted:
+            line += f", {report.deleted} deleted"
+        elif report.extra:
+            line += f", {report.extra} only in the database (use --prune to delete)"
+        print(line)
+
+    if args.dry_run:
+        print("Dry run: nothing was written.")
+    elif version:
+        print(f"Catalog version bumped to {version}.")
+        purge_page_cache()
+    else:
+        print("Catalog already up to date.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""catalog indexes
+
+Revision ID: 897a67d18899
+Revises: e273a285ccd5
+Create Date: 2026-10-18 10:31:07.218840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '897a67d18899'
+down_revision = 'e273a285ccd5'
+branch_labels = None
+depends_on = None
+
+
+# Indexes for the lookups made against the catalog tables (see explain_queries.py):
+#   * lower(name), unique on operators and maps: "Jäger" and "jäger" can't both exist, and
+#     case-insensitive lookups by name use an index;
+#   * a pg_trgm GIN index on operators.name for ILIKE '%...%' and fuzzy (%) name search;
+#   * operators.side, for the side filter.
+# Each index is skipped when it already exists (e.g. created by hand). The tables are small, so
+# plain CREATE INDEX (not CONCURRENTLY) only locks them for a moment.
+
+def upgrade():
+    op.create_index('ix_operators_name_lower', 'operators', [sa.text('lower(name)')], unique=True,
+                    if_not_exists=True)
+    op.create_index('ix_maps_name_lower', 'maps', [sa.text('lower(name)')], unique=True, if_not_exists=True)
+    op.create_index('ix_operators_side', 'operators', ['side'], if_not_exists=True)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Already enabled on Supabase projects (in the extensions schema, which is on the search_path)
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_operators_name_trgm', 'operators', ['name'], postgresql_using='gin',
+                        postgresql_ops={'name': 'gin_trgm_ops'}, if_not_exists=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # pg_trgm is left installed: other schemas may use it
+        op.drop_index('ix_operators_name_trgm', table_name='operators')
+    op.drop_index('ix_operators_side', table_name='operators')
+    op.drop_index('ix_maps_name_lower', table_name='maps')
+    op.drop_index('ix_operators_name_lower', table_name='operators')
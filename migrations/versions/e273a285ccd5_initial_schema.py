@@ -0,0 +1,94 @@
+"""initial schema
+
+Revision ID: e273a285ccd5
+Revises:
+Create Date: 2026-10-18 10:12:41.503114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e273a285ccd5'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# The tables used to be created by hand in the Supabase SQL editor, so existing databases
+# already have them: each one is only created when it is missing, and the first
+# `flask db upgrade` adopts a hand-made schema instead of failing on it.
+
+def has_unique(inspector, table, column):
+    constraints = inspector.get_unique_constraints(table)
+    indexes = [index for index in inspector.get_indexes(table) if index.get('unique')]
+    return any(item['column_names'] == [column] for item in constraints + indexes)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if 'operators' not in tables:
+        op.create_table(
+            'operators',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.Text(), nullable=False),
+            sa.Column('side', sa.Text(), nullable=False),
+            sa.Column('ability', sa.Text(), nullable=False),
+            sa.Column('secondary_gadgets', sa.Text(), nullable=True),
+            sa.Column('armor', sa.Integer(), nullable=True),
+            sa.Column('speed', sa.Integer(), nullable=True),
+            sa.Column('role', sa.Text(), nullable=True),
+            sa.Column('short_bio', sa.Text(), nullable=True),
+            sa.Column('synergy_examples', sa.Text(), nullable=True),
+            sa.Column('counter_examples', sa.Text(), nullable=True),
+            sa.Column('solo_friendly', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name'),
+        )
+
+    if 'maps' not in tables:
+        op.create_table(
+            'maps',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.Text(), nullable=False),
+            sa.Column('image_url', sa.Text(), nullable=False),
+            sa.Column('defender_sites', sa.Text(), nullable=False),
+            sa.Column('electricity_needed', sa.Boolean(), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name'),
+        )
+
+    if 'game_info' not in tables:
+        op.create_table(
+            'game_info',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('section_title', sa.String(length=100), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('section_title'),
+        )
+    elif not has_unique(inspector, 'game_info', 'section_title'):
+        # load_catalog.py upserts game_info ON CONFLICT (section_title). Batch mode, because SQLite
+        # can only add a constraint by rebuilding the table (a plain ALTER TABLE on Postgres)
+        with op.batch_alter_table('game_info') as batch_op:
+            batch_op.create_unique_constraint('game_info_section_title_key', ['section_title'])
+
+    if 'catalog_version' not in tables:
+        catalog_version = op.create_table(
+            'catalog_version',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('version', sa.Text(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.bulk_insert(catalog_version, [{'id': 1, 'version': 'initial'}])
+
+
+def downgrade():
+    op.drop_table('catalog_version')
+    op.drop_table('game_info')
+    op.drop_table('maps')
+    op.drop_table('operators')
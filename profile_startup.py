@@ -0,0 +1,97 @@
+# profile_startup.py
+
+# Shows where a worker's startup time goes:
+#   1. imports: runs `python -X importtime -c "import r6_fan_app.routes"` in a fresh interpreter and
+#      lists the slowest modules and top-level packages (cumulative time, so a package includes
+#      everything it pulled in);
+#   2. boot: times importing the package, create_app() phase by phase and the first requests
+#      (first one cold, second one warm) through the Flask test client.
+# Uses the same environment (.env) as the app. CATALOG_SOURCE=snapshot LINEUP_MODE=engine profiles
+# without a database or API key.
+#
+# Usage:
+#   python profile_startup.py                   # both reports
+#   python profile_startup.py --top 30          # longer import list
+#   python profile_startup.py --path /maps      # first request to another page
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+IMPORT_TARGET = 'r6_fan_app.routes'  # the package itself is only the factory
+
+
+def import_times(target=IMPORT_TARGET):
+    # Returns [(module, self_us, cumulative_us), ...] from a fresh interpreter's -X importtime output
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {target} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def import_report(top):
+    rows = import_times()
+    total = sum(self_us for _, self_us, _ in rows)
+    print(f"Imports: {len(rows)} modules, {total / 1000:.1f} ms")
+
+    print("\nSlowest modules (cumulative):")
+    for module, _, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+    packages = defaultdict(int)
+    for module, self_us, _ in rows:
+        packages[module.split('.')[0]] += self_us
+    print("\nBy top-level package (self time):")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+
+def boot_report(path):
+    started = time.perf_counter()
+    import r6_fan_app.routes  # noqa: F401 -- timed separately from create_app()
+    imported = time.perf_counter()
+    from r6_fan_app import create_app
+    app = create_app()
+    booted = time.perf_counter()
+
+    print("\nBoot:")
+    print(f"  {(imported - started) * 1000:8.1f} ms  import")
+    for phase, seconds in app.config['STARTUP_TIMINGS'].items():
+        if phase != 'total':
+            print(f"  {seconds * 1000:8.1f} ms  create_app: {phase}")
+    print(f"  {(booted - imported) * 1000:8.1f} ms  create_app total")
+
+    client = app.test_client()
+    for label in ('first', 'second'):
+        request_started = time.perf_counter()
+        response = client.get(path)
+        print(f"  {(time.perf_counter() - request_started) * 1000:8.1f} ms  {label} request "
+              f"GET {path} -> {response.status_code}")
+    print(f"  {(time.perf_counter() - started) * 1000:8.1f} ms  total until the first two requests were answered")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the app's imports and startup")
+    parser.add_argument('--top', type=int, default=15, help="how many modules/packages to list")
+    parser.add_argument('--path', default='/operators', help="page to request after booting")
+    parser.add_argument('--imports-only', action='store_true', help="skip the timed boot")
+    args = parser.parse_args()
+
+    import_report(args.top)
+    if not args.imports_only:
+        boot_report(args.path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,43 +1,216 @@
 # r6_fan_app/__init__.py
 
+# Application factory. Importing the package is cheap: the app, its database engine and the
+# blueprint are only built when create_app() runs (run.py does it for Gunicorn, and `flask run`
+# finds it by name). Clients that are only needed for some requests, such as the Gemini HTTP
+# session, are created on first use.
+
+import os
+import time
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-import os
 from dotenv import load_dotenv
 
+try:
+    from flask_migrate import Migrate
+except ImportError:  # only needed where migrations are run (`flask db upgrade`), see requirements-tools.txt
+    Migrate = None
+
 # Load environment variables from .env file as early as possible
 load_dotenv()
 
-# Create the Flask application instance
-app = Flask(__name__)
+# Bound to the app in create_app(); models and queries import it from here
+db = SQLAlchemy()
+
+
+def env_flag(name, default):
+    # On/off setting: 0, false, no and off turn it off, any other value turns it on; unset or empty uses default
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
+    return value.lower() not in ('0', 'false', 'no', 'off')
+
+
+def load_config(app, overrides=None):
+    # overrides: settings passed to create_app(); the ones read here decide which others are required
+    overrides = overrides or {}
+
+    def setting(name, default):
+        return overrides.get(name, os.getenv(name, default))
+
+    # --- Database Configuration ---
+    DB_USER = os.getenv('user')
+    DB_PASSWORD = os.getenv('password')
+    DB_HOST = os.getenv('host')
+    DB_PORT = os.getenv('port')
+    DB_NAME = os.getenv('dbname')
+    # A full connection URL (e.g. Supabase's pooler URL) takes precedence over the separate settings
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    LLM_API_KEY = os.getenv('LLM_API_KEY')  # Also load LLM API Key here
+
+    # Where the catalog comes from: 'database' (Postgres) or 'snapshot' (a file built by compile_catalog.py,
+    # which needs no database or network at all)
+    CATALOG_SOURCE = setting('CATALOG_SOURCE', 'database')
+    # 'llm' asks Gemini (falling back to the built-in lineup engine when it is busy or down);
+    # 'engine' answers from the lineup engine only, without any LLM call
+    LINEUP_MODE = setting('LINEUP_MODE', 'llm')
+
+    required = {'LLM_API_KEY': LLM_API_KEY} if LINEUP_MODE == 'llm' else {}
+    if CATALOG_SOURCE != 'snapshot' and not DATABASE_URL:
+        required.update(user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT, dbname=DB_NAME)
+    if not all(required.values()):
+        print("Error: Crucial environment variables are not fully set.")
+        print(f"Ensure {', '.join(required)} are in your .env file.")
+        raise EnvironmentError("Required environment variables missing from .env or environment.")
+
+    if DATABASE_URL:
+        # Hosting providers often hand out postgres:// URLs, which SQLAlchemy no longer accepts
+        if DATABASE_URL.startswith('postgres://'):
+            DATABASE_URL = 'postgresql://' + DATABASE_URL[len('postgres://'):]
+        app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
+    elif all([DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME]):
+        app.config['SQLALCHEMY_DATABASE_URI'] = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+    else:
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'  # snapshot mode without a database; nothing queries it
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    app.config['CATALOG_SOURCE'] = CATALOG_SOURCE
+    app.config['CATALOG_SNAPSHOT_PATH'] = os.getenv('CATALOG_SNAPSHOT_PATH',
+                                                    os.path.join(app.instance_path, 'catalog.snapshot'))
+    # --- End Database Configuration ---
+
+    # --- LLM (Gemini) Configuration ---
+    app.config['LLM_API_KEY'] = LLM_API_KEY
+    # Base URL can point at a local stub server (see gemini_stub.py) for testing
+    app.config['LLM_API_BASE'] = os.getenv('LLM_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
+    app.config['LLM_MODEL'] = os.getenv('LLM_MODEL', 'gemini-2.0-flash')
+    app.config['LLM_CONNECT_TIMEOUT'] = float(os.getenv('LLM_CONNECT_TIMEOUT', '3.05'))
+    app.config['LLM_READ_TIMEOUT'] = float(os.getenv('LLM_READ_TIMEOUT', '20'))
+    app.config['LLM_TOTAL_TIMEOUT'] = float(os.getenv('LLM_TOTAL_TIMEOUT', '25'))
+    # At most this many Gemini calls run at once per worker; extra requests wait LLM_QUEUE_TIMEOUT seconds, then get a 503
+    app.config['LLM_MAX_CONCURRENCY'] = int(os.getenv('LLM_MAX_CONCURRENCY', '4'))
+    app.config['LLM_QUEUE_TIMEOUT'] = float(os.getenv('LLM_QUEUE_TIMEOUT', '0.5'))
+    # Per-call budget: Gemini stops after LLM_MAX_OUTPUT_TOKENS (a five-name JSON lineup needs ~40), and
+    # calls slower than LLM_LATENCY_BUDGET seconds are counted in /metrics
+    app.config['LLM_MAX_OUTPUT_TOKENS'] = int(os.getenv('LLM_MAX_OUTPUT_TOKENS', '256'))
+    app.config['LLM_LATENCY_BUDGET'] = float(os.getenv('LLM_LATENCY_BUDGET', '5'))
+    app.config['LINEUP_MODE'] = LINEUP_MODE
+    # --- End LLM Configuration ---
+
+    # --- Suggestion Cache Configuration ---
+    # 'sqlite' (shared by all workers on the machine), 'memory' (per worker) or 'none'
+    app.config['SUGGESTION_CACHE_BACKEND'] = os.getenv('SUGGESTION_CACHE_BACKEND', 'sqlite')
+    app.config['SUGGESTION_CACHE_PATH'] = os.getenv('SUGGESTION_CACHE_PATH',
+                                                    os.path.join(app.instance_path, 'suggestions.sqlite3'))
+    app.config['SUGGESTION_CACHE_TTL'] = float(os.getenv('SUGGESTION_CACHE_TTL', str(24 * 60 * 60)))
+    app.config['SUGGESTION_CACHE_MAX_ENTRIES'] = int(os.getenv('SUGGESTION_CACHE_MAX_ENTRIES', '5000'))
+    # Token-set similarity (0-1) at which a cached answer is reused for a differently worded situation; 1 disables it
+    app.config['SUGGESTION_CACHE_SIMILARITY'] = float(os.getenv('SUGGESTION_CACHE_SIMILARITY', '0.9'))
+    # --- End Suggestion Cache Configuration ---
+
+    # --- Rate Limit Configuration ---
+    # Token buckets for suggestor POSTs: one per client IP and one shared by everyone (see rate_limit.py).
+    # 'sqlite' (shared by all workers on the machine), 'memory' (per worker) or 'none'
+    app.config['RATE_LIMIT_BACKEND'] = os.getenv('RATE_LIMIT_BACKEND', 'sqlite')
+    app.config['RATE_LIMIT_PATH'] = os.getenv('RATE_LIMIT_PATH', os.path.join(app.instance_path, 'ratelimit.sqlite3'))
+    app.config['RATE_LIMIT_CLIENT_BURST'] = float(os.getenv('RATE_LIMIT_CLIENT_BURST', '5'))
+    app.config['RATE_LIMIT_CLIENT_PER_MINUTE'] = float(os.getenv('RATE_LIMIT_CLIENT_PER_MINUTE', '10'))
+    app.config['RATE_LIMIT_GLOBAL_BURST'] = float(os.getenv('RATE_LIMIT_GLOBAL_BURST', '30'))
+    app.config['RATE_LIMIT_GLOBAL_PER_MINUTE'] = float(os.getenv('RATE_LIMIT_GLOBAL_PER_MINUTE', '120'))
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted for the client IP (1 on Render)
+    app.config['TRUSTED_PROXY_COUNT'] = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+    # --- End Rate Limit Configuration ---
+
+    # Browser cache lifetime (seconds) for cacheable JSON endpoints; after that they revalidate via ETag
+    app.config['API_CACHE_MAX_AGE'] = int(os.getenv('API_CACHE_MAX_AGE', '300'))
+
+    # --- Page Cache Configuration ---
+    # Rendered catalog pages are kept per worker (with gzip/brotli variants) until the catalog version changes
+    app.config['PAGE_CACHE_ENABLED'] = env_flag('PAGE_CACHE_ENABLED', True)
+    app.config['PAGE_CACHE_MAX_BYTES'] = int(os.getenv('PAGE_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+    # 0 means browsers must revalidate every time (cheap 304s, changes show up immediately)
+    app.config['PAGE_CACHE_MAX_AGE'] = int(os.getenv('PAGE_CACHE_MAX_AGE', '0'))
+    # Shared secret for POST /admin/purge-cache; the endpoint is disabled when unset
+    app.config['PAGE_CACHE_PURGE_TOKEN'] = os.getenv('PAGE_CACHE_PURGE_TOKEN', '')
+    # --- End Page Cache Configuration ---
+
+    # How often (seconds) each worker checks the catalog_version row before trusting its cached snapshot
+    app.config['CATALOG_VERSION_CHECK_SECONDS'] = float(os.getenv('CATALOG_VERSION_CHECK_SECONDS', '30'))
+    # Compile the templates (and with CATALOG_SOURCE=snapshot, load the compiled catalog) while the
+    # worker boots, so the first request waits on neither
+    app.config['STARTUP_PREWARM'] = env_flag('STARTUP_PREWARM', True)
+    # Request/DB/LLM instrumentation, the Server-Timing header and /metrics (see metrics.py)
+    app.config['METRICS_ENABLED'] = env_flag('METRICS_ENABLED', True)
+    # Bearer token Prometheus sends to read /metrics; the endpoint is disabled when unset
+    app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN', '')
+
+
+def prewarm(app):
+    from .catalog import catalog_cache
+    with app.app_context():
+        catalog_cache.prewarm()
+    for template in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(template)
+
+
+def create_app(config=None):
+    # config: optional dict applied on top of the environment settings (used by scripts)
+    timings = {}
+    started = last = time.perf_counter()
+
+    def phase(name):
+        nonlocal last
+        now = time.perf_counter()
+        timings[name] = round(now - last, 4)
+        last = now
+
+    # Create the Flask application instance
+    app = Flask(__name__)
+    load_config(app, config)
+    app.config.update(config or {})
+    if app.config['TRUSTED_PROXY_COUNT']:
+        # request.remote_addr becomes the client's address rather than the proxy's
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'])
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        # Pool size, timeouts and pgbouncer mode come from DB_* variables (see engine_config.py)
+        from .engine_config import engine_options_from_env
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options_from_env(app.config['SQLALCHEMY_DATABASE_URI'])
+    phase('config')
 
-# --- Database Configuration ---
-DB_USER = os.getenv('user')
-DB_PASSWORD = os.getenv('password')
-DB_HOST = os.getenv('host')
-DB_PORT = os.getenv('port')
-DB_NAME = os.getenv('dbname')
-LLM_API_KEY = os.getenv('LLM_API_KEY')  # Also load LLM API Key here
+    # Initialize SQLAlchemy with the Flask app
+    db.init_app(app)
+    from .engine_config import init_engine
+    init_engine(app, db)
+    from .metrics import init_metrics
+    init_metrics(app, db)
+    if Migrate is not None:
+        # Schema migrations live in migrations/ at the project root
+        Migrate(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'))
+    phase('database')
 
-if not all([DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME, LLM_API_KEY]):
-    print("Error: Crucial environment variables are not fully set.")
-    print("Ensure user, password, host, port, dbname, and LLM_API_KEY are in your .env file.")
-    raise EnvironmentError("Required environment variables missing from .env or environment.")
+    # --- Import and Register Blueprints ---
+    from .routes import main as main_blueprint
+    app.register_blueprint(main_blueprint)
+    phase('routes')
 
-app.config['SQLALCHEMY_DATABASE_URI'] = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    from .catalog import catalog_cache
+    catalog_cache.check_interval = app.config['CATALOG_VERSION_CHECK_SECONDS']
 
-# Initialize SQLAlchemy with the Flask app
-db = SQLAlchemy(app)
-# --- End Database Configuration ---
+    from .assets import init_assets
+    init_assets(app)
 
-# --- Import and Register Blueprints ---
-# Import the Blueprint from routes.py using a relative import
-# This is correct because __init__.py and routes.py are now in the same package
-from .routes import main as main_blueprint
+    from .page_cache import init_page_cache
+    init_page_cache(app)
+    phase('assets')
+    # --- End Import and Register ---
 
-# Register the blueprint with the app instance
-app.register_blueprint(main_blueprint)
-# --- End Import and Register ---
+    if app.config['STARTUP_PREWARM']:
+        prewarm(app)
+        phase('prewarm')
 
-# No __name__ == '__main__': block here, as run.py handles execution.
+    timings['total'] = round(time.perf_counter() - started, 4)
+    # Reported by /healthz and profile_startup.py
+    app.config['STARTUP_TIMINGS'] = timings
+    return app
@@ -0,0 +1,126 @@
+# r6_fan_app/assets.py
+
+# Fingerprinted static assets built by build_assets.py.
+# asset_url('style.css') returns the content-hashed copy (/static/dist/style.3f2a9c1b0d.css) when
+# the manifest has it, and the plain /static/ file otherwise, so the app also runs without a build.
+# Hashed files are served with a one-year immutable Cache-Control and, for text assets, from their
+# precompressed .br/.gz copies when the browser accepts them.
+
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory, url_for
+
+DIST_FOLDER = 'dist'
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Preferred first
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+class AssetManifest:
+    def __init__(self):
+        self.assets = {}  # source path -> dist path, both relative to static/
+        self.variants = {}  # source path -> {'avif': [[width, dist path], ...], 'webp': [...]}
+        self.sprites = {}  # sheet name -> {'css': dist path, 'image': dist path, 'sprites': {slug: [x, y, w, h]}}
+        self.digest = ''  # changes whenever the built assets change
+        self.static_folder = None
+        self._exists = {}
+
+    def load(self, static_folder):
+        self.static_folder = static_folder
+        path = os.path.join(static_folder, DIST_FOLDER, MANIFEST_NAME)
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            data = json.loads(raw)
+        except FileNotFoundError:
+            print("No asset manifest found, serving unhashed static files (run build_assets.py).")
+            return
+        except ValueError as e:
+            print(f"Error reading asset manifest: {e}")
+            return
+        self.assets = data.get('assets', {})
+        self.variants = data.get('variants', {})
+        self.sprites = data.get('sprites', {})
+        self.digest = hashlib.sha1(raw).hexdigest()[:12]
+
+    def path_for(self, filename):
+        return self.assets.get(filename, filename)
+
+    def exists(self, filename):
+        if self.assets:
+            return filename in self.assets
+        # No build: look at static/ once per file
+        if filename not in self._exists:
+            self._exists[filename] = bool(self.static_folder) and os.path.isfile(
+                os.path.join(self.static_folder, filename))
+        return self._exists[filename]
+
+    def srcset(self, filename, fmt):
+        entries = self.variants.get(filename, {}).get(fmt, [])
+        return ', '.join(f"{url_for('static', filename=path)} {width}w" for width, path in entries)
+
+
+# Loaded once per worker process
+asset_manifest = AssetManifest()
+
+
+def asset_url(filename):
+    # Also takes "/static/..." URLs as stored in the database (maps.image_url)
+    static_prefix = current_app.static_url_path + '/'
+    if filename.startswith(static_prefix):
+        filename = filename[len(static_prefix):]
+    elif '://' in filename:
+        return filename  # external image, leave it alone
+    return url_for('static', filename=asset_manifest.path_for(filename))
+
+
+def asset_srcset(filename, fmt):
+    # Empty string when there are no variants in that format
+    return asset_manifest.srcset(filename, fmt)
+
+
+def asset_exists(filename):
+    return asset_manifest.exists(filename)
+
+
+def sprite_css_url(sheet):
+    # URL of a sprite sheet's CSS, or None when build_assets.py hasn't made the sheet
+    sprite_sheet = asset_manifest.sprites.get(sheet)
+    return url_for('static', filename=sprite_sheet['css']) if sprite_sheet else None
+
+
+def has_sprite(sheet, name):
+    return name in asset_manifest.sprites.get(sheet, {}).get('sprites', {})
+
+
+def serve_dist_asset(dist_folder, filename):
+    mimetype = mimetypes.guess_type(filename)[0]
+    accepted = request.accept_encodings
+    for encoding, suffix in PRECOMPRESSED:
+        if accepted[encoding] and os.path.isfile(os.path.join(dist_folder, filename + suffix)):
+            response = send_from_directory(dist_folder, filename + suffix, mimetype=mimetype,
+                                           max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(dist_folder, filename, max_age=IMMUTABLE_MAX_AGE)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_assets(app):
+    asset_manifest.load(app.static_folder)
+    dist_folder = os.path.join(app.static_folder, DIST_FOLDER)
+
+    # More specific than the default /static/<path:filename> rule, so it wins for hashed files
+    app.add_url_rule(f"{app.static_url_path}/{DIST_FOLDER}/<path:filename>", endpoint='dist_asset',
+                     view_func=lambda filename: serve_dist_asset(dist_folder, filename))
+    app.jinja_env.globals.update(asset_url=asset_url, asset_srcset=asset_srcset, asset_exists=asset_exists,
+                                 sprite_css_url=sprite_css_url, has_sprite=has_sprite)
@@ -0,0 +1,329 @@
+# r6_fan_app/catalog.py
+
+# In-process read-through cache for the catalog tables (operators, maps, game_info).
+# The catalog only changes when load_catalog.py runs, so every gunicorn worker keeps
+# an immutable snapshot in memory and swaps it atomically when the catalog version changes.
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+
+from flask import current_app
+
+from r6_fan_app import db
+from r6_fan_app.catalog_files import load_snapshot_file, read_snapshot_digest
+from r6_fan_app.models import Operator, Map, GameInfo, CatalogVersion
+from r6_fan_app.name_resolver import OperatorNameResolver
+from r6_fan_app.text_utils import fold, slugify
+
+
+def split_list(text):
+    # The list columns are stored as comma-joined text, e.g. "Frag Grenades, Stun Grenades"
+    return tuple(item.strip() for item in text.split(',') if item.strip()) if text else ()
+
+
+# --- Parsed, immutable view models ---
+# Built once per snapshot from the ORM rows so requests never re-split the list columns
+# or mutate shared ORM instances.
+
+@dataclass(frozen=True)
+class OperatorRef:
+    # A synergy/counter entry. id and slug are None when the name isn't in the catalog
+    # (e.g. "Any hard breacher" or an operator we haven't added yet).
+    name: str
+    id: Optional[int] = None
+    slug: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class OperatorView:
+    id: int
+    name: str
+    side: str
+    ability: str
+    secondary_gadgets: Optional[str]
+    armor: Optional[int]
+    speed: Optional[int]
+    role: Optional[str]
+    short_bio: Optional[str]
+    synergy_examples: Optional[str]
+    counter_examples: Optional[str]
+    solo_friendly: Optional[bool]
+    slug: str
+    secondary_gadgets_list: tuple
+    synergy_list: tuple  # of OperatorRef
+    counter_list: tuple  # of OperatorRef
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'side': self.side,
+            'ability': self.ability,
+            'secondary_gadgets': self.secondary_gadgets,
+            'armor': self.armor,
+            'speed': self.speed,
+            'role': self.role,
+            'short_bio': self.short_bio,
+            'synergy_examples': self.synergy_examples,
+            'counter_examples': self.counter_examples,
+            'solo_friendly': self.solo_friendly
+        }
+
+
+@dataclass(frozen=True)
+class MapView:
+    id: int
+    name: str
+    image_url: str
+    defender_sites: str
+    electricity_needed: bool
+    description: Optional[str]
+    slug: str
+    defender_sites_list: tuple
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'image_url': self.image_url,
+            'defender_sites': self.defender_sites,
+            'electricity_needed': self.electricity_needed,
+            'description': self.description
+        }
+
+
+@dataclass(frozen=True)
+class GameInfoView:
+    id: int
+    section_title: str
+    content: str
+
+
+def build_operator_views(rows):
+    # Resolve synergy/counter names to operator ids up front, matching on accent-folded names
+    ids_by_name = {fold(row.name): row.id for row in rows}
+    slugs_by_id = {row.id: slugify(row.name) for row in rows}
+
+    def resolve(names):
+        refs = []
+        for name in split_list(names):
+            op_id = ids_by_name.get(fold(name))
+            refs.append(OperatorRef(name=name, id=op_id, slug=slugs_by_id.get(op_id)))
+        return tuple(refs)
+
+    return [
+        OperatorView(
+            id=row.id,
+            name=row.name,
+            side=row.side,
+            ability=row.ability,
+            secondary_gadgets=row.secondary_gadgets,
+            armor=row.armor,
+            speed=row.speed,
+            role=row.role,
+            short_bio=row.short_bio,
+            synergy_examples=row.synergy_examples,
+            counter_examples=row.counter_examples,
+            solo_friendly=row.solo_friendly,
+            slug=slugs_by_id[row.id],
+            secondary_gadgets_list=split_list(row.secondary_gadgets),
+            synergy_list=resolve(row.synergy_examples),
+            counter_list=resolve(row.counter_examples),
+        )
+        for row in rows
+    ]
+
+
+def build_map_views(rows):
+    return [
+        MapView(
+            id=row.id,
+            name=row.name,
+            image_url=row.image_url,
+            defender_sites=row.defender_sites,
+            electricity_needed=row.electricity_needed,
+            description=row.description,
+            slug=slugify(row.name),
+            defender_sites_list=split_list(row.defender_sites),
+        )
+        for row in rows
+    ]
+
+
+def build_game_info_views(rows):
+    return [GameInfoView(id=row.id, section_title=row.section_title, content=row.content) for row in rows]
+
+
+class SlugIndex:
+    # Bidirectional slug <-> entity index, built once per snapshot.
+    # Canonical slugs are accent-folded ("jager"); older URL forms ("jäger") are kept as aliases.
+
+    def __init__(self, entities):
+        self.by_slug = {}
+        self.slug_by_id = {}
+        for entity in entities:
+            slug = slugify(entity.name)
+            self.slug_by_id[entity.id] = slug
+            self.by_slug[slug] = entity
+
+        # Aliases are added after every canonical slug so they can never shadow one
+        for entity in entities:
+            for alias in (entity.name.replace(' ', '-').lower(), slugify(entity.name).replace('-', '')):
+                self.by_slug.setdefault(alias, entity)
+
+    def lookup(self, slug):
+        return self.by_slug.get(slug) or self.by_slug.get(slugify(slug))
+
+    def slug_for(self, entity):
+        return self.slug_by_id[entity.id]
+
+
+class CatalogSnapshot:
+    # A read-only view of the whole catalog at one version, made of frozen view models
+    # so it can be shared between requests and threads.
+
+    def __init__(self, version, operators, maps, game_info):
+        self.version = version
+        self.loaded_at = time.time()
+        self.operators = tuple(operators)
+        self.maps = tuple(maps)
+        self.game_info = tuple(game_info)
+        self.attackers = tuple(op for op in self.operators if op.side == 'Attacker')
+        self.defenders = tuple(op for op in self.operators if op.side == 'Defender')
+        self.operators_by_id = {op.id: op for op in self.operators}
+        self.operators_by_name = {op.name: op for op in self.operators}
+        self.maps_by_name = {map_item.name: map_item for map_item in self.maps}
+        self.operator_slugs = SlugIndex(self.operators)
+        self.map_slugs = SlugIndex(self.maps)
+        self.name_resolver = OperatorNameResolver(self.operators)
+        self.map_sites = {map_item.name: list(map_item.defender_sites_list) for map_item in self.maps}
+
+
+def read_catalog_version():
+    # The catalog_version table holds a single row that load_catalog.py bumps.
+    # A missing table/row is treated as version None so the app still works without it.
+    # In snapshot mode the version is the compiled file's hash, so recompiling it triggers a reload.
+    if current_app.config['CATALOG_SOURCE'] == 'snapshot':
+        try:
+            return read_snapshot_digest(current_app.config['CATALOG_SNAPSHOT_PATH'])
+        except (OSError, ValueError) as e:
+            print(f"Error reading catalog snapshot version: {e}")
+            return None
+    try:
+        row = db.session.get(CatalogVersion, 1)
+        return row.version if row else None
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error reading catalog version: {e}")
+        return None
+
+
+def load_compiled_snapshot(path):
+    # Builds the snapshot from a file written by compile_catalog.py, without touching the database
+    version, payload = load_snapshot_file(path)
+
+    def rows(key):
+        return [SimpleNamespace(**row) for row in payload[key]]
+
+    operators = build_operator_views(rows('operators'))
+    maps = build_map_views(rows('maps'))
+    game_info = build_game_info_views(rows('game_info'))
+    return CatalogSnapshot(version, operators, maps, game_info)
+
+
+def load_snapshot():
+    if current_app.config['CATALOG_SOURCE'] == 'snapshot':
+        return load_compiled_snapshot(current_app.config['CATALOG_SNAPSHOT_PATH'])
+    version = read_catalog_version()
+    operators = build_operator_views(Operator.query.order_by(Operator.id).all())
+    maps = build_map_views(Map.query.order_by(Map.id).all())
+    game_info = build_game_info_views(GameInfo.query.order_by(GameInfo.id).all())
+    return CatalogSnapshot(version, operators, maps, game_info)
+
+
+class CatalogCache:
+    def __init__(self, check_interval=30.0):
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def get(self):
+        snapshot = self._snapshot
+        now = time.monotonic()
+
+        if snapshot is not None and now - self._last_check < self.check_interval:
+            self.hits += 1
+            return snapshot
+
+        with self._lock:
+            # Another thread may have refreshed the snapshot while we waited for the lock
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._last_check < self.check_interval:
+                self.hits += 1
+                return snapshot
+
+            if snapshot is not None:
+                self._last_check = time.monotonic()
+                if read_catalog_version() == snapshot.version:
+                    self.hits += 1
+                    return snapshot
+
+            self.misses += 1
+            snapshot = load_snapshot()
+            self._snapshot = snapshot
+            self._last_check = time.monotonic()
+            self.reloads += 1
+            return snapshot
+
+    def prewarm(self):
+        # Called at startup with CATALOG_SOURCE=snapshot: loads the compiled snapshot file so the first
+        # requests don't wait on it. In database mode the file isn't used: its ids and version differ
+        # from the database's, so the first get() loads the catalog from the database as usual.
+        if current_app.config['CATALOG_SOURCE'] != 'snapshot':
+            return False
+        path = current_app.config['CATALOG_SNAPSHOT_PATH']
+        if not os.path.isfile(path):
+            return False
+        try:
+            snapshot = load_compiled_snapshot(path)
+        except (OSError, ValueError) as e:
+            print(f"Error prewarming the catalog from {path}: {e}")
+            return False
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = snapshot
+                self._last_check = time.monotonic()
+                self.reloads += 1
+        return True
+
+    def invalidate(self):
+        # Forces a reload on the next get(), regardless of the version check interval
+        with self._lock:
+            self._snapshot = None
+            self._last_check = 0.0
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'reloads': self.reloads,
+            'version': snapshot.version if snapshot else None,
+            'loaded_at': snapshot.loaded_at if snapshot else None,
+        }
+
+
+# One cache per worker process
+catalog_cache = CatalogCache()
+
+
+def get_catalog():
+    return catalog_cache.get()
@@ -0,0 +1,279 @@
+# r6_fan_app/catalog_api.py
+
+# Read-only JSON API over the cached catalog: /api/operators, /api/operators/<slug> and /api/maps.
+#   * fields=name,slug,role picks the fields returned (fields=all for every one); lists default
+#     to a short set without the long text fields;
+#   * /api/operators filters: side=attacker|defender, role=<word in the role>, solo_friendly=true|false;
+#   * keyset pagination ordered by id: limit=N (1-100) and after=<the previous page's "next">;
+#   * unknown parameters and bad values get a 400 with {"error": ...} instead of being ignored;
+#   * strong ETags, so unchanged data revalidates with a 304;
+#   * msgpack instead of JSON with Accept: application/msgpack or format=msgpack (when the msgpack
+#     package is installed).
+# Serialised bodies are kept per catalog snapshot, and the default and full projections of the
+# first page are built up front, so the common requests just copy bytes out.
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from flask import current_app, request
+
+from r6_fan_app.text_utils import fold, tokenize
+
+try:
+    import msgpack
+except ImportError:  # optional; the API answers in JSON only without it
+    msgpack = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+
+OPERATOR_FIELDS = ('id', 'name', 'slug', 'side', 'ability', 'secondary_gadgets', 'armor', 'speed', 'role',
+                   'short_bio', 'synergy_examples', 'counter_examples', 'solo_friendly')
+DEFAULT_OPERATOR_FIELDS = ('id', 'name', 'slug', 'side', 'role', 'ability', 'solo_friendly')
+MAP_FIELDS = ('id', 'name', 'slug', 'image_url', 'defender_sites', 'electricity_needed', 'description')
+DEFAULT_MAP_FIELDS = ('id', 'name', 'slug', 'defender_sites', 'electricity_needed')
+
+RESOURCES = {
+    # resource -> (all fields, default fields for lists)
+    'operators': (OPERATOR_FIELDS, DEFAULT_OPERATOR_FIELDS),
+    'maps': (MAP_FIELDS, DEFAULT_MAP_FIELDS),
+}
+
+# Query parameters each endpoint takes; anything else is rejected rather than ignored
+LIST_PARAMETERS = {
+    'operators': {'fields', 'format', 'limit', 'after', 'side', 'role', 'solo_friendly'},
+    'maps': {'fields', 'format', 'limit', 'after'},
+}
+DETAIL_PARAMETERS = {'fields', 'format'}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+# Serialised bodies kept per snapshot, least recently used dropped first
+MAX_CACHED_BODIES = 256
+
+BOOLEAN_VALUES = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class Body:
+    data: bytes
+    etag: str
+
+
+def encode(payload, encoding):
+    if encoding == MSGPACK:
+        data = msgpack.packb(payload, use_bin_type=True)
+    else:
+        data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return Body(data, hashlib.sha1(data).hexdigest())
+
+
+def project(record, fields):
+    return {field: record[field] for field in fields}
+
+
+class CatalogApi:
+    # Records and serialised bodies for one catalog snapshot
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.records = {
+            'operators': [dict(op.to_dict(), slug=op.slug) for op in sorted(snapshot.operators, key=lambda op: op.id)],
+            'maps': [dict(map_item.to_dict(), slug=map_item.slug)
+                     for map_item in sorted(snapshot.maps, key=lambda map_item: map_item.id)],
+        }
+        # Role words per operator id, for the role filter ("Hard Breacher" -> {'hard', 'breacher'})
+        self.role_words = {op.id: set(tokenize(op.role or '')) for op in snapshot.operators}
+        self._bodies = OrderedDict()
+        self._lock = threading.Lock()
+
+        encodings = (JSON, MSGPACK) if msgpack is not None else (JSON,)
+        for resource, (all_fields, default_fields) in RESOURCES.items():
+            for fields in (default_fields, all_fields):
+                for encoding in encodings:
+                    self.list_body(resource, fields, (), None, DEFAULT_PAGE_SIZE, encoding)
+
+    def matches(self, record, filters):
+        for name, value in filters:
+            if name == 'side' and fold(record['side']) != value:
+                return False
+            if name == 'role' and not value <= self.role_words[record['id']]:
+                return False
+            if name == 'solo_friendly' and bool(record['solo_friendly']) != value:
+                return False
+        return True
+
+    def page(self, resource, fields, filters, after, limit):
+        items = []
+        next_after = None
+        for record in self.records[resource]:
+            if after is not None and record['id'] <= after:
+                continue
+            if not self.matches(record, filters):
+                continue
+            if len(items) == limit:
+                # There is at least one more match: the page ends at the last item returned
+                next_after = items[-1]['id']
+                break
+            items.append(project(record, fields))
+        return {'items': items, 'next': next_after}
+
+    def list_body(self, resource, fields, filters, after, limit, encoding):
+        key = (resource, fields, filters, after, limit, encoding)
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+                return body
+        # 'next' is the id of the last item, so projections without id still page correctly
+        payload = self.page(resource, fields if 'id' in fields else fields + ('id',), filters, after, limit)
+        if 'id' not in fields:
+            for item in payload['items']:
+                del item['id']
+        body = encode(payload, encoding)
+        with self._lock:
+            self._bodies[key] = body
+            while len(self._bodies) > MAX_CACHED_BODIES:
+                self._bodies.popitem(last=False)
+        return body
+
+    def operator_body(self, slug, fields, encoding):
+        operator = self.snapshot.operator_slugs.lookup(slug)
+        if operator is None:
+            return None
+        record = dict(operator.to_dict(), slug=operator.slug)
+        return encode(project(record, fields), encoding)
+
+
+_api = None
+
+
+def get_catalog_api(snapshot):
+    # Rebuilt whenever the catalog cache hands out a new snapshot
+    global _api
+    api = _api
+    if api is None or api.snapshot is not snapshot:
+        api = CatalogApi(snapshot)
+        _api = api
+    return api
+
+
+# --- Request parsing ---
+
+def check_parameters(allowed):
+    unknown = sorted(set(request.args) - allowed)
+    if unknown:
+        raise ApiError(f"Unknown parameter(s): {', '.join(unknown)}. Available: {', '.join(sorted(allowed))}.")
+
+
+def requested_fields(resource, default_fields=None):
+    all_fields, list_fields = RESOURCES[resource]
+    value = request.args.get('fields', '').strip()
+    if not value:
+        return default_fields or list_fields
+    if value == 'all':
+        return all_fields
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in all_fields]
+    if unknown or not fields:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown) or value}. Available: {', '.join(all_fields)}.")
+    # Same order as the full record, so equivalent projections share a cached body
+    return tuple(field for field in all_fields if field in fields)
+
+
+def requested_filters(resource):
+    if resource != 'operators':
+        return ()
+    filters = []
+    side = request.args.get('side')
+    if side:
+        if fold(side) not in ('attacker', 'defender'):
+            raise ApiError("side must be attacker or defender.")
+        filters.append(('side', fold(side)))
+    role = request.args.get('role')
+    if role:
+        words = frozenset(tokenize(role))
+        if not words:
+            raise ApiError("role must contain a word, e.g. role=breacher.")
+        filters.append(('role', words))
+    solo = request.args.get('solo_friendly')
+    if solo:
+        if solo.lower() not in BOOLEAN_VALUES:
+            raise ApiError("solo_friendly must be true or false.")
+        filters.append(('solo_friendly', BOOLEAN_VALUES[solo.lower()]))
+    return tuple(filters)
+
+
+def requested_page():
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        after = request.args.get('after')
+        after = int(after) if after not in (None, '') else None
+    except ValueError:
+        raise ApiError("limit and after must be integers.") from None
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ApiError(f"limit must be between 1 and {MAX_PAGE_SIZE}.")
+    return after, limit
+
+
+def requested_encoding():
+    requested = request.args.get('format')
+    if requested:
+        if requested not in ('json', 'msgpack'):
+            raise ApiError("format must be json or msgpack.")
+        if requested == 'msgpack' and msgpack is None:
+            raise ApiError("msgpack is not available on this server.", 406)
+        return MSGPACK if requested == 'msgpack' else JSON
+    if msgpack is not None and request.accept_mimetypes.best_match([JSON, MSGPACK], default=JSON) == MSGPACK:
+        return MSGPACK
+    return JSON
+
+
+# --- Responses ---
+
+def body_response(body, encoding):
+    response = current_app.response_class(body.data, mimetype=encoding)
+    response.set_etag(body.etag)
+    response.headers['Vary'] = 'Accept'
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['API_CACHE_MAX_AGE']
+    return response.make_conditional(request)
+
+
+def error_response(error):
+    return current_app.response_class(json.dumps({'error': str(error)}), status=error.status, mimetype=JSON)
+
+
+def list_response(snapshot, resource):
+    try:
+        check_parameters(LIST_PARAMETERS[resource])
+        fields = requested_fields(resource)
+        filters = requested_filters(resource)
+        after, limit = requested_page()
+        encoding = requested_encoding()
+    except ApiError as e:
+        return error_response(e)
+    body = get_catalog_api(snapshot).list_body(resource, fields, filters, after, limit, encoding)
+    return body_response(body, encoding)
+
+
+def operator_response(snapshot, slug):
+    try:
+        check_parameters(DETAIL_PARAMETERS)
+        fields = requested_fields('operators', default_fields=OPERATOR_FIELDS)
+        encoding = requested_encoding()
+    except ApiError as e:
+        return error_response(e)
+    body = get_catalog_api(snapshot).operator_body(slug, fields, encoding)
+    if body is None:
+        return error_response(ApiError(f"Operator '{slug}' not found.", 404))
+    return body_response(body, encoding)
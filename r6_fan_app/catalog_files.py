@@ -0,0 +1,217 @@
+# r6_fan_app/catalog_files.py
+
+# The catalog content lives in catalog/operators.json, catalog/maps.json and catalog/game_info.json.
+# This module reads and validates those files, and compiles them into a single snapshot file
+# that the app can load at startup instead of querying the database (CATALOG_SOURCE=snapshot).
+#
+# Needs none of the app's settings, so the loader, the asset build and the compiler can use it
+# without an app. Names are folded with text_utils.fold, like the runtime lookups, so validation
+# and the app agree on which names are the same.
+
+import hashlib
+import json
+import os
+import pickle
+
+from r6_fan_app.text_utils import fold
+
+# The data files live at the project root, next to the scripts that load and compile them
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'catalog')
+SCHEMA_VERSION = 1
+
+# list key -> file that holds it
+CATALOG_FILES = {
+    'operators': 'operators.json',
+    'maps': 'maps.json',
+    'game_info': 'game_info.json',
+}
+
+SIDES = ('Attacker', 'Defender')
+RATING_RANGE = range(1, 4)  # armor and speed are rated 1-3
+SECTION_TITLE_MAX_LENGTH = 100  # game_info.section_title is a String(100) column
+
+OPERATOR_FIELDS = {
+    # field: (type, required)
+    'name': (str, True),
+    'side': (str, True),
+    'ability': (str, True),
+    'secondary_gadgets': (str, False),
+    'armor': (int, False),
+    'speed': (int, False),
+    'role': (str, False),
+    'short_bio': (str, False),
+    'synergy_examples': (str, False),
+    'counter_examples': (str, False),
+    'solo_friendly': (bool, False),
+}
+MAP_FIELDS = {
+    'name': (str, True),
+    'image_url': (str, True),
+    'defender_sites': (str, True),
+    'electricity_needed': (bool, True),
+    'description': (str, False),
+}
+GAME_INFO_FIELDS = {
+    'section_title': (str, True),
+    'content': (str, True),
+}
+
+# Compiled snapshot layout: magic line, sha256 of the payload, then the pickled payload.
+# The hash guards against truncated or corrupted files; only load snapshots you built yourself.
+SNAPSHOT_MAGIC = b'R6CATALOG1\n'
+DIGEST_LENGTH = 64
+
+
+class CatalogValidationError(Exception):
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} problem(s) in the catalog data:\n" + '\n'.join(errors))
+        self.errors = errors
+
+
+def split_list(text):
+    return [item.strip() for item in text.split(',') if item.strip()] if text else []
+
+
+def read_catalog_files(directory=CATALOG_DIR):
+    # Returns {'schema_versions': {...}, 'known_names': [...], 'operators': [...], 'maps': [...], 'game_info': [...]}
+    data = {'schema_versions': {}, 'known_names': []}
+    for key, file_name in CATALOG_FILES.items():
+        with open(os.path.join(directory, file_name), encoding='utf-8') as f:
+            content = json.load(f)
+        data['schema_versions'][file_name] = content.get('schema_version')
+        data[key] = content.get(key, [])
+        if key == 'operators':
+            data['known_names'] = content.get('known_names', [])
+    return data
+
+
+def check_fields(file_name, label, row, fields, errors):
+    for field in row:
+        if field not in fields:
+            errors.append(f"{file_name}: {label}: unknown field '{field}'")
+    for field, (field_type, required) in fields.items():
+        value = row.get(field)
+        if value is None:
+            if required:
+                errors.append(f"{file_name}: {label}: '{field}' is required")
+        # bool is a subclass of int, so check it explicitly
+        elif not isinstance(value, field_type) or (field_type is int and isinstance(value, bool)):
+            errors.append(f"{file_name}: {label}: '{field}' must be {field_type.__name__}")
+        elif field_type is str and required and not value.strip():
+            errors.append(f"{file_name}: {label}: '{field}' is empty")
+
+
+def check_unique(file_name, rows, key, errors):
+    seen = set()
+    for row in rows:
+        value = row.get(key)
+        if isinstance(value, str):
+            # Compared stripped, like the names in synergy/counter lists (split_list)
+            if fold(value.strip()) in seen:
+                errors.append(f"{file_name}: duplicate {key} '{value}'")
+            seen.add(fold(value.strip()))
+
+
+def validate_catalog(data):
+    # Returns a list of problems; an empty list means the data is good to load or compile
+    errors = []
+    for file_name, version in data['schema_versions'].items():
+        if version != SCHEMA_VERSION:
+            errors.append(f"{file_name}: schema_version is {version!r}, expected {SCHEMA_VERSION}")
+
+    operators_file = CATALOG_FILES['operators']
+    operator_names = {fold(op['name'].strip()) for op in data['operators'] if isinstance(op.get('name'), str)}
+    known_names = {fold(name) for name in data['known_names']}
+    for operator in data['operators']:
+        label = operator.get('name') or '<no name>'
+        check_fields(operators_file, label, operator, OPERATOR_FIELDS, errors)
+        if operator.get('side') is not None and operator['side'] not in SIDES:
+            errors.append(f"{operators_file}: {label}: side must be one of {', '.join(SIDES)}")
+        for field in ('armor', 'speed'):
+            value = operator.get(field)
+            if isinstance(value, int) and not isinstance(value, bool) and value not in RATING_RANGE:
+                errors.append(f"{operators_file}: {label}: {field} must be between 1 and 3, not {value}")
+        for field in ('synergy_examples', 'counter_examples'):
+            if not isinstance(operator.get(field), str):
+                continue
+            for name in split_list(operator[field]):
+                if fold(name) == fold(label.strip()):
+                    errors.append(f"{operators_file}: {label}: lists itself in {field}")
+                elif fold(name) not in operator_names and fold(name) not in known_names:
+                    errors.append(f"{operators_file}: {label}: {field} names '{name}', which is neither an "
+                                  f"operator in the catalog nor in known_names")
+    check_unique(operators_file, data['operators'], 'name', errors)
+
+    maps_file = CATALOG_FILES['maps']
+    for map_item in data['maps']:
+        label = map_item.get('name') or '<no name>'
+        check_fields(maps_file, label, map_item, MAP_FIELDS, errors)
+        image_url = map_item.get('image_url')
+        if isinstance(image_url, str) and not image_url.startswith(('/static/', 'https://', 'http://')):
+            errors.append(f"{maps_file}: {label}: image_url must start with /static/ or http(s)://")
+        if isinstance(map_item.get('defender_sites'), str) and not split_list(map_item['defender_sites']):
+            errors.append(f"{maps_file}: {label}: defender_sites lists no sites")
+    check_unique(maps_file, data['maps'], 'name', errors)
+
+    game_info_file = CATALOG_FILES['game_info']
+    for section in data['game_info']:
+        label = section.get('section_title') or '<no title>'
+        check_fields(game_info_file, label, section, GAME_INFO_FIELDS, errors)
+        if isinstance(section.get('section_title'), str) and len(section['section_title']) > SECTION_TITLE_MAX_LENGTH:
+            errors.append(f"{game_info_file}: {label}: section_title is longer than {SECTION_TITLE_MAX_LENGTH}")
+    check_unique(game_info_file, data['game_info'], 'section_title', errors)
+    return errors
+
+
+def load_catalog_files(directory=CATALOG_DIR):
+    # Reads and validates the data files; raises CatalogValidationError listing every problem
+    data = read_catalog_files(directory)
+    errors = validate_catalog(data)
+    if errors:
+        raise CatalogValidationError(errors)
+    return data
+
+
+def compile_snapshot(data, path):
+    # Rows get ids from their position in the files, so they are stable as long as rows are only appended
+    payload = {
+        'schema_version': SCHEMA_VERSION,
+        'operators': [dict(row, id=index) for index, row in enumerate(data['operators'], 1)],
+        'maps': [dict(row, id=index) for index, row in enumerate(data['maps'], 1)],
+        'game_info': [dict(row, id=index) for index, row in enumerate(data['game_info'], 1)],
+    }
+    body = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    digest = hashlib.sha256(body).hexdigest()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC + digest.encode('ascii') + b'\n' + body)
+    os.replace(temp_path, path)  # workers never see a half-written file
+    return digest
+
+
+def read_snapshot_digest(path):
+    # Cheap version check: reads only the header
+    with open(path, 'rb') as f:
+        header = f.read(len(SNAPSHOT_MAGIC) + DIGEST_LENGTH)
+    if not header.startswith(SNAPSHOT_MAGIC):
+        raise ValueError(f"{path} is not a compiled catalog snapshot")
+    return header[len(SNAPSHOT_MAGIC):].decode('ascii')
+
+
+def load_snapshot_file(path):
+    # Returns (digest, payload) after checking the payload against its hash
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if not raw.startswith(SNAPSHOT_MAGIC):
+        raise ValueError(f"{path} is not a compiled catalog snapshot")
+    start = len(SNAPSHOT_MAGIC)
+    digest = raw[start:start + DIGEST_LENGTH].decode('ascii')
+    body = raw[start + DIGEST_LENGTH + 1:]
+    if hashlib.sha256(body).hexdigest() != digest:
+        raise ValueError(f"{path} is corrupted (hash mismatch), recompile it with compile_catalog.py")
+    payload = pickle.loads(body)
+    if payload.get('schema_version') != SCHEMA_VERSION:
+        raise ValueError(f"{path} was compiled for schema version {payload.get('schema_version')}")
+    return digest, payload
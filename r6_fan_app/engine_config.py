@@ -0,0 +1,111 @@
+# r6_fan_app/engine_config.py
+
+# SQLAlchemy engine settings for Postgres, read from the environment, plus pool counters for /healthz.
+#
+# Defaults are tuned for Supabase: connections are pre-pinged and recycled before Supabase's idle
+# timeout drops them, connects and statements have timeouts, and the transaction-mode pooler
+# (pgbouncer/Supavisor, port 6543) gets a compatible setup: no startup "options" parameter,
+# statement_timeout applied per transaction instead, and no prepared statements.
+
+import os
+import threading
+from urllib.parse import urlsplit
+
+from sqlalchemy import event
+
+from r6_fan_app import env_flag
+
+# Supabase's transaction-mode pooler listens on this port
+PGBOUNCER_PORT = 6543
+
+
+def is_pgbouncer(uri):
+    try:
+        port = urlsplit(uri).port
+    except ValueError:
+        port = None  # malformed port; the connect will report it
+    return env_flag('DB_PGBOUNCER', port == PGBOUNCER_PORT)
+
+
+def engine_options_from_env(uri):
+    # Returns the SQLALCHEMY_ENGINE_OPTIONS dict for a database URI; empty for non-Postgres URIs
+    # (the SQLite URI used in snapshot mode doesn't take pool settings)
+    if not uri.startswith('postgresql'):
+        return {}
+
+    pgbouncer = is_pgbouncer(uri)
+    connect_args = {
+        'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        'application_name': os.getenv('DB_APPLICATION_NAME', 'r6-fan-app'),
+    }
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '5000'))
+    if statement_timeout and not pgbouncer:
+        # Server-side limit for every statement on this connection
+        connect_args['options'] = f'-c statement_timeout={statement_timeout}'
+    if pgbouncer and uri.startswith('postgresql+psycopg:'):
+        # psycopg 3 prepares repeated statements, which breaks when pgbouncer swaps the backend
+        # (psycopg2, the default driver, never uses server-side prepared statements)
+        connect_args['prepare_threshold'] = None
+
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '5')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        # Recycle before Supabase/pgbouncer close idle connections on their side
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '300')),
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', True),
+        'connect_args': connect_args,
+    }
+
+
+class PoolStats:
+    # Counters fed by pool events; read by /healthz
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+
+    def bump(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def attach(self, engine):
+        event.listen(engine, 'connect', lambda *args: self.bump('connects'))
+        event.listen(engine, 'checkout', lambda *args: self.bump('checkouts'))
+        event.listen(engine, 'checkin', lambda *args: self.bump('checkins'))
+        event.listen(engine, 'invalidate', lambda *args: self.bump('invalidations'))
+
+    def report(self, engine):
+        pool = engine.pool
+        report = {
+            'pool_class': type(pool).__name__,
+            'connects': self.connects,
+            'checkouts': self.checkouts,
+            'checkins': self.checkins,
+            'invalidations': self.invalidations,
+        }
+        # QueuePool has these; SQLite's pools don't
+        for name in ('size', 'checkedout', 'checkedin', 'overflow'):
+            if hasattr(pool, name):
+                report[name] = getattr(pool, name)()
+        return report
+
+
+pool_stats = PoolStats()
+
+
+def init_engine(app, db):
+    with app.app_context():
+        engine = db.engine
+    pool_stats.attach(engine)
+
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '5000'))
+    if engine.dialect.name == 'postgresql' and is_pgbouncer(engine.url.render_as_string(hide_password=True)) and statement_timeout:
+        # pgbouncer in transaction mode rejects startup options and doesn't keep session settings,
+        # so the timeout is set at the start of every transaction instead
+        @event.listens_for(engine, 'begin')
+        def set_statement_timeout(connection):
+            connection.exec_driver_sql(f'SET LOCAL statement_timeout = {statement_timeout}')
@@ -0,0 +1,171 @@
+# r6_fan_app/lineup_engine.py
+
+# Offline, deterministic lineup engine. It scores operators from the catalog columns
+# (role, synergy/counter lists, solo_friendly, the map's electricity_needed flag and keywords
+# in the situation text), then runs a branch-and-bound search over five-operator combinations
+# for the best team. It answers in about a millisecond for the current roster and is used
+# when the LLM is slow or down, as the 'engine' lineup mode, and to shortlist candidates for
+# the LLM prompt.
+
+from dataclasses import dataclass
+
+from r6_fan_app.text_utils import fold, tokenize
+
+TEAM_SIZE = 5
+
+# Scoring weights
+SOLO_FRIENDLY_BONUS = 2.0
+TEAM_RELIANT_PENALTY = 1.0
+ELECTRICITY_BONUS = 1.5
+KEYWORD_WEIGHT = 0.75
+COUNTER_MENTION_BONUS = 3.0
+SYNERGY_BONUS = 1.5
+ROLE_COVERAGE_BONUS = 0.5
+MISSING_HARD_BREACH_PENALTY = 3.0
+
+# Role tags that matter when a map has many electrified / hard walls
+ATTACKER_ELECTRICITY_TAGS = ('anti-gadget', 'utility clear', 'hard breacher')
+DEFENDER_ELECTRICITY_TAGS = ('anti-hard breach',)
+
+STOPWORDS = frozenset(
+    'a an and are as at be but by for from has have i in is it of on or our so the their them they '
+    'this to we with you your my me us there that what when where which who will can not no'.split()
+)
+
+
+@dataclass(frozen=True)
+class LineupResult:
+    operators: tuple  # OperatorView, best first
+    score: float
+
+
+def role_tags(operator):
+    return tuple(fold(tag).strip() for tag in (operator.role or '').split(',') if tag.strip())
+
+
+def operator_keywords(operator):
+    text = ' '.join(filter(None, [operator.role, operator.ability, operator.secondary_gadgets, operator.short_bio]))
+    return frozenset(tokenize(text)) - STOPWORDS
+
+
+class LineupEngine:
+    def __init__(self, snapshot):
+        # Everything that doesn't depend on the request is precomputed once per catalog snapshot
+        self.snapshot = snapshot
+        self.role_tags = {op.id: role_tags(op) for op in snapshot.operators}
+        self.keywords = {op.id: operator_keywords(op) for op in snapshot.operators}
+        self.counters = {op.id: frozenset(ref.id for ref in op.counter_list if ref.id) for op in snapshot.operators}
+
+        # Undirected synergy graph: an edge if either operator lists the other
+        self.synergy = {op.id: set() for op in snapshot.operators}
+        for op in snapshot.operators:
+            for ref in op.synergy_list:
+                if ref.id and ref.id in self.synergy and ref.id != op.id:
+                    self.synergy[op.id].add(ref.id)
+                    self.synergy[ref.id].add(op.id)
+
+        self.names = {fold(op.name): op.id for op in snapshot.operators}
+
+    # --- Individual scores ---
+
+    def mentioned_operator_ids(self, situation):
+        folded = f" {' '.join(tokenize(situation))} "
+        return {op_id for name, op_id in self.names.items() if f" {' '.join(tokenize(name))} " in folded}
+
+    def score_operator(self, operator, map_view, is_solo, situation_tokens, mentioned_ids):
+        score = 0.0
+        if is_solo:
+            score += SOLO_FRIENDLY_BONUS if operator.solo_friendly else -TEAM_RELIANT_PENALTY
+
+        if map_view is not None and map_view.electricity_needed:
+            wanted = ATTACKER_ELECTRICITY_TAGS if operator.side == 'Attacker' else DEFENDER_ELECTRICITY_TAGS
+            if any(tag in wanted for tag in self.role_tags[operator.id]):
+                score += ELECTRICITY_BONUS
+
+        score += KEYWORD_WEIGHT * len(situation_tokens & self.keywords[operator.id])
+        score += COUNTER_MENTION_BONUS * len(mentioned_ids & self.counters[operator.id])
+        return score
+
+    def rank(self, side, map_view=None, is_solo=False, situation=''):
+        # Returns [(score, operator)] for one side, best first
+        situation_tokens = frozenset(tokenize(situation)) - STOPWORDS
+        mentioned_ids = self.mentioned_operator_ids(situation)
+        candidates = self.snapshot.attackers if side == 'Attacker' else self.snapshot.defenders
+        scored = [
+            (self.score_operator(op, map_view, is_solo, situation_tokens, mentioned_ids), op)
+            for op in candidates
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1].name))
+        return scored
+
+    def shortlist(self, side, map_view=None, is_solo=False, situation='', size=10):
+        return [op for _, op in self.rank(side, map_view, is_solo, situation)[:size]]
+
+    # --- Team search ---
+
+    def _team_bonus(self, team_ids, side):
+        bonus = 0.0
+        for i, a in enumerate(team_ids):
+            for b in team_ids[i + 1:]:
+                if b in self.synergy[a]:
+                    bonus += SYNERGY_BONUS
+        tags = {tag for op_id in team_ids for tag in self.role_tags[op_id]}
+        bonus += ROLE_COVERAGE_BONUS * len(tags)
+        if side == 'Attacker' and not any('hard breach' in tag for tag in tags):
+            bonus -= MISSING_HARD_BREACH_PENALTY
+        return bonus
+
+    def suggest(self, side, map_view=None, is_solo=False, situation=''):
+        ranked = self.rank(side, map_view, is_solo, situation)
+        if len(ranked) <= TEAM_SIZE:
+            return LineupResult(tuple(op for _, op in ranked), 0.0)
+
+        scores = [score for score, _ in ranked]
+        ids = [op.id for _, op in ranked]
+        # Optimistic per-operator gain: its own score plus every synergy edge and role tag it could add
+        optimistic = [
+            scores[i] + SYNERGY_BONUS * len(self.synergy[ids[i]]) + ROLE_COVERAGE_BONUS * len(self.role_tags[ids[i]])
+            for i in range(len(ids))
+        ]
+
+        # top_sums[i][k]: sum of the k largest optimistic gains among candidates i..n
+        top_sums = []
+        for i in range(len(ids)):
+            suffix = sorted(optimistic[i:], reverse=True)[:TEAM_SIZE]
+            top_sums.append([sum(suffix[:k]) for k in range(TEAM_SIZE + 1)])
+
+        best = {'score': float('-inf'), 'team': None}
+
+        def search(start, team, individual_score):
+            if len(team) == TEAM_SIZE:
+                total = individual_score + self._team_bonus(team, side)
+                if total > best['score']:
+                    best['score'], best['team'] = total, list(team)
+                return
+            needed = TEAM_SIZE - len(team)
+            partial_bonus = self._team_bonus(team, side) + MISSING_HARD_BREACH_PENALTY
+            for i in range(start, len(ids) - needed + 1):
+                # Bound: even the best remaining picks can't beat the current best team
+                bound = partial_bonus + individual_score + top_sums[i][needed]
+                if bound <= best['score']:
+                    return
+                team.append(ids[i])
+                search(i + 1, team, individual_score + scores[i])
+                team.pop()
+
+        search(0, [], 0.0)
+        by_id = self.snapshot.operators_by_id
+        return LineupResult(tuple(by_id[op_id] for op_id in best['team']), round(best['score'], 3))
+
+
+_engine = None
+
+
+def get_lineup_engine(snapshot):
+    # Rebuilt whenever the catalog cache hands out a new snapshot
+    global _engine
+    engine = _engine
+    if engine is None or engine.snapshot is not snapshot:
+        engine = LineupEngine(snapshot)
+        _engine = engine
+    return engine
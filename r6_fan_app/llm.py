@@ -0,0 +1,253 @@
+# r6_fan_app/llm.py
+
+# Client for the Gemini API used by the lineup suggestor.
+# Calls run on a small dedicated thread pool behind a concurrency semaphore, reuse pooled
+# keep-alive connections, and have connect/read timeouts plus a hard overall deadline.
+# When every slot is busy, callers fail fast instead of tying up a web worker.
+# Every call is recorded with its duration, outcome and token usage against the configured budget.
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+
+from flask import current_app
+
+from r6_fan_app.metrics import record_llm_call
+
+# requests is imported inside the methods that use it: it is one of the slowest imports in the
+# web process and only lineup suggestions need it, so it is loaded with the first client
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMBusyError(LLMError):
+    # All concurrency slots are taken and none freed up within the queue timeout
+    pass
+
+
+class LLMTimeoutError(LLMError):
+    pass
+
+
+class LLMResponseError(LLMError):
+    # The API answered, but not with something we can use
+    pass
+
+
+@contextmanager
+def timed_call(method, max_output_tokens=None, latency_budget=None):
+    # Records the call's duration, outcome and token usage in the metrics (see metrics.py).
+    # Yields a dict the caller fills with the response's usageMetadata.
+    started = time.perf_counter()
+    status = 'ok'
+    usage = {}
+    try:
+        yield usage
+    except LLMBusyError:
+        status = 'busy'
+        raise
+    except LLMTimeoutError:
+        status = 'timeout'
+        raise
+    except LLMResponseError:
+        status = 'invalid_response'
+        raise
+    except GeneratorExit:
+        status = 'cancelled'  # the client went away mid-stream
+        raise
+    except Exception:
+        status = 'error'
+        raise
+    finally:
+        record_llm_call(method, status, time.perf_counter() - started, usage, max_output_tokens, latency_budget)
+
+
+class GeminiClient:
+    def __init__(self, api_key, api_base, model, connect_timeout=3.05, read_timeout=20.0,
+                 total_timeout=25.0, max_concurrency=4, queue_timeout=0.5, max_output_tokens=None,
+                 latency_budget=None):
+        self.api_key = api_key
+        self.api_base = api_base.rstrip('/')
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.total_timeout = total_timeout
+        self.queue_timeout = queue_timeout
+        self.max_output_tokens = max_output_tokens
+        self.latency_budget = latency_budget
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # One keep-alive pool sized to the number of calls we allow at once
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm')
+
+    def endpoint(self, method):
+        return f"{self.api_base}/models/{self.model}:{method}"
+
+    def build_payload(self, prompt, generation_config=None):
+        # generation_config is Gemini's generationConfig (e.g. JSON mode with a responseSchema);
+        # the output token budget is always applied
+        generation_config = dict(generation_config or {})
+        if self.max_output_tokens:
+            generation_config.setdefault('maxOutputTokens', self.max_output_tokens)
+        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        return payload
+
+    def timed(self, method):
+        return timed_call(method, self.max_output_tokens, self.latency_budget)
+
+    def _post(self, payload):
+        import requests
+        try:
+            response = self.session.post(
+                self.endpoint('generateContent'),
+                params={'key': self.api_key},
+                json=payload,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.Timeout as e:
+            raise LLMTimeoutError(f"LLM request timed out: {e}") from e
+        except requests.exceptions.RequestException as e:
+            raise LLMError(f"LLM request failed: {e}") from e
+        except ValueError as e:
+            raise LLMResponseError(f"LLM returned invalid JSON: {e}") from e
+
+    def generate(self, payload):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise LLMBusyError("Too many LLM requests in flight.")
+
+        try:
+            future = self._executor.submit(self._post, payload)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is only freed once the HTTP call really finishes, even if we stop waiting for it
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.total_timeout)
+        except FutureTimeoutError as e:
+            raise LLMTimeoutError(f"LLM call exceeded {self.total_timeout}s.") from e
+
+    def generate_text(self, prompt, generation_config=None):
+        with self.timed('generate') as usage:
+            result = self.generate(self.build_payload(prompt, generation_config))
+            if isinstance(result, dict):
+                usage.update(result.get('usageMetadata') or {})
+            try:
+                return result['candidates'][0]['content']['parts'][0]['text'].strip()
+            except (KeyError, IndexError, TypeError) as e:
+                raise LLMResponseError("LLM response did not contain any candidates.") from e
+
+    def stream_text(self, prompt, generation_config=None):
+        # Yields text fragments as Gemini produces them (streamGenerateContent over SSE).
+        # Runs on the calling thread so the caller can forward fragments while they arrive,
+        # but still takes one of the concurrency slots for the whole stream.
+        with self.timed('stream') as usage:
+            yield from self._stream_text(self.build_payload(prompt, generation_config), usage)
+
+    def _stream_text(self, payload, usage):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise LLMBusyError("Too many LLM requests in flight.")
+
+        import requests
+        deadline = time.monotonic() + self.total_timeout
+        try:
+            with self.session.post(
+                self.endpoint('streamGenerateContent'),
+                params={'key': self.api_key, 'alt': 'sse'},
+                json=payload,
+                timeout=self.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                    if time.monotonic() > deadline:
+                        raise LLMTimeoutError(f"LLM stream exceeded {self.total_timeout}s.")
+                    if not line or not line.startswith('data:'):
+                        continue
+                    try:
+                        chunk = json.loads(line[len('data:'):].strip())
+                        # Each chunk carries the running totals; the last one has the final count
+                        usage.update(chunk.get('usageMetadata') or {})
+                        parts = chunk['candidates'][0]['content']['parts']
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        continue  # e.g. a final chunk that only carries usage metadata
+                    for part in parts:
+                        if part.get('text'):
+                            yield part['text']
+        except requests.exceptions.Timeout as e:
+            raise LLMTimeoutError(f"LLM stream timed out: {e}") from e
+        except requests.exceptions.RequestException as e:
+            raise LLMError(f"LLM stream failed: {e}") from e
+        finally:
+            self._slots.release()
+
+
+class StreamingJsonNameParser:
+    # Picks the names out of a streamed JSON mode reply ({"operators": ["Ash", "Thermite", ...]})
+    # as soon as each string is complete, long before the whole document is
+
+    NEXT_NAME_RE = re.compile(r'\s*,?\s*("(?:[^"\\]|\\.)*")')
+
+    def __init__(self):
+        self.text = ''  # everything received so far, for validating the complete reply
+        self._position = None  # just after the last name read; None until the array has started
+
+    def feed(self, text):
+        self.text += text
+        if self._position is None:
+            start = self.text.find('[')
+            if start < 0:
+                return []
+            self._position = start + 1
+        names = []
+        while True:
+            match = self.NEXT_NAME_RE.match(self.text, self._position)
+            if match is None:
+                return names  # the next name is incomplete, or the array has ended
+            names.append(json.loads(match.group(1)))
+            self._position = match.end()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    # Created lazily, once per worker process, from the app config
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                config = current_app.config
+                if not config.get('LLM_API_KEY'):
+                    raise ValueError("LLM_API_KEY environment variable not set.")
+                _client = GeminiClient(
+                    api_key=config['LLM_API_KEY'],
+                    api_base=config['LLM_API_BASE'],
+                    model=config['LLM_MODEL'],
+                    connect_timeout=config['LLM_CONNECT_TIMEOUT'],
+                    read_timeout=config['LLM_READ_TIMEOUT'],
+                    total_timeout=config['LLM_TOTAL_TIMEOUT'],
+                    max_concurrency=config['LLM_MAX_CONCURRENCY'],
+                    queue_timeout=config['LLM_QUEUE_TIMEOUT'],
+                    max_output_tokens=config['LLM_MAX_OUTPUT_TOKENS'],
+                    latency_budget=config['LLM_LATENCY_BUDGET'],
+                )
+    return _client
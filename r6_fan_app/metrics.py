@@ -0,0 +1,299 @@
+# r6_fan_app/metrics.py
+
+# Request instrumentation: per-endpoint latency histograms, database query counts and time
+# (from SQLAlchemy cursor events), template render time, Gemini call durations and the cache
+# hit counters, exposed in the Prometheus text format at /metrics. Gemini calls also count their
+# tokens, the calls that went over the token or latency budget, and whether the lineup in the
+# reply was usable as is, plus suggestor requests that were rate limited or coalesced.
+# Every response also gets a Server-Timing header (db, tpl, llm, total) so the breakdown of a
+# single request shows up in the browser's devtools.
+#
+# Metrics are kept per worker process (like the caches), so scrape each worker or run one
+# worker with threads, as the Procfile does.
+
+import threading
+import time
+from collections import defaultdict
+
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+# Seconds; covers cached pages (~1 ms) up to slow Gemini calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)  # per bucket, made cumulative when rendered
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.total += value
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.request_latency = defaultdict(Histogram)  # endpoint -> Histogram
+        self.requests = defaultdict(int)  # (endpoint, status) -> count
+        self.db_queries = defaultdict(int)  # endpoint -> count
+        self.db_seconds = defaultdict(float)  # endpoint -> seconds
+        self.render_seconds = defaultdict(float)  # endpoint -> seconds
+        self.llm_latency = defaultdict(Histogram)  # (method, status) -> Histogram
+        self.llm_tokens = defaultdict(int)  # (method, 'prompt' or 'output') -> tokens
+        self.llm_over_budget = defaultdict(int)  # (method, 'tokens' or 'latency') -> calls
+        self.llm_replies = defaultdict(int)  # (method, 'valid', 'repaired' or 'invalid') -> replies
+        self.llm_coalesced = defaultdict(int)  # method -> requests that waited for an identical call
+        self.rate_limited = defaultdict(int)  # 'client' or 'global' -> requests answered with 429
+
+    def observe_request(self, endpoint, status, seconds, db_queries, db_seconds, render_seconds):
+        with self._lock:
+            self.request_latency[endpoint].observe(seconds)
+            self.requests[(endpoint, status)] += 1
+            self.db_queries[endpoint] += db_queries
+            self.db_seconds[endpoint] += db_seconds
+            self.render_seconds[endpoint] += render_seconds
+
+    def observe_llm(self, method, status, seconds, prompt_tokens, output_tokens, over_budget):
+        with self._lock:
+            self.llm_latency[(method, status)].observe(seconds)
+            self.llm_tokens[(method, 'prompt')] += prompt_tokens
+            self.llm_tokens[(method, 'output')] += output_tokens
+            for budget in over_budget:
+                self.llm_over_budget[(method, budget)] += 1
+
+    def observe_llm_reply(self, method, result):
+        with self._lock:
+            self.llm_replies[(method, result)] += 1
+
+    def observe_coalesced(self, method):
+        with self._lock:
+            self.llm_coalesced[method] += 1
+
+    def observe_rate_limited(self, scope):
+        with self._lock:
+            self.rate_limited[scope] += 1
+
+
+# One registry per worker process
+metrics = Metrics()
+
+
+def request_endpoint():
+    # Endpoint names keep the label set small; unknown URLs are grouped together
+    return request.endpoint or 'unmatched'
+
+
+def record_llm_call(method, status, seconds, usage=None, max_output_tokens=None, latency_budget=None):
+    # Called by the Gemini client for every call, including failed ones. usage is the
+    # response's usageMetadata (empty when the call failed before Gemini answered).
+    usage = usage or {}
+    prompt_tokens = usage.get('promptTokenCount', 0)
+    output_tokens = usage.get('candidatesTokenCount', 0) + usage.get('thoughtsTokenCount', 0)
+    over_budget = []
+    if max_output_tokens and output_tokens >= max_output_tokens:
+        over_budget.append('tokens')  # the reply was cut off
+    if latency_budget and seconds > latency_budget:
+        over_budget.append('latency')
+    metrics.observe_llm(method, status, seconds, prompt_tokens, output_tokens, over_budget)
+    if has_request_context():
+        g.metrics_llm_seconds = g.get('metrics_llm_seconds', 0.0) + seconds
+        g.metrics_llm_tokens = g.get('metrics_llm_tokens', 0) + prompt_tokens + output_tokens
+
+
+def record_lineup_reply(method, result):
+    # 'valid': five allowed names; 'repaired': the lineup engine filled some slots; 'invalid': unusable
+    metrics.observe_llm_reply(method, result)
+
+
+def record_coalesced(method):
+    # A suggestor request that shared another request's Gemini call (see singleflight.py)
+    metrics.observe_coalesced(method)
+
+
+def record_rate_limited(scope):
+    metrics.observe_rate_limited(scope)
+
+
+# --- Per-request bookkeeping ---
+
+def start_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_db_queries = 0
+    g.metrics_db_seconds = 0.0
+    g.metrics_render_seconds = 0.0
+
+
+def finish_request(response):
+    started = g.get('metrics_started')
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    db_queries = g.metrics_db_queries
+    db_seconds = g.metrics_db_seconds
+    render_seconds = g.metrics_render_seconds
+    metrics.observe_request(request_endpoint(), response.status_code, elapsed, db_queries, db_seconds,
+                            render_seconds)
+
+    timings = [f'db;dur={db_seconds * 1000:.1f};desc="{db_queries} queries"',
+               f'tpl;dur={render_seconds * 1000:.1f}']
+    llm_seconds = g.get('metrics_llm_seconds')
+    if llm_seconds:
+        timings.append(f'llm;dur={llm_seconds * 1000:.1f};desc="{g.get("metrics_llm_tokens", 0)} tokens"')
+    page_cache_result = g.get('page_cache_result')
+    if page_cache_result:
+        timings.append(f'cache;desc="page {page_cache_result}"')
+    # For streamed responses this is the time until the stream started
+    timings.append(f'total;dur={elapsed * 1000:.1f}')
+    response.headers.add('Server-Timing', ', '.join(timings))
+    return response
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['metrics_query_start'].pop()
+    if has_request_context() and 'metrics_started' in g:
+        g.metrics_db_queries += 1
+        g.metrics_db_seconds += time.perf_counter() - started
+
+
+def handle_error(conn_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    starts = conn_context.connection.info.get('metrics_query_start') if conn_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def template_started(sender, template, context, **extra):
+    if has_request_context():
+        g.setdefault('metrics_render_starts', []).append(time.perf_counter())
+
+
+def template_finished(sender, template, context, **extra):
+    starts = g.get('metrics_render_starts') if has_request_context() else None
+    if starts:
+        elapsed = time.perf_counter() - starts.pop()
+        if not starts:  # nested render_template calls are already counted by the outer one
+            g.metrics_render_seconds = g.get('metrics_render_seconds', 0.0) + elapsed
+
+
+# --- Prometheus text format ---
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+def histogram_lines(name, histograms, label_names):
+    lines = []
+    for key, histogram in sorted(histograms.items()):
+        labels = list(zip(label_names, key if isinstance(key, tuple) else (key,)))
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{format_labels(labels + [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{format_labels(labels + [('le', '+Inf')])} {histogram.count}")
+        lines.append(f"{name}_sum{format_labels(labels)} {histogram.total:.6f}")
+        lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+    return lines
+
+
+def metric_block(name, metric_type, help_text, lines):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"] + lines
+
+
+def render_metrics(catalog_stats, page_stats, suggestion_stats, pool_stats):
+    # Text exposition format 0.0.4
+    with metrics._lock:
+        request_latency = dict(metrics.request_latency)
+        requests = dict(metrics.requests)
+        db_queries = dict(metrics.db_queries)
+        db_seconds = dict(metrics.db_seconds)
+        render_seconds = dict(metrics.render_seconds)
+        llm_latency = dict(metrics.llm_latency)
+        llm_tokens = dict(metrics.llm_tokens)
+        llm_over_budget = dict(metrics.llm_over_budget)
+        llm_replies = dict(metrics.llm_replies)
+        llm_coalesced = dict(metrics.llm_coalesced)
+        rate_limited = dict(metrics.rate_limited)
+
+    out = []
+    out += metric_block('r6_http_request_duration_seconds', 'histogram', "Request latency by endpoint.",
+                        histogram_lines('r6_http_request_duration_seconds', request_latency, ('endpoint',)))
+    out += metric_block('r6_http_requests_total', 'counter', "Requests by endpoint and status code.",
+                        [f"r6_http_requests_total{format_labels([('endpoint', endpoint), ('status', status)])} {count}"
+                         for (endpoint, status), count in sorted(requests.items())])
+    out += metric_block('r6_db_queries_total', 'counter', "Database queries run while handling requests.",
+                        [f"r6_db_queries_total{format_labels([('endpoint', endpoint)])} {count}"
+                         for endpoint, count in sorted(db_queries.items())])
+    out += metric_block('r6_db_query_seconds_total', 'counter', "Time spent in database queries.",
+                        [f"r6_db_query_seconds_total{format_labels([('endpoint', endpoint)])} {seconds:.6f}"
+                         for endpoint, seconds in sorted(db_seconds.items())])
+    out += metric_block('r6_template_render_seconds_total', 'counter', "Time spent rendering templates.",
+                        [f"r6_template_render_seconds_total{format_labels([('endpoint', endpoint)])} {seconds:.6f}"
+                         for endpoint, seconds in sorted(render_seconds.items())])
+    out += metric_block('r6_llm_request_duration_seconds', 'histogram', "Gemini call latency by method and outcome.",
+                        histogram_lines('r6_llm_request_duration_seconds', llm_latency, ('method', 'status')))
+    out += metric_block('r6_llm_tokens_total', 'counter', "Gemini tokens used by method and kind.",
+                        [f"r6_llm_tokens_total{format_labels([('method', method), ('kind', kind)])} {count}"
+                         for (method, kind), count in sorted(llm_tokens.items())])
+    out += metric_block('r6_llm_over_budget_total', 'counter', "Gemini calls over the token or latency budget.",
+                        [f"r6_llm_over_budget_total{format_labels([('method', method), ('budget', budget)])} {count}"
+                         for (method, budget), count in sorted(llm_over_budget.items())])
+    out += metric_block('r6_llm_lineup_replies_total', 'counter', "Gemini lineup replies by validation result.",
+                        [f"r6_llm_lineup_replies_total{format_labels([('method', method), ('result', result)])} "
+                         f"{count}" for (method, result), count in sorted(llm_replies.items())])
+    out += metric_block('r6_llm_coalesced_total', 'counter', "Suggestor requests that shared an identical Gemini call.",
+                        [f"r6_llm_coalesced_total{format_labels([('method', method)])} {count}"
+                         for method, count in sorted(llm_coalesced.items())])
+    out += metric_block('r6_rate_limited_total', 'counter', "Suggestor requests rejected with 429, by bucket.",
+                        [f"r6_rate_limited_total{format_labels([('scope', scope)])} {count}"
+                         for scope, count in sorted(rate_limited.items())])
+
+    cache_lines = []
+    for cache, stats in (('catalog', catalog_stats), ('page', page_stats), ('suggestion', suggestion_stats)):
+        for result in ('hits', 'near_hits', 'misses', 'not_modified'):
+            if stats and result in stats:
+                cache_lines.append(f"r6_cache_lookups_total{format_labels([('cache', cache), ('result', result)])} "
+                                   f"{stats[result]}")
+    out += metric_block('r6_cache_lookups_total', 'counter', "Cache lookups by cache and result.", cache_lines)
+
+    out += metric_block('r6_db_pool_connections', 'gauge', "Connection pool state.",
+                        [f"r6_db_pool_connections{format_labels([('state', state)])} {pool_stats[state]}"
+                         for state in ('size', 'checkedout', 'checkedin', 'overflow') if state in pool_stats])
+    out += metric_block('r6_db_pool_events_total', 'counter', "Connection pool events.",
+                        [f"r6_db_pool_events_total{format_labels([('event', name)])} {pool_stats[name]}"
+                         for name in ('connects', 'checkouts', 'invalidations')])
+    out += metric_block('r6_process_start_time_seconds', 'gauge', "When this worker started (unix time).",
+                        [f"r6_process_start_time_seconds {metrics.started:.3f}"])
+    return '\n'.join(out) + '\n'
+
+
+def init_metrics(app, db):
+    if not app.config['METRICS_ENABLED']:
+        return
+    with app.app_context():
+        engine = db.engine
+    app.before_request(start_request)
+    app.after_request(finish_request)
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+    event.listen(engine, 'handle_error', handle_error)
+    before_render_template.connect(template_started, app)
+    template_rendered.connect(template_finished, app)
@@ -7,6 +7,16 @@ from r6_fan_app import db
 # Define your SQLAlchemy Models
 class Operator(db.Model):
     __tablename__ = 'operators'
+    # Indexes are created by the migrations (migrations/versions); keep both in step
+    __table_args__ = (
+        # Case-insensitive uniqueness, and lookups by lower(name)
+        db.Index('ix_operators_name_lower', db.func.lower(db.text('name')), unique=True),
+        # Substring (ILIKE '%...%') and fuzzy (%) name search; Postgres only, needs pg_trgm.
+        # info['dialect'] keeps autogenerate (migrations/env.py) from adding it on other databases.
+        db.Index('ix_operators_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+                 info={'dialect': 'postgresql'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_operators_side', 'side'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.Text, unique=True, nullable=False)
     side = db.Column(db.Text, nullable=False)  # 'Attacker' or 'Defender'
@@ -43,6 +53,9 @@ class Operator(db.Model):
 
 class Map(db.Model):
     __tablename__ = 'maps'
+    __table_args__ = (
+        db.Index('ix_maps_name_lower', db.func.lower(db.text('name')), unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.Text, unique=True, nullable=False)
     image_url = db.Column(db.Text, nullable=False)
@@ -67,8 +80,19 @@ class Map(db.Model):
 class GameInfo(db.Model):
     __tablename__ = 'game_info'
     id = db.Column(db.Integer, primary_key=True)
-    section_title = db.Column(db.String(100), nullable=False)
+    section_title = db.Column(db.String(100), unique=True, nullable=False)
     content = db.Column(db.Text, nullable=False)
 
     def __repr__(self):
         return f'<GameInfo {self.section_title}>'
+
+
+class CatalogVersion(db.Model):
+    # Single-row table (id = 1) bumped by load_catalog.py whenever catalog data changes.
+    # The app compares it against its cached snapshot to decide when to reload.
+    __tablename__ = 'catalog_version'
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Text, nullable=False)
+
+    def __repr__(self):
+        return f'<CatalogVersion {self.version}>'
@@ -0,0 +1,97 @@
+# r6_fan_app/name_resolver.py
+
+# Resolves operator names coming from outside the catalog (mostly LLM output) to catalog
+# operators in one pass, without touching the database. Matching ignores case, accents and
+# punctuation, tolerates list decorations like "1. **Ash** (Attacker)" and accepts small typos.
+
+import re
+from dataclasses import dataclass
+
+from r6_fan_app.text_utils import fold
+
+# Things LLMs like to wrap names in: list numbering, markdown emphasis, trailing notes in brackets
+DECORATION_RE = re.compile(r'^\s*(?:\d+[.)]|[-*•])\s*|\([^)]*\)|\[[^\]]*\]|[*_`"]')
+
+UNKNOWN = 'unknown'
+WRONG_SIDE = 'wrong_side'
+DUPLICATE = 'duplicate'
+
+
+@dataclass(frozen=True)
+class UnmatchedName:
+    name: str
+    reason: str  # UNKNOWN, WRONG_SIDE or DUPLICATE
+
+
+@dataclass(frozen=True)
+class NameResolution:
+    operators: tuple  # resolved operators, in the order they were given
+    unmatched: tuple  # of UnmatchedName
+    corrections: tuple  # (given name, catalog name) pairs that needed fuzzy matching
+
+
+def normalise_name(name):
+    cleaned = DECORATION_RE.sub(' ', name or '')
+    return ''.join(ch for ch in fold(cleaned) if ch.isalnum())
+
+
+def edit_distance(a, b, limit):
+    # Levenshtein distance, giving up early once it is certain to exceed limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ch_a in enumerate(a, 1):
+        current = [i]
+        for j, ch_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ch_a != ch_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class OperatorNameResolver:
+    def __init__(self, operators):
+        self.by_normalised = {normalise_name(op.name): op for op in operators}
+
+    def match(self, name):
+        # Returns (operator, was_fuzzy) or (None, False)
+        key = normalise_name(name)
+        if not key:
+            return None, False
+        operator = self.by_normalised.get(key)
+        if operator is not None:
+            return operator, False
+
+        # Allow one typo in short names and two in longer ones; only accept an unambiguous winner
+        limit = 1 if len(key) <= 5 else 2
+        best, best_distance, tied = None, limit + 1, False
+        for candidate_key, candidate in self.by_normalised.items():
+            distance = edit_distance(key, candidate_key, limit)
+            if distance < best_distance:
+                best, best_distance, tied = candidate, distance, False
+            elif distance == best_distance and distance <= limit:
+                tied = True
+        if best is not None and not tied:
+            return best, True
+        return None, False
+
+    def resolve(self, names, side=None):
+        operators = []
+        unmatched = []
+        corrections = []
+        seen = set()
+        for name in names:
+            operator, was_fuzzy = self.match(name)
+            if operator is None:
+                unmatched.append(UnmatchedName(name, UNKNOWN))
+            elif side and operator.side != side:
+                unmatched.append(UnmatchedName(name, WRONG_SIDE))
+            elif operator.id in seen:
+                unmatched.append(UnmatchedName(name, DUPLICATE))
+            else:
+                seen.add(operator.id)
+                operators.append(operator)
+                if was_fuzzy:
+                    corrections.append((name, operator.name))
+        return NameResolution(tuple(operators), tuple(unmatched), tuple(corrections))
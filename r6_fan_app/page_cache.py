@@ -0,0 +1,199 @@
+# r6_fan_app/page_cache.py
+
+# Rendered-page cache for the catalog pages (operators, maps, game info and their detail pages).
+# Those pages look the same for every visitor until the catalog changes, so each worker keeps
+# the rendered HTML, plus gzip and (when the brotli package is installed) brotli versions of it,
+# keyed by endpoint, URL arguments and catalog version.
+#
+# The ETag is derived from the catalog version, the templates and the cache key alone, so a
+# conditional GET is answered with 304 before anything is looked up or rendered.
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, g, request
+from werkzeug.http import http_date, is_resource_modified
+
+from r6_fan_app.assets import asset_manifest
+from r6_fan_app.catalog import get_catalog
+
+try:
+    import brotli
+except ImportError:  # optional; pages are still served gzip-compressed without it
+    brotli = None
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    body: bytes
+    gzip_body: bytes
+    brotli_body: bytes  # empty when brotli isn't available
+    etag: str
+    last_modified: datetime
+    version: str
+
+    @property
+    def size(self):
+        return len(self.body) + len(self.gzip_body) + len(self.brotli_body)
+
+
+def templates_fingerprint(app):
+    # Changes whenever a template changes, so a deploy never answers 304 with an old page
+    digest = hashlib.sha1()
+    folder = os.path.join(app.root_path, app.template_folder)
+    for root, _, files in sorted(os.walk(folder)):
+        for file_name in sorted(files):
+            with open(os.path.join(root, file_name), 'rb') as f:
+                digest.update(file_name.encode('utf-8'))
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+class PageCache:
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.salt = ''
+        self._entries = OrderedDict()  # key -> CachedPage, least recently used first
+        self._size = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.purges = 0
+
+    def make_etag(self, version, key):
+        return hashlib.sha1(f"{self.salt}|{version}|{key}".encode('utf-8')).hexdigest()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, body, last_modified):
+        entry = CachedPage(
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+            brotli_body=brotli.compress(body) if brotli is not None else b'',
+            etag=self.make_etag(version, key),
+            last_modified=last_modified,
+            version=version,
+        )
+        if entry.size > self.max_bytes:
+            return entry
+        with self._lock:
+            if version != self._version:
+                # A new catalog version makes every older page stale
+                self._clear()
+                self._version = version
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+        return entry
+
+    def _clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def purge(self):
+        with self._lock:
+            self._clear()
+            self._version = None
+            self.purges += 1
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'purges': self.purges,
+            'entries': len(self._entries),
+            'bytes': self._size,
+        }
+
+
+# One cache per worker process
+page_cache = PageCache()
+
+
+def preferred_encoding(entry):
+    accepted = request.accept_encodings
+    if entry.brotli_body and accepted['br']:
+        return 'br', entry.brotli_body
+    if accepted['gzip']:
+        return 'gzip', entry.gzip_body
+    return None, entry.body
+
+
+def page_response(entry, body=None, encoding=None, status=200):
+    response = current_app.response_class(body, status=status, mimetype='text/html')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.set_etag(entry.etag)
+    response.headers['Last-Modified'] = http_date(entry.last_modified)
+    response.cache_control.public = True
+    max_age = current_app.config['PAGE_CACHE_MAX_AGE']
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True  # browsers may keep it but must revalidate
+    return response
+
+
+def cached_page(view):
+    # Serves a catalog page from the page cache. Only 200 responses are cached; redirects and
+    # error pages always go through the view. Query strings are ignored: these pages don't use them.
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_app.config['PAGE_CACHE_ENABLED'] or request.method not in ('GET', 'HEAD'):
+            return view(*args, **kwargs)
+
+        catalog = get_catalog()
+        version = catalog.version or f"loaded-{catalog.loaded_at}"
+        last_modified = datetime.fromtimestamp(int(catalog.loaded_at), timezone.utc)
+        key = f"{request.endpoint}|{sorted(kwargs.items())}"
+
+        entry = page_cache.get(key, version)
+        if entry is None:
+            # Rendered even for a conditional request: only the view knows whether the URL is a page
+            # at all, and an unknown slug (404) or an alias (301) must never be answered with a 304
+            page_cache.misses += 1
+            g.page_cache_result = 'miss'
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            entry = page_cache.put(key, version, response.get_data(), last_modified)
+        else:
+            page_cache.hits += 1
+            g.page_cache_result = 'hit'
+
+        if not is_resource_modified(request.environ, etag=entry.etag, last_modified=entry.last_modified):
+            page_cache.not_modified += 1
+            g.page_cache_result = 'not modified'
+            return page_response(entry, status=304)
+
+        encoding, body = preferred_encoding(entry)
+        return page_response(entry, body, encoding)
+
+    return wrapper
+
+
+def init_page_cache(app):
+    page_cache.max_bytes = app.config['PAGE_CACHE_MAX_BYTES']
+    # Pages embed hashed asset URLs, so a new asset build must also change every ETag
+    page_cache.salt = f"{templates_fingerprint(app)}|{asset_manifest.digest}"
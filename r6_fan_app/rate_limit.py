@@ -0,0 +1,191 @@
+# r6_fan_app/rate_limit.py
+
+# Token-bucket rate limiting for the lineup suggestor, which is the only route that spends the
+# Gemini quota. Every client IP has a bucket, and one global bucket caps all clients together:
+# each bucket holds up to `burst` tokens and refills at `per_minute` tokens a minute. A request
+# takes a token from both; when either is empty it takes none and gets a 429 with Retry-After.
+#
+# Like the suggestion cache, the default backend is a SQLite file so all gunicorn workers on the
+# machine share the buckets; an in-process backend is available for single-process runs.
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, request
+
+from r6_fan_app.metrics import record_rate_limited
+
+GLOBAL_KEY = 'global'
+
+
+def take_token(tokens, updated, now, burst, per_minute):
+    # Returns (tokens left, seconds until a token is available or 0 when one was taken)
+    rate = per_minute / 60.0
+    tokens = min(burst, tokens + (now - updated) * rate)
+    if tokens >= 1.0:
+        return tokens - 1.0, 0.0
+    return tokens, (1.0 - tokens) / rate
+
+
+def take_tokens(buckets, now, limits):
+    # All or nothing: takes a token from every bucket only when each one has a token, so a request
+    # turned away by one bucket costs nothing in the others.
+    # buckets: {key: (tokens, updated)} as stored; limits: [(key, burst, per_minute)].
+    # Returns ({key: tokens left} to store, or None when refused; [(index, wait)] for the empty buckets)
+    left = {}
+    empty = []
+    for index, (key, burst, per_minute) in enumerate(limits):
+        tokens, updated = buckets.get(key, (burst, now))
+        left[key], wait = take_token(tokens, updated, now, burst, per_minute)
+        if wait:
+            empty.append((index, wait))
+    return (None if empty else left), empty
+
+
+class MemoryBucketStore:
+    # Per-process buckets. clock can be replaced in tests.
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._buckets = {}  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def acquire(self, limits):
+        now = self.clock()
+        with self._lock:
+            left, empty = take_tokens(self._buckets, now, limits)
+            if left is not None:
+                for key, tokens in left.items():
+                    self._buckets[key] = (tokens, now)
+            if len(self._buckets) > 10000:
+                # Buckets that have been idle long enough to be full again carry no information
+                for stale in [k for k, (_, seen) in self._buckets.items() if now - seen > 3600]:
+                    del self._buckets[stale]
+        return empty
+
+
+class SQLiteBucketStore:
+    # Shared across worker processes through a single SQLite file (WAL mode)
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._last_cleanup = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, limits):
+        conn = self._connect()
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock up front, so the read-refill-write is atomic across workers
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            buckets = {}
+            for key, _, _ in limits:
+                row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                if row:
+                    buckets[key] = row
+            left, empty = take_tokens(buckets, now, limits)
+            if left is not None:
+                conn.executemany("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                                 [(key, tokens, now) for key, tokens in left.items()])
+            if now - self._last_cleanup > 600:
+                conn.execute("DELETE FROM buckets WHERE updated < ?", (now - 3600,))
+                self._last_cleanup = now
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return empty
+
+
+class RateLimiter:
+    def __init__(self, store, client_burst, client_per_minute, global_burst, global_per_minute):
+        self.store = store
+        self.client_limit = (client_burst, client_per_minute)
+        self.global_limit = (global_burst, global_per_minute)
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+
+    def check(self, client):
+        # Returns the seconds to wait (rounded up, for Retry-After), or 0 when the request may go ahead.
+        # Both buckets are checked before either is spent: a request refused by the global bucket
+        # doesn't cost the client a token, and one refused by the client's doesn't drain the global one.
+        scopes = ('client', 'global')
+        limits = [(f"client:{client}", *self.client_limit), (GLOBAL_KEY, *self.global_limit)]
+        try:
+            empty = self.store.acquire(limits)
+        except Exception as e:
+            # A broken limiter must never take the suggestor down with it
+            self.errors += 1
+            print(f"Rate limiter check failed: {e}")
+            empty = []
+        if empty:
+            self.limited += 1
+            record_rate_limited(scopes[empty[0][0]])
+            # Retry-After: when every bucket that refused has a token again
+            return max(1, math.ceil(max(wait for _, wait in empty)))
+        self.allowed += 1
+        return 0
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    # Created lazily, once per worker process. Returns None when rate limiting is disabled.
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                config = current_app.config
+                backend = config['RATE_LIMIT_BACKEND']
+                if backend == 'none':
+                    return None
+                if backend == 'memory':
+                    store = MemoryBucketStore()
+                else:
+                    path = config['RATE_LIMIT_PATH']
+                    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                    store = SQLiteBucketStore(path)
+                _limiter = RateLimiter(store, config['RATE_LIMIT_CLIENT_BURST'], config['RATE_LIMIT_CLIENT_PER_MINUTE'],
+                                       config['RATE_LIMIT_GLOBAL_BURST'], config['RATE_LIMIT_GLOBAL_PER_MINUTE'])
+    return _limiter
+
+
+def rate_limited(limited_response):
+    # Applies the rate limiter to a view's POST requests. limited_response(retry_after) builds the
+    # 429 for that view (an HTML page, an event stream...); the Retry-After header is added here.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            limiter = get_rate_limiter() if request.method == 'POST' else None
+            retry_after = limiter.check(request.remote_addr or 'unknown') if limiter else 0
+            if not retry_after:
+                return view(*args, **kwargs)
+            response = current_app.make_response(limited_response(retry_after))
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            response.cache_control.no_store = True
+            return response
+        return wrapper
+    return decorator
@@ -1,17 +1,50 @@
 # r6_fan_app/routes.py
 
-from flask import render_template, request, jsonify, Blueprint, url_for
-import requests
-import os  # Needed to access environment variables for API key
+import hmac
+import json
+import time
+
+from flask import (render_template, request, jsonify, Blueprint, url_for, redirect, current_app, Response,
+                   stream_with_context)
+from sqlalchemy import text
 
 # Import db and models using absolute imports from the r6_fan_app package
 from r6_fan_app import db
-from r6_fan_app.models import Operator, Map, GameInfo
+from r6_fan_app.assets import IMMUTABLE_MAX_AGE, asset_exists, asset_url
+from r6_fan_app.catalog import get_catalog, catalog_cache
+from r6_fan_app.catalog_api import list_response, operator_response
+from r6_fan_app.engine_config import pool_stats
+from r6_fan_app.lineup_engine import get_lineup_engine
+from r6_fan_app.llm import LLMError
+from r6_fan_app.metrics import render_metrics
+from r6_fan_app.page_cache import cached_page, page_cache
+from r6_fan_app.rate_limit import rate_limited
+from r6_fan_app.suggestion_cache import get_suggestion_cache, make_suggestion_key
+from r6_fan_app.suggestor import (request_llm_suggestion, stream_suggestion_events, FALLBACK_NOTICE,
+                                  NO_VALID_OPERATORS)
+from r6_fan_app.search import get_search_index, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
 
 # Create a Blueprint instance
 main = Blueprint('main', __name__)
 
 
+# Template filters that read slugs from the catalog's precomputed slug index
+@main.app_template_filter('operator_slug')
+def operator_slug_filter(operator):
+    return get_catalog().operator_slugs.slug_for(operator)
+
+
+@main.app_template_filter('map_slug')
+def map_slug_filter(map_item):
+    return get_catalog().map_slugs.slug_for(map_item)
+
+
+@main.app_template_filter('portrait_path')
+def portrait_path_filter(operator):
+    # Portrait file under static/, to pass to asset_url()
+    return f"images/operators/portraits/{get_catalog().operator_slugs.slug_for(operator)}.png"
+
+
 # Define routes using the blueprint
 @main.route('/')
 def index():
@@ -19,43 +52,45 @@ def index():
 
 
 @main.route('/operators')
+@cached_page
 def operators():
     try:
-        operators_data = Operator.query.all()
-        attackers = [op for op in operators_data if op.side == 'Attacker']
-        defenders = [op for op in operators_data if op.side == 'Defender']
-        return render_template('operators.html', attackers=attackers, defenders=defenders)
+        catalog = get_catalog()
+        # Versioned URL, so the browser can keep the index for as long as this page is current
+        search_index_url = url_for('main.search_index', v=catalog.version or f"loaded-{catalog.loaded_at}")
+        return render_template('operators.html', attackers=catalog.attackers, defenders=catalog.defenders,
+                               search_index_url=search_index_url)
     except Exception as e:
         print(f"Error fetching operators: {e}")
         return render_template('error.html', message="Could not load operators."), 500
 
 
 @main.route('/operators/<operator_name_slug>')
+@cached_page
 def operator_detail(operator_name_slug):
-    operator_name = operator_name_slug.replace('-', ' ').title()
     try:
-        operator_data = Operator.query.filter_by(name=operator_name).first()
+        operator_slugs = get_catalog().operator_slugs
+        operator_data = operator_slugs.lookup(operator_name_slug)
 
         if operator_data:
-            operator_data.secondary_gadgets_list = [g.strip() for g in operator_data.secondary_gadgets.split(
-                ',')] if operator_data.secondary_gadgets else []
-            operator_data.synergy_list = [op.strip() for op in operator_data.synergy_examples.split(
-                ',')] if operator_data.synergy_examples else []
-            operator_data.counter_list = [op.strip() for op in operator_data.counter_examples.split(
-                ',')] if operator_data.counter_examples else []
+            # Send alias URLs (e.g. /operators/jäger) to the canonical one
+            canonical_slug = operator_slugs.slug_for(operator_data)
+            if operator_name_slug != canonical_slug:
+                return redirect(url_for('main.operator_detail', operator_name_slug=canonical_slug), 301)
 
             return render_template('operator_detail.html', operator=operator_data)
         else:
-            return render_template('error.html', message=f"Operator '{operator_name}' not found."), 404
+            return render_template('error.html', message=f"Operator '{operator_name_slug}' not found."), 404
     except Exception as e:
-        print(f"Error fetching operator detail for {operator_name}: {e}")
+        print(f"Error fetching operator detail for {operator_name_slug}: {e}")
         return render_template('error.html', message="Could not load operator details."), 500
 
 
 @main.route('/maps')
+@cached_page
 def maps_list():
     try:
-        maps = Map.query.all()
+        maps = get_catalog().maps
         return render_template('maps.html', maps=maps)
     except Exception as e:
         print(f"Error fetching maps: {e}")
@@ -63,54 +98,153 @@ def maps_list():
 
 
 @main.route('/maps/<map_name_slug>')
+@cached_page
 def map_detail(map_name_slug):
-    map_name = map_name_slug.replace('-', ' ').title()
     try:
-        map_data = Map.query.filter_by(name=map_name).first()
+        map_slugs = get_catalog().map_slugs
+        map_data = map_slugs.lookup(map_name_slug)
 
         if map_data:
-            if map_data.defender_sites:
-                map_data.defender_sites_list = [site.strip() for site in map_data.defender_sites.split(',')]
-            else:
-                map_data.defender_sites_list = []
+            canonical_slug = map_slugs.slug_for(map_data)
+            if map_name_slug != canonical_slug:
+                return redirect(url_for('main.map_detail', map_name_slug=canonical_slug), 301)
 
             return render_template('map_detail.html', map=map_data)
         else:
-            return render_template('error.html', message=f"Map '{map_name}' not found."), 404
+            return render_template('error.html', message=f"Map '{map_name_slug}' not found."), 404
     except Exception as e:
-        print(f"Error fetching map detail for {map_name}: {e}")
+        print(f"Error fetching map detail for {map_name_slug}: {e}")
         return render_template('error.html', message="Could not load map details."), 500
 
 
 @main.route('/game-info')
+@cached_page
 def game_info():
     try:
-        game_info_sections = GameInfo.query.order_by(GameInfo.id).all()
+        game_info_sections = get_catalog().game_info
         return render_template('game_info.html', info_sections=game_info_sections)
     except Exception as e:
         print(f"Error fetching game info: {e}")
         return render_template('error.html', message="Could not load game information."), 500
 
 
-# API Endpoint for Map Sites (Moved from app.py)
+def cacheable_json(payload):
+    # JSON response with a strong ETag (hash of the body) so browsers revalidate with a cheap 304
+    response = jsonify(payload)
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['API_CACHE_MAX_AGE']
+    return response.make_conditional(request)
+
+
+# Purge hook for load_catalog.py (see catalog_version.py). Reloads this worker's catalog and
+# drops its rendered pages straight away; other workers follow at their next catalog version check.
+@main.route('/admin/purge-cache', methods=['POST'])
+def purge_cache():
+    token = current_app.config['PAGE_CACHE_PURGE_TOKEN']
+    if not token:
+        return jsonify(error='Not found'), 404
+    if not hmac.compare_digest(request.headers.get('X-Purge-Token', ''), token):
+        return jsonify(error='Forbidden'), 403
+    catalog_cache.invalidate()
+    page_cache.purge()
+    return jsonify(purged=True, version=get_catalog().version)
+
+
+def has_bearer_token(token):
+    # Authorization: Bearer <token>, compared in constant time
+    supplied = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode())
+
+
+@main.route('/healthz')
+def healthz():
+    # Liveness and database reachability; never cached. The diagnostics (latency, error class, pool,
+    # catalog cache and startup timings) are only included for a request with the METRICS_TOKEN.
+    report = {'status': 'ok', 'catalog_source': current_app.config['CATALOG_SOURCE']}
+    status_code = 200
+    if current_app.config['CATALOG_SOURCE'] != 'snapshot':
+        start = time.perf_counter()
+        try:
+            db.session.execute(text('SELECT 1'))
+            report['database'] = {'ok': True}
+        except Exception as e:
+            db.session.rollback()
+            print(f"Health check: database unreachable: {e}")
+            report['status'] = 'error'
+            report['database'] = {'ok': False, 'error': type(e).__name__}
+            status_code = 503
+        report['database']['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    if has_bearer_token(current_app.config['METRICS_TOKEN']):
+        report['pool'] = pool_stats.report(db.engine)
+        report['catalog_cache'] = catalog_cache.stats()
+        report['startup'] = current_app.config.get('STARTUP_TIMINGS')
+    else:
+        # Only what a liveness probe needs
+        public = {'status': report['status']}
+        if 'database' in report:
+            public['database'] = {'ok': report['database']['ok']}
+        report = public
+    response = jsonify(report)
+    response.status_code = status_code
+    response.cache_control.no_store = True
+    return response
+
+
+@main.route('/metrics')
+def prometheus_metrics():
+    # Pool, cache and rate limit numbers are for the operators only: the endpoint is off without METRICS_TOKEN
+    token = current_app.config['METRICS_TOKEN']
+    if not current_app.config['METRICS_ENABLED'] or not token:
+        return jsonify(error='Not found'), 404
+    if not has_bearer_token(token):
+        return jsonify(error='Forbidden'), 403
+    body = render_metrics(catalog_cache.stats(), page_cache.stats(), get_suggestion_cache_stats(),
+                          pool_stats.report(db.engine))
+    response = Response(body, mimetype='text/plain')
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.cache_control.no_store = True
+    return response
+
+
+def get_suggestion_cache_stats():
+    cache = get_suggestion_cache()
+    return cache.stats() if cache else None
+
+
+# API Endpoints for Map Sites, served from the cached catalog
+@main.route('/api/map-sites')
+def get_all_map_sites():
+    return cacheable_json(get_catalog().map_sites)
+
+
 @main.route('/api/map-sites/<map_name>')
 def get_map_sites(map_name):
-    mock_map_data = {
-        "Bank": ["Vault", "Open Area - Teller", "Archives - Server", "CEO Office"],
-        "Oregon": ["Kitchen", "Kids Bedroom", "Basement"],  # Simplified for example
-        "Coastline": ["Hookah Lounge / Billiards Room", "Blue Bar / Sunrise Bar", "Penthouse / Theater"],
-        "Kafe Dostoyevsky": ["Reading Room / Fireplace Hall", "Mining Room / Dining Room", "Kitchen / Bake Shop"],
-        "Kanal": ["Secure Containers / Boats", "Server Room / Kayak", "Coast Guard Office / Lounge"],
-        "Villa": ["Living Room / Bar", "Dining Room / Kitchen", "Classic Room / Games Room", "Statuary Room / Vault"],
-        # Add more maps and their sites as needed
-    }
-    sites = mock_map_data.get(map_name, [])
-    return jsonify(sites=sites)
+    catalog = get_catalog()
+    # Accept the map name ("Kafe Dostoyevsky") as well as its slug ("kafe-dostoyevsky")
+    map_data = catalog.maps_by_name.get(map_name) or catalog.map_slugs.lookup(map_name)
+    if map_data is None:
+        return jsonify(sites=[]), 404
+    return cacheable_json({'sites': catalog.map_sites[map_data.name]})
+
+
+def too_many_suggestions_message(retry_after):
+    return f"Too many suggestion requests right now. Please try again in {retry_after} seconds."
+
+
+def too_many_suggestions_page(retry_after):
+    return render_template('error.html', message=too_many_suggestions_message(retry_after))
+
+
+def too_many_suggestions_stream(retry_after):
+    body = sse_event('error', {'message': too_many_suggestions_message(retry_after)}) + sse_event('done', {})
+    return Response(body, mimetype='text/event-stream')
 
 
 @main.route('/lineup-suggestor', methods=['GET', 'POST'])
+@rate_limited(too_many_suggestions_page)
 def lineup_suggestor():
-    maps = Map.query.all()  # Fetch all maps for the dropdown
+    maps = get_catalog().maps  # Maps for the dropdown come from the cached catalog
 
     suggested_operators = None
     selected_map_name = None
@@ -119,6 +253,7 @@ def lineup_suggestor():
     is_solo_queue = False
     situation_description = ''
     error_message = None
+    notice_message = None
 
     if request.method == 'POST':
         selected_map_name = request.form.get('map')
@@ -133,61 +268,49 @@ def lineup_suggestor():
         if not selected_map_name or not selected_site or not selected_side or not situation_description:
             error_message = "Please fill in all required fields."
         else:
-            # --- LLM Call to get suggestions ---
             try:
-                # Construct the prompt for the LLM
-                prompt = f"""
-                You are an expert Rainbow Six Siege strategist.
-                Given the following situation, suggest 5 operators (no more, no less) that would be ideal for the team.
-                Prioritize operators that directly address the situation and work well together.
-                If playing solo, suggest operators that are more self-sufficient.
-                Provide only the operator names, separated by commas.
-
-                Map: {selected_map_name}
-                Site: {selected_site}
-                Side: {selected_side}
-                Playing: {'Solo Queue' if is_solo_queue else 'With a Team'}
-                Situation: {situation_description}
-
-                Example Output: Ash, Zofia, Thermite, Thatcher, Twitch
-                """
-
-                chat_history = []
-                chat_history.append({"role": "user", "parts": [{"text": prompt}]})
-                payload = {"contents": chat_history}
-                # Get API key from environment variable using the correct name
-                api_key = os.getenv("LLM_API_KEY")
-                if not api_key:
-                    raise ValueError("LLM_API_KEY environment variable not set.")
-
-                # Call the Gemini API
-                api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key=" + api_key
-                response = requests.post(api_url, json=payload)
-                response.raise_for_status()  # Raise an exception for HTTP errors
-                result = response.json()
-
-                if result and result.get('candidates'):
-                    llm_response_text = result['candidates'][0]['content']['parts'][0]['text'].strip()
-                    suggested_operator_names = [name.strip() for name in llm_response_text.split(',') if name.strip()]
-
-                    # Fetch operator details from your database
-                    suggested_operators = []
-                    for op_name in suggested_operator_names:
-                        operator_obj = Operator.query.filter_by(name=op_name).first()
-                        if operator_obj:
-                            suggested_operators.append(operator_obj)
-                        else:
-                            print(f"Warning: Suggested operator '{op_name}' not found in database.")
-
-                    if not suggested_operators:
-                        error_message = "The AI could not suggest valid operators from our database. Please try a different situation."
-
+                catalog = get_catalog()
+                engine = get_lineup_engine(catalog)
+                selected_map = catalog.maps_by_name.get(selected_map_name)
+
+                # Identical (or near-identical) submissions are answered from the suggestion cache
+                suggestion_key = make_suggestion_key(selected_map_name, selected_site, selected_side,
+                                                     is_solo_queue, situation_description)
+                suggestion_cache = get_suggestion_cache()
+                cached_names = suggestion_cache.lookup(suggestion_key) if suggestion_cache else None
+                from_llm = False
+
+                if cached_names is not None:
+                    suggested_operator_names = cached_names
+                elif current_app.config['LINEUP_MODE'] == 'engine':
+                    suggested_operator_names = [op.name for op in engine.suggest(
+                        selected_side, selected_map, is_solo_queue, situation_description).operators]
                 else:
-                    error_message = "Failed to get a valid response from the AI. Please try again."
+                    # The engine's shortlist goes into the prompt so the LLM picks from strong candidates
+                    candidates = engine.shortlist(selected_side, selected_map, is_solo_queue, situation_description)
+                    try:
+                        suggested_operator_names = request_llm_suggestion(
+                            catalog, selected_map_name, selected_site, selected_side, is_solo_queue,
+                            situation_description, candidates=[op.name for op in candidates])
+                        from_llm = True
+                    except LLMError as llm_err:
+                        # Busy, timed out or failed: answer from the local lineup engine instead
+                        print(f"LLM unavailable, falling back to the lineup engine: {llm_err}")
+                        suggested_operator_names = [op.name for op in engine.suggest(
+                            selected_side, selected_map, is_solo_queue, situation_description).operators]
+                        notice_message = FALLBACK_NOTICE
+
+                # Resolve all suggested names against the cached catalog in one pass (no database queries)
+                resolution = catalog.name_resolver.resolve(suggested_operator_names, side=selected_side)
+                suggested_operators = list(resolution.operators)
+                for unmatched in resolution.unmatched:
+                    print(f"Warning: Suggested operator '{unmatched.name}' skipped ({unmatched.reason}).")
+
+                if not suggested_operators:
+                    error_message = NO_VALID_OPERATORS
+                elif from_llm and suggestion_cache:
+                    suggestion_cache.store_result(suggestion_key, [op.name for op in suggested_operators])
 
-            except requests.exceptions.RequestException as req_err:
-                print(f"API request failed: {req_err}")
-                error_message = "Failed to connect to the AI service. Please try again later."
             except ValueError as val_err:  # Catch the new ValueError for missing API key
                 print(f"Configuration error: {val_err}")
                 error_message = "Server configuration error: LLM API Key not set."
@@ -198,26 +321,132 @@ def lineup_suggestor():
     return render_template(
         'lineup_suggestor.html',
         maps=maps,
+        map_sites=get_catalog().map_sites,
         suggested_operators=suggested_operators,
         selected_map_name=selected_map_name,
         selected_site=selected_site,
         selected_side=selected_side,
         is_solo_queue=is_solo_queue,
         situation_description=situation_description,
-        error=error_message
+        error=error_message,
+        notice=notice_message
     )
 
 
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def operator_card(operator):
+    # Everything script.js needs to render a suggested operator card
+    portrait = portrait_path_filter(operator)
+    return {
+        'id': operator.id,
+        'name': operator.name,
+        'url': url_for('main.operator_detail', operator_name_slug=operator.slug),
+        'portrait_url': asset_url(portrait) if asset_exists(portrait) else None,
+    }
+
+
+# Streaming variant of the suggestor: pushes each operator card over server-sent events as soon
+# as Gemini names it, instead of waiting for the whole answer. Used by script.js when available.
+@main.route('/lineup-suggestor/stream', methods=['POST'])
+@rate_limited(too_many_suggestions_stream)
+def lineup_suggestor_stream():
+    selected_map_name = request.form.get('map')
+    selected_site = request.form.get('site')
+    selected_side = request.form.get('side')
+    is_solo_queue = (request.form.get('solo_queue') == 'yes')
+    situation_description = request.form.get('situation')
+
+    if not selected_map_name or not selected_site or not selected_side or not situation_description:
+        body = sse_event('error', {'message': "Please fill in all required fields."}) + sse_event('done', {})
+        return Response(body, status=400, mimetype='text/event-stream')
+
+    events = stream_suggestion_events(get_catalog(), selected_map_name, selected_site, selected_side,
+                                      is_solo_queue, situation_description, current_app.config['LINEUP_MODE'])
+
+    def generate():
+        lineup = []  # the cards sent so far; repeated in the final 'done' event
+        yield ": stream open\n\n"  # flushes headers straight away
+        try:
+            for event, data in events:
+                if event == 'operator':
+                    lineup.append(operator_card(data))
+                    yield sse_event('operator', lineup[-1])
+                elif event == 'done':
+                    yield sse_event('done', {'source': data, 'operators': lineup})
+                else:
+                    yield sse_event(event, {'message': data})
+        except ValueError as val_err:
+            print(f"Configuration error: {val_err}")
+            yield sse_event('error', {'message': "Server configuration error: LLM API Key not set."})
+            yield sse_event('done', {'operators': lineup})
+        except Exception as e:
+            print(f"An unexpected error occurred while streaming suggestions: {e}")
+            yield sse_event('error', {'message': "An unexpected error occurred while getting suggestions."})
+            yield sse_event('done', {'operators': lineup})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@main.route('/api/search-index')
+def search_index():
+    # Prebuilt index for searching in the browser (see SearchIndex.export and static/script.js)
+    try:
+        payload = get_search_index().export()
+    except Exception as e:
+        print(f"Error building the search index: {e}")
+        return jsonify({'error': 'Could not build the search index'}), 500
+    response = cacheable_json(payload)
+    if request.args.get('v') == payload['version']:
+        # A versioned URL always returns the same index; a new catalog version gets a new URL
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+
 @main.route('/api/search')
 def search_operators():
     query = request.args.get('query', '').strip()
+    limit = request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
 
     if not query:
         return jsonify([])
 
     try:
-        results = Operator.query.filter(Operator.name.ilike(f'%{query}%')).all()
-        return jsonify([op.to_dict() for op in results])
+        results = get_search_index().search(query, limit=limit)
+        return jsonify(results)
     except Exception as e:
         print(f"Error during search API call: {e}")
         return jsonify({'error': 'Could not perform search'}), 500
+
+
+# Read API served from the catalog snapshot (fields=, filters, keyset pagination, msgpack; see catalog_api.py)
+@main.route('/api/operators')
+def api_operators():
+    try:
+        return list_response(get_catalog(), 'operators')
+    except Exception as e:
+        print(f"Error during operators API call: {e}")
+        return jsonify({'error': 'Could not list operators'}), 500
+
+
+@main.route('/api/operators/<slug>')
+def api_operator(slug):
+    try:
+        return operator_response(get_catalog(), slug)
+    except Exception as e:
+        print(f"Error during operator API call: {e}")
+        return jsonify({'error': 'Could not fetch the operator'}), 500
+
+
+@main.route('/api/maps')
+def api_maps():
+    try:
+        return list_response(get_catalog(), 'maps')
+    except Exception as e:
+        print(f"Error during maps API call: {e}")
+        return jsonify({'error': 'Could not list maps'}), 500
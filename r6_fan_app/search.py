@@ -0,0 +1,263 @@
+# r6_fan_app/search.py
+
+# In-memory operator search: an inverted index over several operator fields, a trie over the
+# vocabulary for prefix lookups and a trigram index for fuzzy (typo tolerant) matching.
+# The index is built from the cached catalog and updated incrementally when it changes,
+# so /api/search never touches the database. export() publishes the per-operator token
+# weights for /api/search-index, so the operators page can run the same search in the browser.
+
+import heapq
+import threading
+
+from r6_fan_app.catalog import get_catalog
+from r6_fan_app.text_utils import fold, tokenize, slugify
+
+# How much a token found in each field contributes to an operator's score
+FIELD_WEIGHTS = {
+    'name': 10.0,
+    'ability': 4.0,
+    'role': 3.0,
+    'secondary_gadgets': 2.0,
+    'short_bio': 1.0,
+}
+
+# Score multipliers for the different ways a query token can match a vocabulary token
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.6
+FUZZY_MATCH = 0.4
+
+# Minimum trigram similarity for a fuzzy match to count
+FUZZY_THRESHOLD = 0.35
+
+# Added when the whole query is (the start of) an operator's name
+EXACT_NAME_BOOST = 50.0
+PREFIX_NAME_BOOST = 20.0
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+
+def trigrams(token):
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def name_aliases(name):
+    # The accent-folded name, plus the same without spaces or punctuation when that differs
+    # ("Mute Jr." -> 'mute jr.', 'mutejr'), so either spelling gets the name boost
+    folded = fold(name).strip()
+    compact = ''.join(tokenize(name))
+    return (folded,) if compact == folded else (folded, compact)
+
+
+class Trie:
+    def __init__(self):
+        self.root = {}
+
+    def add(self, word):
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node['$'] = True
+
+    def discard(self, word):
+        # Walk down remembering the path, then prune empty branches on the way back up
+        path = []
+        node = self.root
+        for ch in word:
+            if ch not in node:
+                return
+            path.append((node, ch))
+            node = node[ch]
+        node.pop('$', None)
+        for parent, ch in reversed(path):
+            if parent[ch]:
+                break
+            del parent[ch]
+
+    def completions(self, prefix):
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        words = []
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            for ch, child in node.items():
+                if ch == '$':
+                    words.append(word)
+                else:
+                    stack.append((child, word + ch))
+        return words
+
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self.postings = {}  # token -> {operator id: weighted score}
+        self.doc_tokens = {}  # operator id -> {token: weighted score}, kept for incremental removal
+        self.doc_signatures = {}  # operator id -> tuple of indexed field values
+        self.docs = {}  # operator id -> compact result payload
+        self.folded_names = {}  # operator id -> accent-folded name and its aliases
+        self.trie = Trie()
+        self.trigram_index = {}  # trigram -> set of vocabulary tokens
+        self._export = None  # export() result for the current snapshot
+
+    # --- Building ---
+
+    def sync(self, snapshot):
+        # Cheap identity check; only rebuild when the catalog cache swapped in a new snapshot
+        if snapshot is self._snapshot:
+            return
+        with self._lock:
+            if snapshot is not self._snapshot:
+                self._update(snapshot.operators)
+                self._snapshot = snapshot
+                self._export = None
+
+    def _update(self, operators):
+        seen = set()
+        for op in operators:
+            seen.add(op.id)
+            signature = tuple(getattr(op, field) for field in FIELD_WEIGHTS) + (op.side,)
+            if self.doc_signatures.get(op.id) == signature:
+                continue
+            self._remove_doc(op.id)
+            self._add_doc(op, signature)
+
+        for op_id in list(self.doc_signatures):
+            if op_id not in seen:
+                self._remove_doc(op_id)
+
+    def _add_doc(self, op, signature):
+        tokens = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(op, field)):
+                tokens[token] = tokens.get(token, 0.0) + weight
+
+        for token, score in tokens.items():
+            if token not in self.postings:
+                self.postings[token] = {}
+                self.trie.add(token)
+                for gram in trigrams(token):
+                    self.trigram_index.setdefault(gram, set()).add(token)
+            self.postings[token][op.id] = score
+
+        self.doc_tokens[op.id] = tokens
+        self.doc_signatures[op.id] = signature
+        self.folded_names[op.id] = name_aliases(op.name)
+        self.docs[op.id] = {
+            'id': op.id,
+            'name': op.name,
+            'slug': slugify(op.name),
+            'side': op.side,
+            'role': op.role,
+        }
+
+    def _remove_doc(self, op_id):
+        for token in self.doc_tokens.pop(op_id, {}):
+            docs = self.postings.get(token)
+            if docs is None:
+                continue
+            docs.pop(op_id, None)
+            if not docs:
+                # Token no longer used by any operator: drop it from the vocabulary too
+                del self.postings[token]
+                self.trie.discard(token)
+                for gram in trigrams(token):
+                    grams = self.trigram_index.get(gram)
+                    if grams is not None:
+                        grams.discard(token)
+                        if not grams:
+                            del self.trigram_index[gram]
+        self.doc_signatures.pop(op_id, None)
+        self.docs.pop(op_id, None)
+        self.folded_names.pop(op_id, None)
+
+    # --- Querying ---
+
+    def _matching_terms(self, token):
+        # Returns {vocabulary token: multiplier} for one query token
+        terms = {}
+        for word in self.trie.completions(token):
+            terms[word] = EXACT_MATCH if word == token else PREFIX_MATCH
+
+        if len(token) >= 3:
+            query_grams = trigrams(token)
+            shared = {}
+            for gram in query_grams:
+                for word in self.trigram_index.get(gram, ()):
+                    shared[word] = shared.get(word, 0) + 1
+            for word, count in shared.items():
+                similarity = count / (len(query_grams) + len(trigrams(word)) - count)
+                if similarity >= FUZZY_THRESHOLD:
+                    terms[word] = max(terms.get(word, 0.0), FUZZY_MATCH * similarity)
+        return terms
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            scores = {}
+            matched = {}
+            for token in query_tokens:
+                token_scores = {}
+                for word, multiplier in self._matching_terms(token).items():
+                    for op_id, weight in self.postings[word].items():
+                        token_scores[op_id] = max(token_scores.get(op_id, 0.0), weight * multiplier)
+                for op_id, score in token_scores.items():
+                    scores[op_id] = scores.get(op_id, 0.0) + score
+                    matched[op_id] = matched.get(op_id, 0) + 1
+
+            # Boost operators whose name matches the whole query
+            folded_query = fold(query).strip()
+            for op_id in scores:
+                names = self.folded_names[op_id]
+                if folded_query in names:
+                    scores[op_id] += EXACT_NAME_BOOST
+                elif any(name.startswith(folded_query) for name in names):
+                    scores[op_id] += PREFIX_NAME_BOOST
+
+            # Operators matching every query token rank above partial matches
+            top = heapq.nlargest(limit, scores, key=lambda op_id: (matched[op_id], scores[op_id]))
+            return [dict(self.docs[op_id], score=round(scores[op_id], 3)) for op_id in top]
+
+    # --- Publishing ---
+
+    def export(self):
+        # Compact index for client-side search: each operator's weighted tokens plus the scoring
+        # constants, so static/script.js ranks exactly like search(). Built once per snapshot.
+        with self._lock:
+            if self._export is None:
+                snapshot = self._snapshot
+                self._export = {
+                    'version': snapshot.version or f"loaded-{snapshot.loaded_at}",
+                    'scoring': {
+                        'exact': EXACT_MATCH,
+                        'prefix': PREFIX_MATCH,
+                        'fuzzy': FUZZY_MATCH,
+                        'fuzzy_threshold': FUZZY_THRESHOLD,
+                        'exact_name_boost': EXACT_NAME_BOOST,
+                        'prefix_name_boost': PREFIX_NAME_BOOST,
+                    },
+                    'operators': [
+                        dict(self.docs[op.id], names=list(self.folded_names[op.id]),
+                             tokens=self.doc_tokens[op.id])
+                        for op in snapshot.operators
+                    ],
+                }
+            return self._export
+
+
+# One index per worker process, kept in step with the catalog cache
+search_index = SearchIndex()
+
+
+def get_search_index():
+    search_index.sync(get_catalog())
+    return search_index
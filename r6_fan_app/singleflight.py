@@ -0,0 +1,71 @@
+# r6_fan_app/singleflight.py
+
+# Coalesces concurrent identical work: the first caller for a key (the leader) does it, and
+# callers that arrive while it is still running (followers) wait for its result instead of
+# starting their own. Used so a double-click or several players submitting the same suggestor
+# form at once make one Gemini call. Flights are per worker process; the Procfile runs one
+# worker with threads, and answers are shared across workers afterwards by the suggestion cache.
+
+import threading
+
+
+class FlightTimeoutError(Exception):
+    pass
+
+
+class Flight:
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def wait(self, timeout):
+        # The leader's result, or its exception re-raised
+        if not self._done.wait(timeout):
+            raise FlightTimeoutError(f"No result after {timeout}s.")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}  # key -> Flight
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def begin(self, key):
+        # Returns (flight, True) for the leader, who must call finish(); (flight, False) to wait on
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.followers += 1
+                return flight, False
+            flight = self._flights[key] = Flight()
+            self.leaders += 1
+            return flight, True
+
+    def finish(self, key, flight, result=None, error=None):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight._result = result
+        flight._error = error
+        flight._done.set()
+
+    def do(self, key, function, timeout):
+        # Runs function() once for all concurrent callers with the same key
+        flight, leader = self.begin(key)
+        if not leader:
+            return flight.wait(timeout)
+        try:
+            result = function()
+        except Exception as e:
+            self.finish(key, flight, error=e)
+            raise
+        self.finish(key, flight, result=result)
+        return result
+
+    def stats(self):
+        return {'leaders': self.leaders, 'followers': self.followers, 'in_flight': len(self._flights)}
@@ -20,9 +20,202 @@ document.addEventListener('DOMContentLoaded', function() {
 
     console.log(`JS Loaded. Current Page: ${getCurrentPagePath()}`); // Debugging log
 
+    // --- Client-Side Operator Search (ONLY used on /operators page) ---
+    // The operators page preloads a prebuilt index (<link data-search-index>, served by
+    // /api/search-index) and ranks operators right here with the same scoring as /api/search,
+    // so filtering needs no request per keystroke. If the index can't be loaded the page falls
+    // back to /api/search: debounced while typing, and aborted as soon as a newer query replaces it.
+    const SEARCH_RESULT_LIMIT = 50; // Every match, not just the top few
+    const SEARCH_DEBOUNCE_MS = 250; // Pause in typing before asking the server (fallback only)
+    const searchIndexLink = document.querySelector('link[data-search-index]');
+    let searchIndexPromise = null;
+    let searchGeneration = 0; // Bumped for every query; results of older queries are dropped
+    let searchDebounceTimer = null;
+    let searchAbortController = null;
+
+    // Same as fold() and tokenize() in text_utils.py: lowercase, accents stripped ("Jäger" -> "jager")
+    function foldText(text) {
+        return (text || '').normalize('NFKD').replace(/\p{M}/gu, '').toLowerCase();
+    }
+
+    function tokenizeText(text) {
+        return foldText(text).match(/[a-z0-9]+/g) || [];
+    }
+
+    function trigramsOf(token) {
+        const padded = `  ${token} `;
+        const grams = new Set();
+        for (let i = 0; i < padded.length - 2; i++) {
+            grams.add(padded.slice(i, i + 3));
+        }
+        return grams;
+    }
+
+    function prepareSearchIndex(data) {
+        // token -> [[operator, weight], ...], and trigram -> vocabulary tokens for fuzzy matching
+        const postings = new Map();
+        const trigramIndex = new Map();
+        data.operators.forEach(op => {
+            Object.entries(op.tokens).forEach(([token, weight]) => {
+                if (!postings.has(token)) {
+                    postings.set(token, []);
+                    trigramsOf(token).forEach(gram => {
+                        if (!trigramIndex.has(gram)) {
+                            trigramIndex.set(gram, []);
+                        }
+                        trigramIndex.get(gram).push(token);
+                    });
+                }
+                postings.get(token).push([op, weight]);
+            });
+        });
+        return { scoring: data.scoring, postings: postings, trigramIndex: trigramIndex, vocabulary: [...postings.keys()] };
+    }
+
+    function loadSearchIndex() {
+        // Resolves to the prepared index, or to null when the page has none or it failed to load.
+        // Fetched once per page; the request is answered from the preload.
+        if (!searchIndexPromise) {
+            if (!searchIndexLink) {
+                searchIndexPromise = Promise.resolve(null);
+            } else {
+                searchIndexPromise = fetch(searchIndexLink.href)
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error(`HTTP error! status: ${response.status}`);
+                        }
+                        return response.json();
+                    })
+                    .then(prepareSearchIndex)
+                    .catch(error => {
+                        console.warn('Search index unavailable, searching through the API instead:', error); // Debugging log
+                        return null;
+                    });
+            }
+        }
+        return searchIndexPromise;
+    }
+
+    function matchingTerms(index, token) {
+        // Mirrors SearchIndex._matching_terms: {vocabulary token: multiplier} for one query token.
+        // The vocabulary is a few hundred tokens, so prefixes are found with a plain scan.
+        const scoring = index.scoring;
+        const terms = new Map();
+        index.vocabulary.forEach(word => {
+            if (word.startsWith(token)) {
+                terms.set(word, word === token ? scoring.exact : scoring.prefix);
+            }
+        });
+
+        if (token.length >= 3) {
+            const queryGrams = trigramsOf(token);
+            const shared = new Map();
+            queryGrams.forEach(gram => {
+                (index.trigramIndex.get(gram) || []).forEach(word => {
+                    shared.set(word, (shared.get(word) || 0) + 1);
+                });
+            });
+            shared.forEach((count, word) => {
+                const similarity = count / (queryGrams.size + trigramsOf(word).size - count);
+                if (similarity >= scoring.fuzzy_threshold) {
+                    terms.set(word, Math.max(terms.get(word) || 0, scoring.fuzzy * similarity));
+                }
+            });
+        }
+        return terms;
+    }
+
+    function searchLocally(index, query) {
+        // Mirrors SearchIndex.search; returns the names of the matching operators, best first
+        const scores = new Map();
+        const matched = new Map();
+        tokenizeText(query).forEach(token => {
+            const tokenScores = new Map();
+            matchingTerms(index, token).forEach((multiplier, word) => {
+                index.postings.get(word).forEach(([op, weight]) => {
+                    tokenScores.set(op, Math.max(tokenScores.get(op) || 0, weight * multiplier));
+                });
+            });
+            tokenScores.forEach((score, op) => {
+                scores.set(op, (scores.get(op) || 0) + score);
+                matched.set(op, (matched.get(op) || 0) + 1);
+            });
+        });
+
+        // Boost operators whose name matches the whole query
+        const foldedQuery = foldText(query).trim();
+        scores.forEach((score, op) => {
+            if (op.names.includes(foldedQuery)) {
+                scores.set(op, score + index.scoring.exact_name_boost);
+            } else if (op.names.some(name => name.startsWith(foldedQuery))) {
+                scores.set(op, score + index.scoring.prefix_name_boost);
+            }
+        });
+
+        // Operators matching every query token rank above partial matches
+        return [...scores.keys()]
+            .sort((a, b) => (matched.get(b) - matched.get(a)) || (scores.get(b) - scores.get(a)))
+            .slice(0, SEARCH_RESULT_LIMIT)
+            .map(op => op.name);
+    }
+
+    function showSearchResults(names) {
+        // Shows only the named operators (both sides) and the result count
+        console.log(`Showing ${names.length} search results:`, names); // Debugging log
+        const matchingOperatorNames = new Set(names);
+        const localAttackList = document.getElementById('attack-operators');
+        const localDefenseList = document.getElementById('defense-operators');
+        document.querySelectorAll('.operator-item').forEach(item => {
+            if (matchingOperatorNames.has(item.getAttribute('data-operator-name'))) {
+                item.style.display = 'block'; // Show matching item
+                // Ensure parent lists are visible when showing search results
+                // This is important if the lists were hidden by the toggle buttons
+                if (localAttackList) localAttackList.style.display = 'block';
+                if (localDefenseList) localDefenseList.style.display = 'block';
+            } else {
+                item.style.display = 'none'; // Hide non-matching item
+            }
+        });
+
+        // Update search results count display ("0" when nothing matched)
+        const searchCountSpan = document.getElementById('search-count');
+        const searchResultsInfoDiv = document.querySelector('.search-results-info');
+        if (searchCountSpan && searchResultsInfoDiv) {
+            searchCountSpan.textContent = names.length;
+            searchResultsInfoDiv.style.display = 'block'; // Show the message div
+        }
+    }
+
+    function fetchSearchResults(query, generation) {
+        // Fallback when there's no index: ask /api/search, cancelling the previous request
+        searchAbortController = new AbortController();
+        fetch(`/api/search?query=${encodeURIComponent(query)}&limit=${SEARCH_RESULT_LIMIT}`,
+              { signal: searchAbortController.signal })
+            .then(response => {
+                console.log(`Fetch response status: ${response.status}`); // Debugging log
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(results => {
+                if (generation === searchGeneration) {
+                    showSearchResults(results.map(op => op.name));
+                }
+            })
+            .catch(error => {
+                if (error.name === 'AbortError' || generation !== searchGeneration) {
+                    return; // Replaced by a newer query
+                }
+                console.error('Error during search:', error); // Debugging log
+                alert("Could not perform search. Please try again.");
+                filterOperators(''); // Clear search on error
+            });
+    }
+
     // --- Function to Filter/Display Operators (ONLY used on /operators page) ---
-    // Define this function at a scope accessible by both initial load and search listeners
-    function filterOperators(query) {
+    // `immediate` is false while the user is still typing: the API fallback then waits for a pause.
+    function filterOperators(query, immediate = true) {
         console.log(`filterOperators called with query: "${query}"`); // Debugging log
         // This function assumes it is ONLY called when on the /operators page
         if (getCurrentPagePath() !== '/operators') {
@@ -30,116 +223,53 @@ document.addEventListener('DOMContentLoaded', function() {
              return;
         }
 
-        // Re-query elements inside the function just to be safe, though they should be in scope
-        const localOperatorFilterDiv = document.querySelector('.operator-filter');
-        const localAttackList = document.getElementById('attack-operators');
-        const localDefenseList = document.getElementById('defense-operators');
-        const localAllOperatorItems = document.querySelectorAll('.operator-item');
+        // Whatever the previous query was still doing is no longer wanted
+        const generation = ++searchGeneration;
+        clearTimeout(searchDebounceTimer);
+        if (searchAbortController) {
+            searchAbortController.abort();
+            searchAbortController = null;
+        }
 
+        const localOperatorFilterDiv = document.querySelector('.operator-filter');
 
         if (!query || query.trim() === '') {
             // --- If query is empty (search cleared on /operators page) ---
-            console.log("filterOperators: Query is empty. Showing all items."); // Debugging log
-            // Show all operator items
-            localAllOperatorItems.forEach(item => {
+            // Show all operator items and the filter buttons
+            document.querySelectorAll('.operator-item').forEach(item => {
                 item.style.display = 'block';
             });
-
-            // Show the filter buttons
             if (localOperatorFilterDiv) {
                 localOperatorFilterDiv.style.display = 'block';
             }
 
-            // --- REMOVED: Lines that incorrectly reset attackList/defenseList display ---
-            // if (localAttackList && localDefenseList) {
-            //     localAttackList.style.display = 'block';
-            //     localDefenseList.style.display = 'none';
-            // }
-
-             // Hide search results info when search is cleared
-             const searchResultsInfoDiv = document.querySelector('.search-results-info');
-             if (searchResultsInfoDiv) {
-                  searchResultsInfoDiv.style.display = 'none';
-             }
-
+            // Hide search results info when search is cleared
+            const searchResultsInfoDiv = document.querySelector('.search-results-info');
+            if (searchResultsInfoDiv) {
+                searchResultsInfoDiv.style.display = 'none';
+            }
 
             console.log("Search cleared on Operators page, showing all operators and filters."); // Debugging log
             return;
         }
 
         // --- If query is NOT empty (performing search on /operators page) ---
-        console.log(`filterOperators: Query is NOT empty. Fetching results for "${query}"`); // Debugging log
         // Hide the filter buttons
         if (localOperatorFilterDiv) {
             localOperatorFilterDiv.style.display = 'none';
         }
-        console.log("Search active on Operators page, hiding filter buttons."); // Debugging log
-
-        // Send search query to the backend API
-        fetch(`/api/search?query=${encodeURIComponent(query)}`)
-            .then(response => {
-                console.log(`Fetch response status: ${response.status}`); // Debugging log
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}`);
-                }
-                return response.json();
-            })
-            .then(results => {
-                console.log("Search API results:", results); // Debugging log
-                console.log(`Number of results: ${results.length}`); // Debugging log
-
-                const matchingOperatorNames = new Set(results.map(op => op.name));
-                console.log("Matching operator names from API:", matchingOperatorNames); // Debugging log
-
-                // Only process operator items if they exist (which they should on /operators)
-                console.log(`Total operator items found on page: ${localAllOperatorItems.length}`); // Debugging log
-                if (localAllOperatorItems.length > 0) {
-                    localAllOperatorItems.forEach(item => {
-                        const operatorName = item.getAttribute('data-operator-name');
-                        // console.log(`Checking item: ${operatorName}`); // Optional: log every item check
-                        if (matchingOperatorNames.has(operatorName)) {
-                            console.log(`Showing item: ${operatorName}`); // Debugging log
-                            item.style.display = 'block'; // Show matching item
-                            // Ensure parent lists are visible when showing search results
-                            // This is important if the lists were hidden by the toggle buttons
-                            if (localAttackList) localAttackList.style.display = 'block';
-                            if (localDefenseList) localDefenseList.style.display = 'block';
-                        } else {
-                            // console.log(`Hiding item: ${operatorName}`); // Optional: log every hidden item
-                            item.style.display = 'none'; // Hide non-matching item
-                        }
-                    });
-
-                    // Optional: Update search results count display
-                     const searchCountSpan = document.getElementById('search-count');
-                     const searchResultsInfoDiv = document.querySelector('.search-results-info');
-                     if (searchCountSpan && searchResultsInfoDiv) {
-                          searchCountSpan.textContent = results.length;
-                          searchResultsInfoDiv.style.display = 'block'; // Show the message div
-                     }
-
 
-                } else {
-                    console.warn("No operator items found on /operators page during filtering?"); // Debugging log
-                }
-
-                if (results.length === 0) {
-                     console.log("No operators found matching the search."); // Debugging log
-                     // Display "No results" message
-                     const searchCountSpan = document.getElementById('search-count');
-                     const searchResultsInfoDiv = document.querySelector('.search-results-info');
-                     if (searchCountSpan && searchResultsInfoDiv) {
-                          searchCountSpan.textContent = "0"; // Set count to 0
-                          searchResultsInfoDiv.style.display = 'block'; // Show the message div
-                     }
-                }
-            })
-            .catch(error => {
-                console.error('Error during search:', error); // Debugging log
-                alert("Could not perform search. Please try again.");
-                // Decide what to show on error - maybe show all or clear results
-                filterOperators(''); // Clear search on error
-            });
+        loadSearchIndex().then(index => {
+            if (generation !== searchGeneration) {
+                return; // A newer query came in while the index was loading
+            }
+            if (index) {
+                showSearchResults(searchLocally(index, query));
+                return;
+            }
+            searchDebounceTimer = setTimeout(() => fetchSearchResults(query, generation),
+                                             immediate ? 0 : SEARCH_DEBOUNCE_MS);
+        });
     }
 
     // --- Function to Handle Search (Global) ---
@@ -257,16 +387,136 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
 
-        // --- Input Listener to Clear Search ---
+        // --- Input Listener: Filter While Typing / Clear Search ---
          searchInput.addEventListener('input', function() {
              console.log("Search input value changed."); // Debugging log
              if (searchInput.value.trim() === '') {
                  // If input is cleared, handle search with an empty query
                  console.log("Search input cleared."); // Debugging log
                  handleSearch('');
+             } else if (getCurrentPagePath() === '/operators') {
+                 // On the operators page, filter as the user types (other pages wait for Enter)
+                 filterOperators(searchInput.value.trim(), false);
              }
          });
     } else {
         console.log("Global search elements not found on this page."); // Debugging log
     }
+
+
+    // --- Lineup Suggestor: Streamed Suggestions (Progressive Enhancement) ---
+    // When the browser can read a streamed fetch() body, submit the form to the streaming endpoint
+    // and render each operator card as soon as the server sends it. Otherwise (or if the stream
+    // can't be opened) the form is submitted normally and the page renders server-side.
+    const lineupForm = document.getElementById('lineup-form');
+    const streamedSuggestions = document.getElementById('streamed-suggestions');
+
+    function renderOperatorCard(container, card) {
+        const item = document.createElement('div');
+        item.className = 'operator-item';
+        const link = document.createElement('a');
+        link.href = card.url;
+        // Same markup as the server-rendered card, including the placeholder when there's no portrait
+        const portrait = document.createElement(card.portrait_url ? 'img' : 'div');
+        if (card.portrait_url) {
+            portrait.src = card.portrait_url;
+            portrait.alt = `${card.name} Portrait`;
+            portrait.className = 'operator-portrait';
+        } else {
+            portrait.setAttribute('role', 'img');
+            portrait.setAttribute('aria-label', `${card.name} Portrait`);
+            portrait.className = 'operator-portrait operator-portrait-missing';
+        }
+        const nameArea = document.createElement('div');
+        nameArea.className = 'operator-name-area';
+        const heading = document.createElement('h3');
+        heading.textContent = card.name;
+        nameArea.appendChild(heading);
+        link.appendChild(portrait);
+        link.appendChild(nameArea);
+        item.appendChild(link);
+        container.appendChild(item);
+    }
+
+    // Parses "event: x\ndata: {...}\n\n" blocks out of the buffer, returning the unparsed rest
+    function consumeSseEvents(buffer, onEvent) {
+        const blocks = buffer.split('\n\n');
+        const rest = blocks.pop();
+        blocks.forEach(block => {
+            let eventName = 'message';
+            let data = '';
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (data) onEvent(eventName, JSON.parse(data));
+        });
+        return rest;
+    }
+
+    if (lineupForm && streamedSuggestions && window.fetch && window.ReadableStream && window.TextDecoder) {
+        lineupForm.addEventListener('submit', function(event) {
+            event.preventDefault();
+            const submitButton = lineupForm.querySelector('button[type="submit"]');
+            const statusLine = streamedSuggestions.querySelector('.stream-status');
+            const cardList = streamedSuggestions.querySelector('.suggested-operators-list');
+            let receivedAnything = false;
+
+            cardList.innerHTML = '';
+            statusLine.textContent = 'Getting suggestions...';
+            statusLine.style.color = '';
+            streamedSuggestions.style.display = 'block';
+            if (submitButton) submitButton.disabled = true;
+
+            // Hide results from a previous server-rendered submission
+            document.querySelectorAll('.suggested-operators-list').forEach(list => {
+                if (!streamedSuggestions.contains(list)) {
+                    const heading = list.previousElementSibling;
+                    if (heading && heading.tagName === 'H2') heading.remove();
+                    list.remove();
+                }
+            });
+
+            fetch(lineupForm.dataset.streamUrl, { method: 'POST', body: new FormData(lineupForm) })
+                .then(response => {
+                    if (!response.body) throw new Error('Streaming not supported');
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+
+                    function handleEvent(eventName, data) {
+                        receivedAnything = true;
+                        if (eventName === 'operator') {
+                            renderOperatorCard(cardList, data);
+                        } else if (eventName === 'notice') {
+                            statusLine.textContent = data.message;
+                            statusLine.style.color = 'orange';
+                        } else if (eventName === 'error') {
+                            statusLine.textContent = data.message;
+                            statusLine.style.color = 'red';
+                        } else if (eventName === 'done' && statusLine.textContent === 'Getting suggestions...') {
+                            statusLine.textContent = '';
+                        }
+                    }
+
+                    function pump() {
+                        return reader.read().then(({ done, value }) => {
+                            if (done) return;
+                            buffer = consumeSseEvents(buffer + decoder.decode(value, { stream: true }), handleEvent);
+                            return pump();
+                        });
+                    }
+                    return pump();
+                })
+                .catch(error => {
+                    console.error('Streaming suggestions failed:', error);
+                    if (!receivedAnything) {
+                        lineupForm.submit(); // fall back to the regular, server-rendered submission
+                    }
+                })
+                .finally(() => {
+                    if (submitButton) submitButton.disabled = false;
+                });
+        });
+    }
 });
@@ -0,0 +1,235 @@
+# r6_fan_app/suggestion_cache.py
+
+# Cache for lineup suggestions, keyed on a canonical form of the suggestor form:
+# map, site, side, solo flag and the situation text (case/accent/whitespace normalised).
+# Near-identical situations (same words in a different order, one extra word, ...) can also
+# reuse an answer through token-set similarity.
+#
+# The default backend is a SQLite file so every gunicorn worker on the machine shares it;
+# an in-process LRU backend is available for single-process runs.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from flask import current_app
+
+from r6_fan_app.text_utils import fold, tokenize
+
+
+@dataclass(frozen=True)
+class SuggestionKey:
+    scope: str  # map|site|side|solo, only entries in the same scope are ever compared
+    situation: str  # normalised situation text
+    tokens: frozenset
+    key: str  # hash of scope + situation, the exact-match key
+
+
+def make_suggestion_key(map_name, site, side, is_solo, situation):
+    scope = '|'.join([fold(map_name).strip(), fold(site).strip(), fold(side).strip(), 'solo' if is_solo else 'team'])
+    normalised = ' '.join(fold(situation).split()).strip(' .!?')
+    key = hashlib.sha1(f"{scope}\n{normalised}".encode('utf-8')).hexdigest()
+    return SuggestionKey(scope=scope, situation=normalised, tokens=frozenset(tokenize(normalised)), key=key)
+
+
+def token_similarity(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MemorySuggestionStore:
+    # Per-process LRU with TTL
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (scope, tokens, value, created_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[3] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def find_similar(self, scope, tokens, threshold):
+        now = time.time()
+        best_key, best_score = None, 0.0
+        with self._lock:
+            for key, (entry_scope, entry_tokens, _, created_at) in self._entries.items():
+                if entry_scope != scope or now - created_at > self.ttl:
+                    continue
+                score = token_similarity(tokens, entry_tokens)
+                if score >= threshold and score > best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][2]
+
+    def set(self, key, scope, tokens, value):
+        with self._lock:
+            self._entries[key] = (scope, tokens, value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteSuggestionStore:
+    # Shared across worker processes through a single SQLite file (WAL mode)
+
+    # How many recent entries in the same scope are compared for a similarity match
+    SIMILARITY_CANDIDATES = 200
+
+    def __init__(self, path, ttl, max_entries):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestions ("
+                " key TEXT PRIMARY KEY, scope TEXT NOT NULL, tokens TEXT NOT NULL,"
+                " value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS suggestions_scope ON suggestions (scope, accessed_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS suggestions_accessed ON suggestions (accessed_at)")
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM suggestions WHERE key = ? AND created_at > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE suggestions SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+
+    def find_similar(self, scope, tokens, threshold):
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, tokens, value FROM suggestions WHERE scope = ? AND created_at > ?"
+                " ORDER BY accessed_at DESC LIMIT ?",
+                (scope, now - self.ttl, self.SIMILARITY_CANDIDATES),
+            ).fetchall()
+            best, best_score = None, 0.0
+            for key, entry_tokens, value in rows:
+                score = token_similarity(tokens, frozenset(json.loads(entry_tokens)))
+                if score >= threshold and score > best_score:
+                    best, best_score = (key, value), score
+            if best is None:
+                return None
+            conn.execute("UPDATE suggestions SET accessed_at = ? WHERE key = ?", (now, best[0]))
+            return json.loads(best[1])
+
+    def set(self, key, scope, tokens, value):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestions (key, scope, tokens, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, scope, json.dumps(sorted(tokens)), json.dumps(value), now, now),
+            )
+            # Drop expired entries, then the least recently used ones beyond the size bound
+            conn.execute("DELETE FROM suggestions WHERE created_at <= ?", (now - self.ttl,))
+            conn.execute(
+                "DELETE FROM suggestions WHERE key IN ("
+                " SELECT key FROM suggestions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+class SuggestionCache:
+    def __init__(self, store, similarity_threshold=0.9):
+        self.store = store
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def lookup(self, suggestion_key):
+        # Returns the cached list of operator names, or None
+        try:
+            value = self.store.get(suggestion_key.key)
+            if value is not None:
+                self.hits += 1
+                return value
+            if self.similarity_threshold < 1.0:
+                value = self.store.find_similar(suggestion_key.scope, suggestion_key.tokens,
+                                                self.similarity_threshold)
+                if value is not None:
+                    self.near_hits += 1
+                    return value
+        except Exception as e:
+            # A broken cache must never break the suggestor
+            self.errors += 1
+            print(f"Suggestion cache lookup failed: {e}")
+        self.misses += 1
+        return None
+
+    def store_result(self, suggestion_key, operator_names):
+        try:
+            self.store.set(suggestion_key.key, suggestion_key.scope, suggestion_key.tokens, list(operator_names))
+        except Exception as e:
+            self.errors += 1
+            print(f"Suggestion cache write failed: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            'hits': self.hits,
+            'near_hits': self.near_hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': (self.hits + self.near_hits) / lookups if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_suggestion_cache():
+    # Created lazily, once per worker process. Returns None when caching is disabled.
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = current_app.config
+                backend = config['SUGGESTION_CACHE_BACKEND']
+                ttl = config['SUGGESTION_CACHE_TTL']
+                max_entries = config['SUGGESTION_CACHE_MAX_ENTRIES']
+                if backend == 'none':
+                    return None
+                if backend == 'memory':
+                    store = MemorySuggestionStore(ttl, max_entries)
+                else:
+                    path = config['SUGGESTION_CACHE_PATH']
+                    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                    store = SQLiteSuggestionStore(path, ttl, max_entries)
+                _cache = SuggestionCache(store, config['SUGGESTION_CACHE_SIMILARITY'])
+    return _cache
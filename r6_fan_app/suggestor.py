@@ -0,0 +1,273 @@
+# r6_fan_app/suggestor.py
+
+# Lineup suggestion flow shared by the suggestor page and its streaming endpoint:
+# building the Gemini request, and turning a (possibly streamed) LLM answer into catalog
+# operators, with the suggestion cache in front and the lineup engine as a fallback.
+#
+# Gemini is called in JSON mode with a responseSchema whose only allowed values are the names of
+# the chosen side's operators, and the prompt carries one line of context per operator, so the
+# reply is a list of exactly five catalog names rather than prose to pick apart. The reply is
+# still validated; slots left empty by a bad name are filled by the lineup engine instead of
+# sending the player back for another (slow, paid) round trip. Identical requests that arrive
+# while a suggestion is being fetched wait for that call instead of making their own.
+
+import json
+
+from flask import current_app
+
+from r6_fan_app.lineup_engine import get_lineup_engine, TEAM_SIZE
+from r6_fan_app.llm import get_llm_client, LLMError, LLMResponseError, LLMTimeoutError, StreamingJsonNameParser
+from r6_fan_app.metrics import record_coalesced, record_lineup_reply
+from r6_fan_app.singleflight import FlightTimeoutError, SingleFlight
+from r6_fan_app.suggestion_cache import get_suggestion_cache, make_suggestion_key
+
+FALLBACK_NOTICE = ("The AI service is unavailable right now, so these suggestions come from "
+                   "our built-in lineup engine.")
+NO_VALID_OPERATORS = "The AI could not suggest valid operators from our database. Please try a different situation."
+
+# In-flight Gemini lineups by suggestion key; the result is the list of suggested operator names
+suggestion_flights = SingleFlight()
+
+
+def wait_for_flight(flight, method):
+    # A follower waits at most as long as the leader's call may take, then gives up like a timed out call
+    record_coalesced(method)
+    config = current_app.config
+    try:
+        return flight.wait(config['LLM_QUEUE_TIMEOUT'] + config['LLM_TOTAL_TIMEOUT'] + 1.0)
+    except FlightTimeoutError as e:
+        raise LLMTimeoutError(f"Waiting for an identical suggestion: {e}") from e
+
+
+def side_operators(catalog, side):
+    return catalog.attackers if side == 'Attacker' else catalog.defenders
+
+
+def lineup_generation_config(operators):
+    # JSON mode: {"operators": [five distinct names from the enum]}
+    return {
+        'responseMimeType': 'application/json',
+        'responseSchema': {
+            'type': 'OBJECT',
+            'properties': {
+                'operators': {
+                    'type': 'ARRAY',
+                    'items': {'type': 'STRING', 'format': 'enum', 'enum': [op.name for op in operators]},
+                    'minItems': TEAM_SIZE,
+                    'maxItems': TEAM_SIZE,
+                },
+            },
+            'required': ['operators'],
+        },
+    }
+
+
+def operator_context(operators):
+    # One short line per operator the model may choose, e.g. "- Thermite: Hard Breacher; Exothermic Charge"
+    lines = []
+    for op in operators:
+        details = [op.role, op.ability, 'solo friendly' if op.solo_friendly else None]
+        lines.append(f"- {op.name}: {'; '.join(detail for detail in details if detail)}")
+    return '\n'.join(lines)
+
+
+def build_suggestion_prompt(map_name, site, side, is_solo_queue, situation, candidates=(), operators=()):
+    prompt = f"""
+        You are an expert Rainbow Six Siege strategist.
+        Given the following situation, suggest {TEAM_SIZE} different operators that would be ideal for the team.
+        Prioritize operators that directly address the situation and work well together.
+        If playing solo, suggest operators that are more self-sufficient.
+
+        Map: {map_name}
+        Site: {site}
+        Side: {side}
+        Playing: {'Solo Queue' if is_solo_queue else 'With a Team'}
+        Situation: {situation}
+        Strong candidates for this situation: {', '.join(candidates)}
+
+        Operators to choose from:
+{operator_context(operators)}
+        """
+    return prompt
+
+
+def parse_lineup_reply(text, operators):
+    # Returns (names, problems): the distinct allowed names in the reply, in order, and what was
+    # wrong with it. Raises LLMResponseError when the reply isn't the JSON object we asked for.
+    try:
+        document = json.loads(text)
+    except ValueError as e:
+        raise LLMResponseError(f"LLM reply is not valid JSON: {e}") from e
+    suggested = document.get('operators') if isinstance(document, dict) else None
+    if not isinstance(suggested, list):
+        raise LLMResponseError("LLM reply has no operators list.")
+
+    allowed = {op.name for op in operators}
+    names = []
+    problems = []
+    for name in suggested:
+        if name not in allowed:
+            problems.append(f"{name!r} is not one of the side's operators")
+        elif name in names:
+            problems.append(f"{name} suggested twice")
+        else:
+            names.append(name)
+    if len(names) < TEAM_SIZE:
+        problems.append(f"only {len(names)} usable names")
+    return names[:TEAM_SIZE], problems
+
+
+def engine_fill(engine, side, selected_map, is_solo_queue, situation, chosen):
+    # The lineup engine's picks that aren't in `chosen`, for filling it up to TEAM_SIZE
+    missing = TEAM_SIZE - len(chosen)
+    if missing <= 0:
+        return []
+    extra = [op for op in engine.suggest(side, selected_map, is_solo_queue, situation).operators if op not in chosen]
+    return extra[:missing]
+
+
+def request_llm_suggestion(catalog, map_name, site, side, is_solo_queue, situation, candidates=()):
+    # Asks Gemini for a lineup and returns the names of five catalog operators, in order.
+    # Concurrent identical requests (same suggestion key) share one call and its result.
+    key = make_suggestion_key(map_name, site, side, is_solo_queue, situation).key
+    flight, leader = suggestion_flights.begin(key)
+    if not leader:
+        return wait_for_flight(flight, 'generate')
+    try:
+        names = fetch_llm_suggestion(catalog, map_name, site, side, is_solo_queue, situation, candidates)
+    except Exception as e:
+        suggestion_flights.finish(key, flight, error=e)
+        raise
+    suggestion_flights.finish(key, flight, result=names)
+    return names
+
+
+def fetch_llm_suggestion(catalog, map_name, site, side, is_solo_queue, situation, candidates=()):
+    operators = side_operators(catalog, side)
+    prompt = build_suggestion_prompt(map_name, site, side, is_solo_queue, situation, candidates, operators)
+
+    # The call runs on the LLM thread pool with timeouts and a concurrency limit
+    llm_response_text = get_llm_client().generate_text(prompt, lineup_generation_config(operators))
+    try:
+        names, problems = parse_lineup_reply(llm_response_text, operators)
+    except LLMResponseError:
+        record_lineup_reply('generate', 'invalid')
+        raise
+    if not problems:
+        record_lineup_reply('generate', 'valid')
+        return names
+
+    print(f"Warning: LLM lineup repaired by the lineup engine: {'; '.join(problems)}")
+    record_lineup_reply('generate', 'repaired')
+    chosen = [catalog.operators_by_name[name] for name in names]
+    engine = get_lineup_engine(catalog)
+    extra = engine_fill(engine, side, catalog.maps_by_name.get(map_name), is_solo_queue, situation, chosen)
+    return names + [op.name for op in extra]
+
+
+def stream_suggestion_events(catalog, map_name, site, side, is_solo_queue, situation, lineup_mode='llm'):
+    # Yields (event, data) pairs: ('operator', OperatorView) as soon as each suggested operator
+    # is known, optionally ('notice' / 'error', message), and finally ('done', source).
+    engine = get_lineup_engine(catalog)
+    selected_map = catalog.maps_by_name.get(map_name)
+
+    suggestion_key = make_suggestion_key(map_name, site, side, is_solo_queue, situation)
+    suggestion_cache = get_suggestion_cache()
+    cached_names = suggestion_cache.lookup(suggestion_key) if suggestion_cache else None
+
+    if cached_names is not None:
+        for operator in catalog.name_resolver.resolve(cached_names, side=side).operators:
+            yield 'operator', operator
+        yield 'done', 'cache'
+        return
+
+    if lineup_mode == 'engine':
+        for operator in engine.suggest(side, selected_map, is_solo_queue, situation).operators:
+            yield 'operator', operator
+        yield 'done', 'engine'
+        return
+
+    flight, leader = suggestion_flights.begin(suggestion_key.key)
+    if not leader:
+        # The same suggestion is already being fetched: use its answer instead of calling Gemini again
+        try:
+            names = wait_for_flight(flight, 'stream')
+        except LLMError as llm_err:
+            print(f"LLM unavailable, falling back to the lineup engine: {llm_err}")
+            yield 'notice', FALLBACK_NOTICE
+            for operator in engine.suggest(side, selected_map, is_solo_queue, situation).operators:
+                yield 'operator', operator
+            yield 'done', 'engine'
+            return
+        resolved = catalog.name_resolver.resolve(names, side=side).operators
+        for operator in resolved:
+            yield 'operator', operator
+        if not resolved:
+            yield 'error', NO_VALID_OPERATORS
+        yield 'done', 'llm'
+        return
+
+    outcome = {}
+    try:
+        yield from stream_llm_lineup(catalog, engine, selected_map, map_name, site, side, is_solo_queue,
+                                     situation, outcome)
+    finally:
+        # Followers get the lineup, or the error; a stream the client abandoned counts as an error
+        names = outcome.get('names')
+        error = None if names is not None else outcome.get('error', LLMError("The suggestion stream was cancelled."))
+        suggestion_flights.finish(suggestion_key.key, flight, result=names, error=error)
+    if outcome.get('names') and suggestion_cache:
+        suggestion_cache.store_result(suggestion_key, outcome['names'])
+
+
+def stream_llm_lineup(catalog, engine, selected_map, map_name, site, side, is_solo_queue, situation, outcome):
+    # The Gemini part of stream_suggestion_events. Sets outcome['names'] to the final lineup, or
+    # outcome['error'] when Gemini failed and the lineup engine answered instead.
+    candidates = engine.shortlist(side, selected_map, is_solo_queue, situation)
+    operators = side_operators(catalog, side)
+    prompt = build_suggestion_prompt(map_name, site, side, is_solo_queue, situation,
+                                     [op.name for op in candidates], operators)
+    parser = StreamingJsonNameParser()
+    names = []
+    emitted = []
+
+    def new_operators():
+        # Re-resolving the whole list keeps ordering/duplicate handling identical to the non-streaming path
+        resolved = catalog.name_resolver.resolve(names, side=side).operators
+        fresh = resolved[len(emitted):]
+        emitted.extend(fresh)
+        return fresh
+
+    try:
+        for fragment in get_llm_client().stream_text(prompt, lineup_generation_config(operators)):
+            names.extend(parser.feed(fragment))
+            for operator in new_operators():
+                yield 'operator', operator
+    except LLMError as llm_err:
+        # Keep whatever already arrived and fill the remaining slots from the lineup engine
+        print(f"LLM stream unavailable, falling back to the lineup engine: {llm_err}")
+        outcome['error'] = llm_err
+        yield 'notice', FALLBACK_NOTICE
+        for operator in engine_fill(engine, side, selected_map, is_solo_queue, situation, emitted):
+            emitted.append(operator)
+            yield 'operator', operator
+        yield 'done', 'engine'
+        return
+
+    # Names were used as they arrived; now check the reply as a whole and fill any empty slots
+    try:
+        _, problems = parse_lineup_reply(parser.text, operators)
+        record_lineup_reply('stream', 'repaired' if problems else 'valid')
+    except LLMResponseError as e:
+        problems = [str(e)]
+        record_lineup_reply('stream', 'invalid')
+    if problems:
+        print(f"Warning: LLM lineup repaired by the lineup engine: {'; '.join(problems)}")
+        for operator in engine_fill(engine, side, selected_map, is_solo_queue, situation, emitted):
+            emitted.append(operator)
+            yield 'operator', operator
+
+    outcome['names'] = [op.name for op in emitted]
+    if not emitted:
+        yield 'error', NO_VALID_OPERATORS
+    yield 'done', 'llm'
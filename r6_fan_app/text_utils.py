@@ -0,0 +1,23 @@
+# r6_fan_app/text_utils.py
+
+# Small text helpers shared by the catalog, slug and search code.
+
+import re
+import unicodedata
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def fold(text):
+    # Lowercase and strip accents so "Jäger" and "jager" compare equal
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(fold(text))
+
+
+def slugify(text):
+    # "Kafe Dostoyevsky" -> "kafe-dostoyevsky", "Jäger" -> "jager"
+    return '-'.join(tokenize(text))
@@ -1,9 +1,11 @@
 # run.py
 
 # This file is the entry point for Gunicorn.
-# It imports the Flask app instance from your package.
+# It builds the Flask app instance with the package's app factory.
 
-from r6_fan_app import app
+from r6_fan_app import create_app
+
+app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,82 @@
+# tests/conftest.py
+
+# Shared fixtures. The Gemini API is replaced by gemini_stub.py, served from a thread of the test
+# process on a free port, so the tests need no API key or network access.
+
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import gemini_stub  # noqa: E402
+
+
+@pytest.fixture
+def start_stub():
+    # start_stub(reply=..., latency=..., chunk_delay=..., status=...) -> the stub's API base URL
+    servers = []
+
+    def start(**options):
+        server = gemini_stub.make_server(port=0, **options)
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/v1beta"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope='session')
+def catalog_database(tmp_path_factory):
+    # A SQLite database seeded once from the catalog data files with load_catalog.py
+    import load_catalog
+
+    url = f"sqlite:///{tmp_path_factory.mktemp('catalog') / 'catalog.sqlite3'}"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('DATABASE_URL', url)
+        from r6_fan_app import create_app, db
+        app = create_app({'STARTUP_PREWARM': False, 'LINEUP_MODE': 'engine'})
+        with app.app_context():
+            db.create_all()
+        load_catalog.load_catalog(prune=True, force_bump=True)
+    return url
+
+
+@pytest.fixture
+def make_app(monkeypatch, tmp_path, catalog_database):
+    # make_app(ENV_VAR=value, ...) -> an app on the seeded database, with the per-process
+    # singletons (catalog, Gemini client, caches, rate limiter) reset so settings apply
+    from r6_fan_app import create_app, llm, rate_limit, suggestion_cache
+    from r6_fan_app.catalog import catalog_cache
+
+    def make(**environment):
+        settings = {
+            'DATABASE_URL': catalog_database,
+            'CATALOG_SOURCE': 'database',
+            'CATALOG_SNAPSHOT_PATH': str(tmp_path / 'no-snapshot'),
+            'LINEUP_MODE': 'llm',
+            'LLM_API_KEY': 'test',
+            'SUGGESTION_CACHE_BACKEND': 'none',
+            'RATE_LIMIT_BACKEND': 'none',
+            'PAGE_CACHE_PURGE_URL': '',
+        }
+        settings.update(environment)
+        for name, value in settings.items():
+            monkeypatch.setenv(name, str(value))
+        monkeypatch.setattr(llm, '_client', None)
+        monkeypatch.setattr(rate_limit, '_limiter', None)
+        monkeypatch.setattr(suggestion_cache, '_cache', None)
+        catalog_cache.invalidate()
+        app = create_app({'STARTUP_PREWARM': False})
+        app.config['TESTING'] = True
+        return app
+
+    yield make
+    catalog_cache.invalidate()
@@ -0,0 +1,100 @@
+# tests/test_catalog.py
+
+# The per-worker catalog cache (catalog.py).
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from r6_fan_app import db, prewarm
+from r6_fan_app.catalog_files import compile_snapshot, load_catalog_files
+from r6_fan_app.catalog import catalog_cache, get_catalog
+from r6_fan_app.models import CatalogVersion
+
+
+def test_database_mode_does_not_prewarm_from_the_snapshot_file(make_app, tmp_path):
+    # The compiled file numbers rows by position and is versioned by its hash, so serving it
+    # in database mode would hand out ids and a version the database doesn't have
+    path = str(tmp_path / 'catalog.snapshot')
+    compile_snapshot(load_catalog_files(), path)
+    app = make_app(CATALOG_SNAPSHOT_PATH=path, LINEUP_MODE='engine')
+    reloads = catalog_cache.reloads
+    prewarm(app)
+    assert catalog_cache.reloads == reloads
+
+    with app.app_context():
+        assert get_catalog().version == db.session.get(CatalogVersion, 1).version
+    client = app.test_client()
+    assert client.get('/api/operators?fields=id,name&limit=3').status_code == 200
+
+
+def test_snapshot_mode_prewarms_from_the_snapshot_file(make_app, tmp_path):
+    path = str(tmp_path / 'catalog.snapshot')
+    digest = compile_snapshot(load_catalog_files(), path)
+    app = make_app(CATALOG_SOURCE='snapshot', CATALOG_SNAPSHOT_PATH=path, LINEUP_MODE='engine')
+    reloads = catalog_cache.reloads
+    prewarm(app)
+    assert catalog_cache.reloads == reloads + 1
+    assert catalog_cache.stats()['version'] == digest
+
+
+PAGES = ('/operators', '/operators/jager', '/maps', '/maps/kafe-dostoyevsky', '/game-info', '/lineup-suggestor',
+         '/api/operators', '/api/map-sites')
+
+
+@contextmanager
+def count_statements(app):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def set_catalog_version(app, version):
+    with app.app_context():
+        db.session.get(CatalogVersion, 1).version = version
+        db.session.commit()
+
+
+def test_steady_state_pages_make_no_queries_and_a_version_bump_reloads_once(make_app):
+    # Page cache off, so every request renders from the catalog snapshot
+    app = make_app(LINEUP_MODE='engine', PAGE_CACHE_ENABLED='false', CATALOG_VERSION_CHECK_SECONDS='3600')
+    client = app.test_client()
+    for url in PAGES:
+        assert client.get(url).status_code == 200, url
+    hits, misses, reloads = catalog_cache.hits, catalog_cache.misses, catalog_cache.reloads
+
+    with count_statements(app) as statements:
+        for _ in range(3):
+            for url in PAGES:
+                assert client.get(url).status_code == 200, url
+    assert statements == []
+    assert (catalog_cache.misses, catalog_cache.reloads) == (misses, reloads)
+    assert catalog_cache.hits >= hits + 3 * len(PAGES)
+
+    # Every request now checks the version row, but only a changed version reloads the catalog
+    catalog_cache.check_interval = 0
+    with app.app_context():
+        version = db.session.get(CatalogVersion, 1).version
+    try:
+        with count_statements(app) as statements:
+            for url in PAGES:
+                client.get(url)
+        assert statements and all('catalog_version' in statement for statement in statements)
+        assert catalog_cache.reloads == reloads
+
+        set_catalog_version(app, 'bumped')
+        for url in PAGES:
+            assert client.get(url).status_code == 200, url
+        assert (catalog_cache.misses, catalog_cache.reloads) == (misses + 1, reloads + 1)
+        assert catalog_cache.stats()['version'] == 'bumped'
+    finally:
+        set_catalog_version(app, version)
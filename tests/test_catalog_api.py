@@ -0,0 +1,99 @@
+# tests/test_catalog_api.py
+
+# The read API over the catalog snapshot (catalog_api.py).
+
+import pytest
+
+from r6_fan_app.catalog_api import MAX_PAGE_SIZE
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app(LINEUP_MODE='engine').test_client()
+
+
+def get_json(client, url, status=200):
+    response = client.get(url)
+    assert response.status_code == status, response.data
+    return response.get_json()
+
+
+def test_default_and_requested_fields(client):
+    item = get_json(client, '/api/operators')['items'][0]
+    assert set(item) == {'id', 'name', 'slug', 'side', 'role', 'ability', 'solo_friendly'}
+
+    items = get_json(client, '/api/operators?fields=slug,name')['items']
+    assert [set(item) for item in items] == [{'name', 'slug'}] * len(items)
+
+    item = get_json(client, '/api/operators?fields=all&limit=1')['items'][0]
+    assert 'short_bio' in item and 'counter_examples' in item
+
+    operator = get_json(client, '/api/operators/jager')
+    assert operator['name'] == 'Jäger' and 'short_bio' in operator
+    assert get_json(client, '/api/operators/jager?fields=side') == {'side': 'Defender'}
+
+
+def test_filters(client):
+    defenders = get_json(client, '/api/operators?side=Defender&fields=name,side')['items']
+    assert defenders and {item['side'] for item in defenders} == {'Defender'}
+
+    breachers = get_json(client, '/api/operators?role=breacher&fields=name')['items']
+    assert {item['name'] for item in breachers} == {'Sledge', 'Ash', 'Thermite'}
+    hard = get_json(client, '/api/operators?role=hard%20breacher&fields=name')['items']
+    assert [item['name'] for item in hard] == ['Thermite']
+
+    solo = get_json(client, '/api/operators?side=attacker&solo_friendly=false&fields=name')['items']
+    assert {item['name'] for item in solo} == {'Thatcher', 'Thermite', 'Montagne', 'Fuze'}
+
+
+def test_keyset_pagination_walks_every_item_once(client):
+    everything = get_json(client, f'/api/operators?fields=id&limit={MAX_PAGE_SIZE}')
+    assert everything['next'] is None
+
+    seen = []
+    url = '/api/operators?fields=name&limit=3'
+    while True:
+        page = get_json(client, url)
+        assert len(page['items']) <= 3
+        seen += [item['name'] for item in page['items']]
+        if page['next'] is None:
+            break
+        url = f"/api/operators?fields=name&limit=3&after={page['next']}"
+    assert len(seen) == len(everything['items']) == len(set(seen))
+
+    # Filters apply before the page is cut
+    page = get_json(client, '/api/operators?side=defender&fields=id,side&limit=2')
+    assert len(page['items']) == 2 and page['next'] == page['items'][-1]['id']
+    following = get_json(client, f"/api/operators?side=defender&fields=id,side&limit=2&after={page['next']}")
+    assert following['items'][0]['id'] > page['next']
+    assert {item['side'] for item in page['items'] + following['items']} == {'Defender'}
+
+
+def test_etag_revalidates(client):
+    response = client.get('/api/maps')
+    assert response.status_code == 200
+    assert client.get('/api/maps', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+@pytest.mark.parametrize('url', [
+    '/api/operators?fields=name,nope',
+    '/api/operators?side=both',
+    '/api/operators?solo_friendly=maybe',
+    '/api/operators?role=%21%21',
+    '/api/operators?limit=0',
+    '/api/operators?limit=-5',
+    f'/api/operators?limit={MAX_PAGE_SIZE + 1}',
+    '/api/operators?limit=ten',
+    '/api/operators?after=x',
+    '/api/operators?sort=name',
+    '/api/operators?format=xml',
+    '/api/maps?side=defender',
+    '/api/maps?role=breacher',
+    '/api/operators/jager?limit=5',
+])
+def test_bad_requests_get_a_400(client, url):
+    assert 'error' in get_json(client, url, status=400)
+
+
+def test_unknown_operator_gets_a_404(client):
+    assert 'error' in get_json(client, '/api/operators/nobody', status=404)
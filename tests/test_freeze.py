@@ -0,0 +1,23 @@
+# tests/test_freeze.py
+
+# freeze.py exports the catalog pages with only the catalog settings.
+
+import json
+
+import freeze
+
+
+def test_freezes_without_an_llm_key(monkeypatch, tmp_path, catalog_database):
+    monkeypatch.setenv('DATABASE_URL', catalog_database)
+    monkeypatch.setenv('CATALOG_SOURCE', 'database')
+    monkeypatch.setenv('CATALOG_SNAPSHOT_PATH', str(tmp_path / 'no-snapshot'))
+    monkeypatch.delenv('LLM_API_KEY', raising=False)
+    monkeypatch.setenv('LINEUP_MODE', 'llm')
+
+    output = tmp_path / 'frozen'
+    freeze.freeze(str(output), static=False)
+
+    manifest = json.loads((output / freeze.MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert manifest['pages']['/operators/ash']['file'] == 'operators/ash/index.html'
+    assert (output / 'operators' / 'ash' / 'index.html').exists()
+    assert '/lineup-suggestor' in manifest['dynamic']
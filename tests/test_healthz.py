@@ -0,0 +1,26 @@
+# tests/test_healthz.py
+
+# /healthz answers liveness probes for anyone; the diagnostics need METRICS_TOKEN.
+
+
+def test_public_health_check_only_reports_status(make_app):
+    client = make_app(METRICS_TOKEN='s3cret').test_client()
+    for headers in ({}, {'Authorization': 'Bearer wrong'}):
+        response = client.get('/healthz', headers=headers)
+        assert response.status_code == 200
+        assert response.get_json() == {'status': 'ok', 'database': {'ok': True}}
+
+
+def test_health_check_diagnostics_need_the_token(make_app):
+    client = make_app(METRICS_TOKEN='s3cret').test_client()
+    report = client.get('/healthz', headers={'Authorization': 'Bearer s3cret'}).get_json()
+    assert report['status'] == 'ok'
+    assert report['database']['ok'] is True
+    assert 'latency_ms' in report['database']
+    assert {'pool', 'catalog_cache', 'startup'} <= set(report)
+
+
+def test_health_check_without_a_token_configured(make_app):
+    client = make_app(METRICS_TOKEN='').test_client()
+    assert client.get('/healthz', headers={'Authorization': 'Bearer '}).get_json() == \
+        {'status': 'ok', 'database': {'ok': True}}
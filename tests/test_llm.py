@@ -0,0 +1,103 @@
+# tests/test_llm.py
+
+# GeminiClient against the local stub: timeouts, the concurrency limit and HTTP errors.
+
+import socket
+import threading
+import time
+
+import pytest
+
+from r6_fan_app.llm import GeminiClient, LLMBusyError, LLMError, LLMResponseError, LLMTimeoutError, \
+    StreamingJsonNameParser
+
+
+def make_client(api_base, **options):
+    return GeminiClient(api_key='test', api_base=api_base, model='gemini-test', **options)
+
+
+def test_generate_text_returns_the_reply(start_stub):
+    client = make_client(start_stub(reply="Ash, Thermite"))
+    assert client.generate_text("Suggest a lineup") == "Ash, Thermite"
+
+
+def test_read_timeout_raises_timeout_error(start_stub):
+    client = make_client(start_stub(latency=1.0), read_timeout=0.2)
+    with pytest.raises(LLMTimeoutError):
+        client.generate_text("Suggest a lineup")
+
+
+def test_overall_deadline_raises_timeout_error(start_stub):
+    # The read timeout alone would wait; the hard deadline stops waiting first
+    client = make_client(start_stub(latency=1.0), read_timeout=5.0, total_timeout=0.2)
+    started = time.perf_counter()
+    with pytest.raises(LLMTimeoutError):
+        client.generate_text("Suggest a lineup")
+    assert time.perf_counter() - started < 0.9
+
+
+def test_saturated_slots_raise_busy_error(start_stub):
+    client = make_client(start_stub(latency=0.5), max_concurrency=1, queue_timeout=0.05)
+    first = threading.Thread(target=client.generate_text, args=("Suggest a lineup",))
+    first.start()
+    time.sleep(0.1)  # the first call now holds the only slot
+    try:
+        with pytest.raises(LLMBusyError):
+            client.generate_text("Suggest another lineup")
+    finally:
+        first.join()
+    # The slot is released once the first call finishes
+    assert client.generate_text("Suggest a lineup")
+
+
+def test_saturated_slots_raise_busy_error_for_streams(start_stub):
+    client = make_client(start_stub(latency=0.5), max_concurrency=1, queue_timeout=0.05)
+    first = threading.Thread(target=client.generate_text, args=("Suggest a lineup",))
+    first.start()
+    time.sleep(0.1)
+    try:
+        with pytest.raises(LLMBusyError):
+            list(client.stream_text("Suggest another lineup"))
+    finally:
+        first.join()
+
+
+@pytest.mark.parametrize('status', [400, 429, 500, 503])
+def test_error_status_raises_llm_error(start_stub, status):
+    client = make_client(start_stub(status=status))
+    with pytest.raises(LLMError) as error:
+        client.generate_text("Suggest a lineup")
+    assert not isinstance(error.value, (LLMTimeoutError, LLMBusyError, LLMResponseError))
+    assert str(status) in str(error.value)
+
+
+def test_error_status_raises_llm_error_for_streams(start_stub):
+    client = make_client(start_stub(status=503))
+    with pytest.raises(LLMError):
+        list(client.stream_text("Suggest a lineup"))
+
+
+def test_unreachable_api_raises_llm_error():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]  # nothing listens on it once the socket is closed
+    client = make_client(f"http://127.0.0.1:{port}/v1beta", connect_timeout=0.5)
+    with pytest.raises(LLMError):
+        client.generate_text("Suggest a lineup")
+
+
+def test_stream_text_yields_pieces_of_the_reply(start_stub):
+    client = make_client(start_stub(reply="Ash, Thermite, Thatcher"))
+    pieces = list(client.stream_text("Suggest a lineup"))
+    assert len(pieces) > 1
+    assert ''.join(pieces) == "Ash, Thermite, Thatcher"
+
+
+def test_json_name_parser_returns_each_name_once_complete():
+    parser = StreamingJsonNameParser()
+    assert parser.feed('{"opera') == []
+    assert parser.feed('tors": ["As') == []
+    assert parser.feed('h", "Ther') == ['Ash']
+    assert parser.feed('mite", "J\\u00e4ger"') == ['Thermite', 'Jäger']
+    assert parser.feed(']}') == []
+    assert parser.text == '{"operators": ["Ash", "Thermite", "J\\u00e4ger"]}'
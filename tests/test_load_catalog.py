@@ -0,0 +1,25 @@
+# tests/test_load_catalog.py
+
+# load_catalog.py only needs the database settings.
+
+import load_catalog
+from r6_fan_app import create_app, db
+
+
+def test_loads_without_an_llm_key(monkeypatch, tmp_path):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'catalog.sqlite3'}")
+    monkeypatch.delenv('LLM_API_KEY', raising=False)
+    monkeypatch.setenv('LINEUP_MODE', 'llm')
+    monkeypatch.setenv('CATALOG_SOURCE', 'snapshot')  # the loader always writes to the database
+    app = create_app({'STARTUP_PREWARM': False, 'LINEUP_MODE': 'engine', 'CATALOG_SOURCE': 'database'})
+    with app.app_context():
+        db.create_all()
+
+    reports, version = load_catalog.load_catalog()
+    assert version is not None
+    assert {report.table: report.inserted > 0 for report in reports} == \
+        {'operators': True, 'maps': True, 'game_info': True}
+    # A second run finds nothing to change
+    reports, version = load_catalog.load_catalog()
+    assert version is None
+    assert all(not report.changed for report in reports)
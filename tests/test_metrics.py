@@ -0,0 +1,20 @@
+# tests/test_metrics.py
+
+# /metrics is only served to a client holding METRICS_TOKEN.
+
+
+def test_metrics_are_off_without_a_token(make_app):
+    client = make_app(METRICS_TOKEN='').test_client()
+    assert client.get('/metrics').status_code == 404
+
+
+def test_metrics_need_the_bearer_token(make_app):
+    client = make_app(METRICS_TOKEN='s3cret').test_client()
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer sécret'}).status_code == 403
+
+    response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert b'# TYPE' in response.data
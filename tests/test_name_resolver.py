@@ -0,0 +1,76 @@
+# tests/test_name_resolver.py
+
+# Resolving LLM-suggested names to catalog operators (name_resolver.py). Pure functions, no app needed.
+
+from types import SimpleNamespace
+
+import pytest
+
+from r6_fan_app.name_resolver import (DUPLICATE, UNKNOWN, WRONG_SIDE, OperatorNameResolver, UnmatchedName,
+                                      edit_distance, normalise_name)
+
+OPERATORS = [SimpleNamespace(id=index, name=name, side=side) for index, (name, side) in enumerate([
+    ('Sledge', 'Attacker'), ('Thatcher', 'Attacker'), ('Ash', 'Attacker'), ('Thermite', 'Attacker'),
+    ('IQ', 'Attacker'), ('Smoke', 'Defender'), ('Mute', 'Defender'), ('Jäger', 'Defender'),
+    ('Bandit', 'Defender'), ('Kapkan', 'Defender'),
+], 1)]
+
+
+@pytest.fixture
+def resolver():
+    return OperatorNameResolver(OPERATORS)
+
+
+def names(operators):
+    return [op.name for op in operators]
+
+
+@pytest.mark.parametrize('given', ['jager', 'JAGER', 'Jäger', 'jäger', 'Jaeger', '2. **Jäger** (anti-grenade)'])
+def test_case_accents_and_decorations_are_ignored(resolver, given):
+    operator, _ = resolver.match(given)
+    assert operator.name == 'Jäger'
+
+
+def test_exact_matches_are_not_corrections(resolver):
+    result = resolver.resolve(['jager', 'THERMITE', '- Ash'])
+    assert names(result.operators) == ['Jäger', 'Thermite', 'Ash']
+    assert result.corrections == () and result.unmatched == ()
+
+
+def test_misspellings_within_the_edit_distance_are_corrected(resolver):
+    result = resolver.resolve(['Thermit', 'Thatchr', 'Kapkam', 'Bandti'])
+    assert names(result.operators) == ['Thermite', 'Thatcher', 'Kapkan', 'Bandit']
+    assert result.corrections == (('Thermit', 'Thermite'), ('Thatchr', 'Thatcher'),
+                                  ('Kapkam', 'Kapkan'), ('Bandti', 'Bandit'))
+
+
+def test_misspellings_beyond_the_edit_distance_are_unmatched(resolver):
+    # Short names allow one typo, longer ones two
+    result = resolver.resolve(['Ahs', 'Smkoe', 'Thrmt'])
+    assert result.operators == ()
+    assert [item.name for item in result.unmatched] == ['Ahs', 'Smkoe', 'Thrmt']
+
+
+def test_ambiguous_misspellings_are_unmatched():
+    # 'Ach' is one edit from both Ash and Ace, so neither is picked
+    resolver = OperatorNameResolver(OPERATORS + [SimpleNamespace(id=99, name='Ace', side='Attacker')])
+    assert edit_distance('ach', 'ash', 1) == edit_distance('ach', 'ace', 1) == 1
+    result = resolver.resolve(['Ach'])
+    assert result.operators == () and result.unmatched == (UnmatchedName('Ach', UNKNOWN),)
+
+
+def test_the_given_order_is_kept(resolver):
+    given = ['Mute', 'Sledge', 'Smoke', 'IQ', 'Ash']
+    assert names(resolver.resolve(given).operators) == given
+
+
+def test_unmatched_names_are_reported_with_a_reason(resolver):
+    result = resolver.resolve(['Ash', 'Zofia', 'Smoke', 'ash', 'Thermite', ''], side='Attacker')
+    assert names(result.operators) == ['Ash', 'Thermite']
+    assert result.unmatched == (UnmatchedName('Zofia', UNKNOWN), UnmatchedName('Smoke', WRONG_SIDE),
+                                UnmatchedName('ash', DUPLICATE), UnmatchedName('', UNKNOWN))
+
+
+def test_normalise_name():
+    assert normalise_name('1) *Jäger* [roamer]') == 'jager'
+    assert normalise_name(None) == ''
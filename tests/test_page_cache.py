@@ -0,0 +1,37 @@
+# tests/test_page_cache.py
+
+# Conditional requests to cached catalog pages.
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from werkzeug.http import http_date
+
+from r6_fan_app.page_cache import page_cache
+
+FUTURE = http_date(datetime.now(timezone.utc) + timedelta(days=365))
+
+
+@pytest.fixture
+def client(make_app):
+    page_cache.purge()
+    return make_app(LINEUP_MODE='engine').test_client()
+
+
+def test_unchanged_page_is_not_modified(client):
+    first = client.get('/operators/ash')
+    assert first.status_code == 200
+    assert client.get('/operators/ash', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+    assert client.get('/operators/ash', headers={'If-Modified-Since': FUTURE}).status_code == 304
+
+
+def test_unknown_slug_is_not_found_even_when_conditional(client):
+    assert client.get('/operators/nobody', headers={'If-Modified-Since': FUTURE}).status_code == 404
+    assert client.get('/maps/nowhere', headers={'If-Modified-Since': FUTURE}).status_code == 404
+
+
+def test_alias_redirects_even_when_conditional(client):
+    client.get('/operators/jager')
+    response = client.get('/operators/jäger', headers={'If-Modified-Since': FUTURE})
+    assert response.status_code == 301
+    assert response.headers['Location'].endswith('/operators/jager')
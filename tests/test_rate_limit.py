@@ -0,0 +1,114 @@
+# tests/test_rate_limit.py
+
+# The suggestor's token buckets, with the in-process store on a fake clock, the shared SQLite
+# store, and the 429 the routes answer with.
+
+import pytest
+
+from r6_fan_app.rate_limit import MemoryBucketStore, RateLimiter, SQLiteBucketStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(store, client=(2, 6), global_=(30, 120)):
+    # (burst, per minute) for one client and for everyone together
+    return RateLimiter(store, *client, *global_)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_client_burst_then_retry_after(clock):
+    limiter = make_limiter(MemoryBucketStore(clock), client=(2, 6))  # a token every 10s
+    assert limiter.check('1.2.3.4') == 0
+    assert limiter.check('1.2.3.4') == 0
+    assert limiter.check('1.2.3.4') == 10
+    # Other clients have their own bucket
+    assert limiter.check('5.6.7.8') == 0
+    clock.now += 10
+    assert limiter.check('1.2.3.4') == 0
+    assert (limiter.allowed, limiter.limited) == (4, 1)
+
+
+def test_global_bucket_caps_all_clients(clock):
+    limiter = make_limiter(MemoryBucketStore(clock), client=(5, 60), global_=(2, 60))
+    assert limiter.check('a') == 0
+    assert limiter.check('b') == 0
+    assert limiter.check('c') == 1
+
+
+def test_global_refusal_costs_the_client_nothing(clock):
+    store = MemoryBucketStore(clock)
+    limiter = make_limiter(store, client=(2, 0.01), global_=(1, 60))
+    assert limiter.check('a') == 0
+    for _ in range(3):
+        assert limiter.check('a') == 1  # refused by the global bucket
+    clock.now += 1  # the global bucket has a token again; the client's barely refills
+    assert limiter.check('a') == 0
+    assert limiter.check('a') > 1  # now it's the client's own bucket that is empty
+
+
+def test_client_refusal_costs_the_global_bucket_nothing(clock):
+    limiter = make_limiter(MemoryBucketStore(clock), client=(1, 0.01), global_=(2, 0.01))
+    assert limiter.check('greedy') == 0
+    for _ in range(5):
+        assert limiter.check('greedy') > 0
+    assert limiter.check('patient') == 0
+
+
+def test_retry_after_waits_for_every_empty_bucket(clock):
+    limiter = make_limiter(MemoryBucketStore(clock), client=(1, 6), global_=(1, 30))
+    assert limiter.check('a') == 0
+    assert limiter.check('a') == 10  # client: 10s, global: 2s
+
+
+def test_broken_store_fails_open():
+    class BrokenStore:
+        def acquire(self, limits):
+            raise OSError("disk full")
+
+    limiter = make_limiter(BrokenStore())
+    assert limiter.check('a') == 0
+    assert (limiter.allowed, limiter.errors) == (1, 1)
+
+
+def test_sqlite_buckets_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'ratelimit.sqlite3')
+    first, second = make_limiter(SQLiteBucketStore(path)), make_limiter(SQLiteBucketStore(path))
+    assert first.check('a') == 0
+    assert second.check('a') == 0
+    assert first.check('a') > 0
+    assert second.check('a') > 0
+
+
+def test_sqlite_global_refusal_costs_the_client_nothing(tmp_path):
+    store = SQLiteBucketStore(str(tmp_path / 'ratelimit.sqlite3'))
+    limiter = make_limiter(store, client=(2, 0.01), global_=(1, 0.01))
+    assert limiter.check('a') == 0
+    assert limiter.check('a') > 0
+    row = store._connect().execute("SELECT tokens FROM buckets WHERE key = 'client:a'").fetchone()
+    assert row[0] == pytest.approx(1.0, abs=0.01)
+
+
+def test_suggestor_answers_429_with_retry_after(make_app):
+    app = make_app(LINEUP_MODE='engine', RATE_LIMIT_BACKEND='memory', RATE_LIMIT_CLIENT_BURST=1,
+                   RATE_LIMIT_CLIENT_PER_MINUTE=1)
+    client = app.test_client()
+    form = {'map': 'Bank', 'site': 'x', 'side': 'Attacker', 'situation': 'help'}
+    assert client.post('/lineup-suggestor', data=form).status_code != 429
+    limited = client.post('/lineup-suggestor', data=form)
+    assert limited.status_code == 429
+    assert limited.headers['Retry-After'] == '60'
+    streamed = client.post('/lineup-suggestor/stream', data=form)
+    assert streamed.status_code == 429
+    assert streamed.headers['Retry-After'] == '60'
+    # Only the POSTs that run a suggestion are limited
+    assert client.get('/lineup-suggestor').status_code == 200
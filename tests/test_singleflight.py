@@ -0,0 +1,89 @@
+# tests/test_singleflight.py
+
+# Coalescing of identical concurrent work, on its own and for the suggestor's Gemini calls.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from r6_fan_app.singleflight import FlightTimeoutError, SingleFlight
+
+
+def run_together(count, function):
+    with ThreadPoolExecutor(count) as pool:
+        futures = [pool.submit(function) for _ in range(count)]
+        return [future.result() for future in futures]
+
+
+def test_concurrent_calls_share_one_run():
+    flights = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'lineup'
+
+    assert run_together(5, lambda: flights.do('key', slow, timeout=2)) == ['lineup'] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {'leaders': 1, 'followers': 4, 'in_flight': 0}
+
+
+def test_followers_get_the_leaders_error():
+    flights = SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise ValueError("quota exceeded")
+
+    def call():
+        try:
+            flights.do('key', failing, timeout=2)
+        except ValueError as e:
+            return str(e)
+
+    assert run_together(3, call) == ["quota exceeded"] * 3
+    assert flights.stats()['leaders'] == 1
+
+
+def test_different_keys_and_later_calls_run_again():
+    flights = SingleFlight()
+    assert flights.do('a', lambda: 1, timeout=1) == 1
+    assert flights.do('b', lambda: 2, timeout=1) == 2
+    assert flights.do('a', lambda: 3, timeout=1) == 3
+    assert flights.stats()['leaders'] == 3
+
+
+def test_follower_gives_up_after_its_timeout():
+    flights = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flights.do, args=('key', release.wait, 5))
+    leader.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(FlightTimeoutError):
+            flights.do('key', lambda: None, timeout=0.1)
+    finally:
+        release.set()
+        leader.join()
+
+
+def test_identical_suggestions_make_one_gemini_call(make_app, start_stub):
+    from r6_fan_app.suggestor import suggestion_flights
+
+    app = make_app(LLM_API_BASE=start_stub(latency=0.5))
+    with app.app_context():
+        from r6_fan_app.catalog import get_catalog
+        map_item = get_catalog().maps[0]
+    form = {'map': map_item.name, 'site': map_item.defender_sites_list[0], 'side': 'Attacker',
+            'situation': "Coalesce me", 'solo_queue': 'no'}
+    before = suggestion_flights.stats()
+
+    statuses = run_together(4, lambda: app.test_client().post('/lineup-suggestor', data=form).status_code)
+
+    after = suggestion_flights.stats()
+    assert statuses == [200] * 4
+    assert after['leaders'] - before['leaders'] == 1
+    assert after['followers'] - before['followers'] == 3
@@ -0,0 +1,102 @@
+# tests/test_suggestor_stream.py
+
+# /lineup-suggestor/stream end to end, with Gemini replaced by the local stub.
+
+import json
+import time
+
+STUB_REPLY = "Ash, Thermite, Thatcher, Twitch, Sledge"
+FORM = {'side': 'Attacker', 'situation': "We keep losing the plant", 'solo_queue': 'no'}
+
+
+def suggestor_form(app):
+    from r6_fan_app.catalog import get_catalog
+
+    with app.app_context():
+        map_item = get_catalog().maps[0]
+    return dict(FORM, map=map_item.name, site=map_item.defender_sites_list[0])
+
+
+def stream_events(app):
+    # [(seconds since the request, event, data)] in the order they were sent
+    client = app.test_client()
+    started = time.perf_counter()
+    response = client.post('/lineup-suggestor/stream', data=suggestor_form(app), buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    events = []
+    for chunk in response.response:
+        received = time.perf_counter() - started
+        text = chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk
+        for block in text.split('\n\n'):
+            lines = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+            if 'event' in lines:
+                events.append((received, lines['event'], json.loads(lines['data'])))
+    response.close()
+    return events
+
+
+def names(events, event_name='operator'):
+    return [data['name'] for _, event, data in events if event == event_name]
+
+
+def test_names_are_sent_as_they_are_parsed(make_app, start_stub):
+    app = make_app(LLM_API_BASE=start_stub(reply=STUB_REPLY, chunk_delay=0.1))
+    events = stream_events(app)
+
+    operator_times = [received for received, event, _ in events if event == 'operator']
+    done_time = events[-1][0]
+    assert names(events) == STUB_REPLY.split(', ')
+    # The reply takes ~0.8s to arrive in 8-character pieces: the first card goes out long before the last
+    assert operator_times[0] < done_time - 0.4
+    assert operator_times == sorted(operator_times)
+    assert operator_times[-1] - operator_times[0] > 0.3
+
+
+def test_done_event_carries_the_resolved_lineup(make_app, start_stub):
+    # "thermite" and "ASH" are resolved to catalog operators; the unknown name is replaced by the engine
+    app = make_app(LLM_API_BASE=start_stub(reply="thermite, ASH, Thatcher, Twitch, Nobody"))
+    events = stream_events(app)
+
+    received, event, data = events[-1]
+    assert event == 'done'
+    assert data['source'] == 'llm'
+    lineup = [card['name'] for card in data['operators']]
+    assert lineup == names(events)
+    assert lineup[:4] == ['Thermite', 'Ash', 'Thatcher', 'Twitch']
+    assert len(lineup) == 5 and 'Nobody' not in lineup
+    assert all(card['url'].startswith('/operators/') for card in data['operators'])
+
+
+def assert_engine_fallback(events, kept=()):
+    kinds = [event for _, event, _ in events]
+    assert 'notice' in kinds
+    received, event, data = events[-1]
+    assert event == 'done'
+    assert data['source'] == 'engine'
+    lineup = [card['name'] for card in data['operators']]
+    assert lineup == names(events)
+    assert len(lineup) == 5 and len(set(lineup)) == 5
+    assert lineup[:len(kept)] == list(kept)
+
+
+def test_engine_answers_when_the_stream_errors(make_app, start_stub):
+    app = make_app(LLM_API_BASE=start_stub(status=503))
+    assert_engine_fallback(stream_events(app))
+
+
+def test_engine_answers_when_the_stream_times_out(make_app, start_stub):
+    app = make_app(LLM_API_BASE=start_stub(latency=2.0), LLM_READ_TIMEOUT=0.3)
+    started = time.perf_counter()
+    assert_engine_fallback(stream_events(app))
+    assert time.perf_counter() - started < 1.5
+
+
+def test_engine_fills_in_after_a_timeout_mid_stream(make_app, start_stub):
+    # The overall deadline passes while names are arriving: the ones already sent are kept
+    app = make_app(LLM_API_BASE=start_stub(reply=STUB_REPLY, chunk_delay=0.15), LLM_TOTAL_TIMEOUT=0.5)
+    events = stream_events(app)
+    notice = next(i for i, (_, event, _) in enumerate(events) if event == 'notice')
+    streamed = names(events[:notice])
+    assert 0 < len(streamed) < 5
+    assert_engine_fallback(events, kept=streamed)